@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Historical Backfill Generator.
+
+Weeks of synthetic history for a fleet, for the long-range panels (SLA 30d, ECC
+trends) and offline benchmarks: the series of synthetic_exporter.py (same names,
+labels and value model) generated a metric at a time as NumPy matrices
+[series, samples], with
+
+- failure episodes — Poisson per node (--failures per node per 30 days), kinds and
+  durations from EPISODES, effects from synthetic_exporter.FAULTS; a DBE or row-remap
+  episode ends in a GPU replacement (the node DOWN for REPLACEMENT_HOURS, counters
+  back at 0)
+- maintenance windows — weekly (MAINTENANCE), one rack of RACK_SIZE nodes CLOSED per
+  window, rotating through the fleet
+
+A DOWN or CLOSED node exports only what BCM reports on its behalf (REPORTED_WHEN_DOWN:
+bcm_device_is_up 0 and the node's own nodes_* state) — gaps in every other series; the
+head node's devices_* totals count it. Only the metrics dashboards and rules
+read are generated (drop_rules.py) unless --all-metrics.
+
+Outputs (any combination):
+    --out FILE       OpenMetrics backfill input, one family at a time, series in time order
+                     (promtool tsdb create-blocks-from openmetrics FILE DIR)
+    --blocks DIR     TSDB blocks — the OpenMetrics output run through promtool
+    --npz FILE       promql_eval.py storage (promql_eval.py --npz FILE)
+Without one, prints the series / sample volume and the episode schedule.
+
+Usage: python3 backfill.py [--nodes N] [--days N] [--step 60s] [--end UNIX_S] [--profile NAME]
+                       [--failures N] [--seed N] [--all-metrics]
+                       [--out FILE] [--blocks DIR] [--npz FILE]
+"""
+import os, re, shutil, subprocess, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import metrics_inventory, series_data
+from capacity_planner import parse_interval
+from hardware_profiles import DEFAULT_PROFILE
+from read_load_model import RACK_SIZE
+from synthetic_exporter import COUNTER, FAULTS, REPORTED_WHEN_DOWN, _level
+
+# kind → (share of episodes, min hours, max hours)
+EPISODES = {
+    "thermal":   (0.4, 0.25, 6),
+    "down":      (0.3, 1, 12),
+    "dbe":       (0.15, 12, 72),
+    "row-remap": (0.15, 12, 72),
+}
+REPLACEMENT_HOURS = (2, 8)          # DOWN after a dbe / row-remap episode
+DEFAULT_FAILURES = 0.5              # episodes per node per 30 days
+MAINTENANCE = (1, 2, 4)             # weekday (0 = Monday), UTC start hour, hours
+BATCH_CELLS = 20_000_000            # values generated at once (rows × samples)
+# Head-node totals derived from the episode schedule: name → state counted ("total": every node).
+# nodes_* are per node (series_data.NODE_STATE) — each holds its own node's state.
+TOTALS = {f"devices_{state}": state for state in ("up", "down", "closed", "total")}
+
+# ── Schedule ──
+
+class Episode:
+    __slots__ = ("kind", "entity", "start", "end")   # sample indices, end exclusive
+
+    def __init__(self, kind, entity, start, end):
+        self.kind = kind; self.entity = entity; self.start = start; self.end = end
+
+    def __repr__(self):
+        return f"Episode({self.kind!r}, {self.entity!r}, {self.start}, {self.end})"
+
+def schedule(nodes, ts_s, step_s, failures=DEFAULT_FAILURES, seed=0):
+    """Failure episodes (with their replacement downtime) and maintenance closures, by sample index."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    n = len(ts_s)
+    kinds = list(EPISODES)
+    share = np.array([EPISODES[k][0] for k in kinds]); share /= share.sum()
+    out = []
+    expected = failures * (n * step_s) / (30 * 86400)
+    for node in nodes:
+        for _ in range(rng.poisson(expected)):
+            kind = kinds[rng.choice(len(kinds), p=share)]
+            _, lo, hi = EPISODES[kind]
+            start = int(rng.integers(0, n))
+            end = min(n, start + max(1, int(rng.uniform(lo, hi) * 3600 / step_s)))
+            out.append(Episode(kind, node, start, end))
+            if kind in ("dbe", "row-remap") and end < n:
+                repair = int(rng.uniform(*REPLACEMENT_HOURS) * 3600 / step_s)
+                out.append(Episode("down", node, end, min(n, end + max(1, repair))))
+    day, hour, hours = MAINTENANCE
+    racks = [nodes[i:i + RACK_SIZE] for i in range(0, len(nodes), RACK_SIZE)]
+    t = ts_s[0] - ts_s[0] % 86400 + hour * 3600
+    week = 0
+    while t <= ts_s[-1]:
+        if time.gmtime(t).tm_wday == day:
+            a, b = np.searchsorted(ts_s, [t, t + hours * 3600])
+            if b > a:
+                out += [Episode("closed", node, int(a), int(b)) for node in racks[week % len(racks)]]
+            week += 1
+        t += 86400
+    return sorted(out, key=lambda e: (e.start, e.entity))
+
+def node_states(episodes, nodes, n):
+    """{"up" / "down" / "closed" / "total": [node, sample] 0 / 1 state of each node}."""
+    import numpy as np
+    down = np.zeros((len(nodes), n), bool); closed = np.zeros((len(nodes), n), bool)
+    index = {node: i for i, node in enumerate(nodes)}
+    for e in episodes:
+        if e.kind in ("down", "closed"):
+            (down if e.kind == "down" else closed)[index[e.entity], e.start:e.end] = True
+    closed &= ~down
+    return {"up": ~(down | closed), "down": down, "closed": closed, "total": np.ones_like(down)}
+
+# ── Series ──
+
+def _walk(rng, rows, n, p, low, high, counter, health, start):
+    """Integer random walk [rows, n]: changes with probability p, reflected into [low, high];
+    counters only rise, health-like series stay at 0."""
+    import numpy as np
+    if health: return np.zeros((rows, n))
+    if high == low and not counter: return np.full((rows, n), float(low))
+    change = rng.random((rows, n)) < p
+    step = rng.integers(1, 6, (rows, n))
+    if not counter: step *= rng.choice(np.array([-1, 1]), (rows, n))
+    x = start[:, None] + np.cumsum(np.where(change, step, 0), axis=1)
+    if counter: return x.astype(np.float64)
+    w = high - low
+    r = np.mod(x - low, 2 * w)
+    return (low + np.where(r > w, 2 * w - r, r)).astype(np.float64)
+
+def generate(metrics, nodes, ts_s, step_s, episodes, cluster="su56", node_prefix="skt-dgx-",
+             profile=DEFAULT_PROFILE, seed=0):
+    """Yield (name, [label dicts], values [series, samples]) a metric (row batch) at a time;
+    NaN = no sample (node DOWN or CLOSED)."""
+    import numpy as np
+    rng = np.random.default_rng(seed + 1)
+    n = len(ts_s)
+    dgx = [f"{node_prefix}{i:03d}" for i in range(nodes)]
+    states = node_states(episodes, dgx, n)
+    totals = {state: m.sum(0) for state, m in states.items()}
+    node_row = {node: i for i, node in enumerate(dgx)}
+    by_entity = {}
+    for e in episodes: by_entity.setdefault(e.entity, []).append(e)
+    by_name = {}
+    for name, labels in series_data.synthetic_series(metrics, nodes, cluster, node_prefix, profile):
+        by_name.setdefault(name, []).append(series_data.parse_labels(labels))
+    batch = max(1, BATCH_CELLS // n)
+    rising = 1 + np.arange(n) * step_s // 3600   # "inc" fault counters: +1 per hour of the episode
+    for name, label_sets in by_name.items():
+        p = series_data.volatility(name)
+        low, high = _level(name)
+        counter = bool(re.fullmatch(COUNTER, name))
+        health = bool(re.fullmatch(series_data.HEALTH_LIKE, name, re.I))
+        effects = [(kind, value) for kind, fx in FAULTS.items() for pattern, value in fx
+                   if kind != "down" and re.fullmatch(pattern, name)]
+        reported = bool(re.fullmatch(REPORTED_WHEN_DOWN, name))
+        for a in range(0, len(label_sets), batch):
+            labels = label_sets[a:a + batch]
+            start = rng.integers(low, high + 1, len(labels)) if not health else np.zeros(len(labels))
+            values = _walk(rng, len(labels), n, p, low, high, counter, health, start)
+            if name in TOTALS:
+                values[:] = totals[TOTALS[name]]
+            elif name in series_data.NODE_STATE:
+                values[:] = states[name[len("nodes_"):]][[node_row[l["entity"]] for l in labels]]
+            for row, l in enumerate(labels):
+                for e in by_entity.get(l["entity"], ()):
+                    if e.kind in ("down", "closed") and name == "bcm_device_is_up":
+                        values[row, e.start:e.end] = 0
+                    elif e.kind in ("down", "closed") and not reported:
+                        values[row, e.start:e.end] = np.nan
+                    for kind, value in effects:
+                        if kind == e.kind:
+                            values[row, e.start:e.end] = rising[:e.end - e.start] if value == "inc" else value
+            yield name, [{"__name__": name, **l} for l in labels], values
+
+# ── Outputs ──
+
+def write_openmetrics(batches, ts_s, path):
+    """OpenMetrics text: each family contiguous, each series' samples in time order, # EOF.
+    Returns (series, samples)."""
+    import numpy as np
+    stamps = np.array([f" {t}\n" for t in ts_s.tolist()], dtype=object)
+    series = samples = 0
+    tmp = path + ".part"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for name, labels, values in batches:
+            f.write(f"# TYPE {name} unknown\n")
+            for l, row in zip(labels, values):
+                ok = ~np.isnan(row)
+                if not ok.any(): continue
+                prefix = name + series_data.format_labels({k: v for k, v in l.items() if k != "__name__"}) + " "
+                vals = row[ok].astype(np.int64).tolist()
+                f.write("".join([prefix + str(v) + t for v, t in zip(vals, stamps[ok].tolist())]))
+                series += 1; samples += len(vals)
+        f.write("# EOF\n")
+    os.replace(tmp, path)
+    return series, samples
+
+def write_blocks(openmetrics_path, out_dir):
+    promtool = shutil.which("promtool")
+    if not promtool:
+        raise RuntimeError("promtool not found on PATH — write --out FILE and run "
+                           "`promtool tsdb create-blocks-from openmetrics FILE DIR` where it is installed")
+    os.makedirs(out_dir, exist_ok=True)
+    subprocess.run([promtool, "tsdb", "create-blocks-from", "openmetrics", openmetrics_path, out_dir], check=True)
+
+def write_npz(batches, ts_s, path):
+    """promql_eval.Storage .npz (gaps stay NaN). Returns (series, samples)."""
+    import numpy as np
+    from promql_eval import Storage
+    st = Storage()
+    for name, labels, values in batches:
+        st.add(labels, ts_s * 1000, values)
+    st.save(path)
+    return st.series, int(sum((~np.isnan(b.values)).sum() for b in st.blocks))
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    import numpy as np
+    nodes, days, profile = int(opt("--nodes", 16)), float(opt("--days", 28)), opt("--profile", DEFAULT_PROFILE)
+    step_s = int(parse_interval(opt("--step", "60s")))
+    end_s = int(opt("--end", time.time())) // step_s * step_s
+    ts_s = np.arange(end_s - int(days * 86400) + step_s, end_s + 1, step_s, dtype=np.int64)
+    seed = int(opt("--seed", 0))
+    if "--all-metrics" in sys.argv:
+        inventory = metrics_inventory.load()
+    else:
+        import drop_rules
+        _, inventory, _ = drop_rules.plan()
+    metrics = series_data.profile_metrics([m.name for m in inventory], profile)
+    dgx = [f"skt-dgx-{i:03d}" for i in range(nodes)]
+    episodes = schedule(dgx, ts_s, step_s, float(opt("--failures", DEFAULT_FAILURES)), seed)
+    n_series = sum(1 for _ in series_data.synthetic_series(metrics, nodes, profile=profile))
+    print(f"Backfill: {nodes} nodes × {days:g} days at {step_s}s — {len(metrics)} metrics, {n_series} series, "
+          f"≤ {n_series * len(ts_s) / 1e6:.1f}M samples")
+    kinds = {}
+    for e in episodes: kinds[e.kind] = kinds.get(e.kind, 0) + 1
+    print("Episodes: " + (", ".join(f"{k} {n}" for k, n in sorted(kinds.items())) or "none"))
+
+    def batches():
+        return generate(metrics, nodes, ts_s, step_s, episodes, profile=profile, seed=seed)
+
+    outputs = [o for o in ("--out", "--blocks", "--npz") if o in sys.argv]
+    if not outputs:
+        for e in episodes[:20]:
+            print(f"  {e.kind:<10} {e.entity}  {time.strftime('%Y-%m-%d %H:%M', time.gmtime(ts_s[e.start]))}"
+                  f"  {(e.end - e.start) * step_s / 3600:.1f}h")
+        if len(episodes) > 20: print(f"  … {len(episodes) - 20} more")
+        sys.exit(0)
+    t0 = time.perf_counter()
+    if "--npz" in sys.argv:
+        s, n = write_npz(batches(), ts_s, opt("--npz"))
+        print(f"  ✅ {opt('--npz')} — {s} series, {n} samples ({time.perf_counter() - t0:.1f} s)")
+    if "--out" in sys.argv or "--blocks" in sys.argv:
+        path = opt("--out") or os.path.join(tempfile.mkdtemp(), "backfill.om")
+        s, n = write_openmetrics(batches(), ts_s, path)
+        print(f"  ✅ {path} — {s} series, {n} samples ({time.perf_counter() - t0:.1f} s)")
+        if "--blocks" in sys.argv:
+            try:
+                write_blocks(path, opt("--blocks"))
+            except RuntimeError as e:
+                sys.exit(f"  ❌ {e}")
+            print(f"  ✅ {opt('--blocks')}")
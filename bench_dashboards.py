@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Generator Benchmarks.
+
+Runs every builder (build_00 … build_04) and the full generate() pipeline across
+a fleet-scale parameter grid and compares against benchmarks/baseline.json.
+
+Grid:
+- GPU count per node: 8 (DGX B200) / 72 (GB200 NVL72 domain — "auto" collapses to regex queries)
+- IB port count:      8 (current IB_PORTS) / 32
+- Cluster count:      1 / 8 (one full generate() per cluster output dir)
+
+Recorded per case: wall time (best of N, build + encode), peak traced memory, panel count,
+target count and encoded JSON bytes. Counts and bytes are deterministic and
+must match the baseline exactly; time and memory may drift within --tolerance
+(default 1.0 = 2x, since pipeline runs are dominated by fsync latency).
+
+Usage: python3 bench_dashboards.py [--repeat N] [--tolerance 1.0] [--update-baseline]
+"""
+import contextlib, io, itertools, json, os, sys, tempfile, time, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import panel_builders
+from panel_builders import encode
+import generate_dashboards
+from generate_dashboards import BUILDERS, generate
+from build_report import count_panels
+from hardware_profiles import HardwareProfile
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+GPU_COUNTS = [8, 72]
+PORT_COUNTS = [8, 32]
+CLUSTER_COUNTS = [1, 8]
+
+# Deterministic metrics must match exactly; the rest are compared with tolerance
+# plus an absolute slack so sub-millisecond jitter is not reported as a regression
+EXACT = ("panels", "targets", "bytes")
+TIMED = {"wall_ms": 2.0, "peak_kb": 64.0}
+
+@contextlib.contextmanager
+def fleet_params(gpu_count, port_count):
+    """Temporarily build against a synthetic hardware profile (strategy "auto")."""
+    saved = panel_builders.PROFILE
+    panel_builders.set_profile(HardwareProfile(
+        f"bench-{gpu_count}x{port_count}", "Benchmark", gpus_per_node=gpu_count,
+        ib_ports=range(port_count)))
+    try:
+        yield
+    finally:
+        panel_builders.set_profile(saved)
+
+def encoded_bytes(dashboard):
+    return sum(len(c) for c in json.JSONEncoder(indent=4, default=encode).iterencode(dashboard))
+
+def _best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best * 1000
+
+def _peak_kb(fn):
+    tracemalloc.start()
+    try:
+        fn(); _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+def bench_builder(did, repeat):
+    module_name, func_name, _ = BUILDERS[did]
+    build_fn = getattr(__import__(module_name), func_name)
+    # Serialization is lazy, so build + encode is the real per-dashboard cost
+    wall = _best_of(lambda: encoded_bytes(build_fn()), repeat)
+    peak = _peak_kb(lambda: encoded_bytes(build_fn()))
+    d = build_fn()
+    panels, targets = count_panels(d.panels)
+    return {"wall_ms": round(wall, 3), "peak_kb": round(peak, 1),
+            "panels": panels, "targets": targets, "bytes": encoded_bytes(d)}
+
+def bench_pipeline(clusters, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                for c in range(clusters):
+                    generate(out_dir=os.path.join(tmp, f"cluster{c:02d}"))
+        wall = _best_of(run, repeat)
+        peak = _peak_kb(run)
+        nbytes = sum(os.path.getsize(os.path.join(dp, f))
+                     for dp, _, fs in os.walk(tmp) for f in fs)
+    panels = targets = 0
+    for module_name, func_name, _ in BUILDERS.values():
+        n, t = count_panels(getattr(__import__(module_name), func_name)().panels)
+        panels += n * clusters; targets += t * clusters
+    return {"wall_ms": round(wall, 3), "peak_kb": round(peak, 1),
+            "panels": panels, "targets": targets, "bytes": nbytes}
+
+def run_grid(repeat=5):
+    results = {}
+    for gpus, ports in itertools.product(GPU_COUNTS, PORT_COUNTS):
+        with fleet_params(gpus, ports):
+            for did in sorted(BUILDERS):
+                results[f"build_{did}/gpus={gpus}/ports={ports}"] = bench_builder(did, repeat)
+            for clusters in CLUSTER_COUNTS:
+                results[f"generate/gpus={gpus}/ports={ports}/clusters={clusters}"] = \
+                    bench_pipeline(clusters, repeat)
+    return results
+
+def compare(results, baseline, tolerance):
+    """Return a list of (case, metric, baseline, current) regressions."""
+    bad = []
+    for case, cur in results.items():
+        base = baseline.get(case)
+        if base is None: continue
+        for k in EXACT:
+            if cur[k] != base[k]: bad.append((case, k, base[k], cur[k]))
+        for k, slack in TIMED.items():
+            if cur[k] > base[k] * (1 + tolerance) + slack: bad.append((case, k, base[k], cur[k]))
+    return bad
+
+def print_table(results, baseline):
+    print(f"{'case':<44} {'wall ms':>9} {'peak KB':>9} {'panels':>7} {'targets':>8} {'bytes':>10}  vs baseline")
+    for case, r in results.items():
+        b = baseline.get(case)
+        delta = f"{(r['wall_ms'] / b['wall_ms'] - 1) * 100:+.0f}% time" if b and b["wall_ms"] else "new"
+        print(f"{case:<44} {r['wall_ms']:>9.2f} {r['peak_kb']:>9.1f} {r['panels']:>7} "
+              f"{r['targets']:>8} {r['bytes']:>10}  {delta}")
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 5
+    tolerance = float(sys.argv[sys.argv.index("--tolerance") + 1]) if "--tolerance" in sys.argv else 1.0
+
+    print(f"BMaaS Monitoring Dashboard Suite — Generator Benchmarks")
+    print(f"{'='*60}")
+    results = run_grid(repeat)
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f: baseline = json.load(f)
+    print_table(results, baseline)
+
+    if "--update-baseline" in sys.argv:
+        os.makedirs(os.path.dirname(BASELINE), exist_ok=True)
+        generate_dashboards.write_json_atomic(results, BASELINE, indent=2)
+        print(f"\n✅ Baseline updated: {BASELINE}")
+        sys.exit(0)
+
+    regressions = compare(results, baseline, tolerance)
+    print(f"\n{'='*60}")
+    for case, k, b, c in regressions:
+        print(f"  ❌ {case}: {k} {b} → {c}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) vs baseline (tolerance {tolerance:.0%})")
+        sys.exit(1)
+    print(f"✅ No regressions vs baseline ({len(results)} cases)")
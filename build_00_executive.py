@@ -7,11 +7,27 @@ V6 CHANGES:
 - nodes_* metrics now use EC filter (entity + cluster), not just CL
 - GPU health matrix shows ONLY problematic nodes with reasons
 - Fleet avg GPU utilization prominent stat
+- Fleet-wide KPIs (node counts, availability, health / NVLink / ECC rates, utilization,
+  composite score, trends) read cluster:* rollups via rollup() — cluster-wide, never
+  raw per-node / per-GPU series, and labelled "ignores $node"; per-entity panels keep EC
 - Dashboard title includes V6
 """
 import json, sys
 from panel_builders import *
 
+def fleet(metric, op):
+    """op(metric) over the $cluster selection, from the cluster:* rollups (ignores $node)."""
+    return rollup(metric, op, filters=CL)
+
+def share(metric, op, total_metric, total_op):
+    """fleet(metric, op) as a fraction of fleet(total_metric, total_op)."""
+    return f'({fleet(metric, op)} / clamp_min({fleet(total_metric, total_op)}, 1))'
+
+AVAIL  = share("nodes_up", "sum", "nodes_total", "sum")
+HEALTH = share("gpu_health_overall", "count_eq0", "gpu_health_overall", "count")
+NVLINK = share("gpu_health_nvlink", "count_eq0", "gpu_health_nvlink", "count")
+ECC    = share("gpu_ecc_dbe_agg", "count_eq0", "gpu_ecc_dbe_agg", "count")
+
 def build_00():
     reset_ids()
     panels = []
@@ -48,12 +64,12 @@ def build_00():
     panels.append(ts(
         "Node Availability Trend",
         "WHY: Track availability trend over time against SLA target.\n\n"
-        "FORMULA: nodes_up / nodes_total — fraction of fleet online.\n"
+        "FORMULA: nodes_up / nodes_total — fraction of fleet online "
+        "(cluster rollups, ignores $node).\n"
         "SLA TARGET: ≥ 99.5%. Red line = breach threshold.\n"
         "SIGNIFICANCE: Dips below 99.5% = SLA breach risk.",
         {"h":8,"w":8,"x":8,"y":y},
-        [tgt('sum(nodes_up{' + EC + '}) / clamp_min(sum(nodes_total{' + EC + '}), 1)',
-             'Availability')],
+        [tgt(AVAIL, 'Availability')],
         axis="Availability", unit="percentunit",
         overrides=[{"matcher":{"id":"byFrameRefID","options":"A"},"properties":[
             {"id":"custom.thresholdsStyle","value":{"mode":"line"}},
@@ -83,9 +99,9 @@ def build_00():
         "Nodes UP",
         "WHY: Nodes actively serving workloads = your available capacity.\n\n"
         "METRIC: nodes_up — BCM nodes in operational UP state.\n"
-        "FILTERED: entity=~skt-dgx (DGX GPU nodes only).",
+        "SCOPE: DGX nodes of $cluster (cluster rollups, ignores $node).",
         {"h":5,"w":6,"x":0,"y":y},
-        [tgt('sum(nodes_up{' + EC + '})','Nodes UP',instant=True)],
+        [tgt(fleet("nodes_up", "sum"),'Nodes UP',instant=True)],
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[{"color":C_OK,"value":None}]}))
 
@@ -93,10 +109,10 @@ def build_00():
         "Nodes DOWN",
         "WHY: DOWN nodes = lost revenue + SLA risk. Needs immediate investigation.\n\n"
         "METRIC: nodes_down — BCM nodes in DOWN state.\n"
-        "FILTERED: entity=~skt-dgx (DGX GPU nodes only).\n"
+        "SCOPE: DGX nodes of $cluster (cluster rollups, ignores $node).\n"
         "ACTION: > 0 = investigate hardware, cooling, network connectivity.",
         {"h":5,"w":6,"x":6,"y":y},
-        [tgt('sum(nodes_down{' + EC + '}) or vector(0)','Nodes DOWN',instant=True)],
+        [tgt(fleet("nodes_down", "sum") + ' or vector(0)','Nodes DOWN',instant=True)],
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[
             {"color":C_OK,"value":None},{"color":C_FL,"value":1}]}))
@@ -105,11 +121,11 @@ def build_00():
         "Nodes Closed",
         "WHY: CLOSED = intentionally taken offline by admin/BCM.\n\n"
         "METRIC: nodes_closed — nodes in CLOSED state.\n"
-        "FILTERED: entity=~skt-dgx (DGX GPU nodes only).\n"
+        "SCOPE: DGX nodes of $cluster (cluster rollups, ignores $node).\n"
         "MEANING: Node is reachable + managed but NOT accepting workloads. "
         "Used during maintenance, burn-in, or hardware validation.",
         {"h":5,"w":6,"x":12,"y":y},
-        [tgt('sum(nodes_closed{' + EC + '}) or vector(0)','Closed',instant=True)],
+        [tgt(fleet("nodes_closed", "sum") + ' or vector(0)','Closed',instant=True)],
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[
             {"color":C_OK,"value":None},{"color":C_WR,"value":1}]}))
@@ -118,10 +134,10 @@ def build_00():
         "Fleet Size (Total)",
         "WHY: Total nodes in fleet — baseline for capacity calculations.\n\n"
         "METRIC: nodes_total — total DGX nodes managed by BCM.\n"
-        "FILTERED: entity=~skt-dgx.\n"
+        "SCOPE: DGX nodes of $cluster (cluster rollups, ignores $node).\n"
         "CHECK: UP + DOWN + CLOSED should equal TOTAL.",
         {"h":5,"w":6,"x":18,"y":y},
-        [tgt('sum(nodes_total{' + EC + '})','Total',instant=True)],
+        [tgt(fleet("nodes_total", "sum"),'Total',instant=True)],
         color_mode="value", text_mode="value",
         thresholds={"mode":"absolute","steps":[{"color":C_BL,"value":None}]}))
     y += 5
@@ -185,10 +201,11 @@ def build_00():
     panels.append(stat(
         "Fleet Avg GPU Utilization",
         "WHY: Fleet-wide GPU util = PRIMARY revenue/efficiency KPI.\n\n"
-        "FORMULA: avg(gpu_utilization) across all DGX nodes.\n"
+        "FORMULA: avg(gpu_utilization) across all DGX nodes "
+        "(cluster:gpu_utilization rollups — cluster-wide, ignores $node).\n"
         "TARGET: > 70% = healthy. < 40% = wasted GPU capacity = revenue loss.",
         {"h":4,"w":5,"x":14,"y":y},
-        [tgt('avg(gpu_utilization{' + EC + '})','Avg Util',instant=True)],
+        [tgt(fleet("gpu_utilization", "avg"),'Avg Util',instant=True)],
         unit="percent", decimals=1,
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[
@@ -209,9 +226,9 @@ def build_00():
     # GPU count table
     panels.append(tbl(
         "GPU Count per Entity",
-        "WHY: B200 DGX should have 8 GPUs per node.\n\n"
+        f"WHY: {hardware_title()} should have {gpu_count()} GPUs per node.\n\n"
         "METRIC: gpu_count — GPUs detected by DCGM per entity.\n"
-        "< 8 = GPU not detected = hardware failure.\n"
+        f"< {gpu_count()} = GPU not detected = hardware failure.\n"
         "ACTION: Check GPU seating, PCIe, DCGM logs.",
         {"h":4,"w":5,"x":14,"y":y+4},
         [tgt('gpu_count{' + EC + '}','', fmt="table")],
@@ -222,8 +239,8 @@ def build_00():
             {"matcher":{"id":"byName","options":"GPUs"},"properties":[
                 {"id":"custom.displayMode","value":"color-background-solid"},
                 {"id":"thresholds","value":{"mode":"absolute","steps":[
-                    {"color":C_FL,"value":None},{"color":C_WR,"value":7},
-                    {"color":C_OK,"value":8}]}}]}],
+                    {"color":C_FL,"value":None},{"color":C_WR,"value":gpu_count() - 1},
+                    {"color":C_OK,"value":gpu_count()}]}}]}],
         sort=[{"displayName":"GPUs","desc":False}]))
 
     panels.append(stat(
@@ -321,10 +338,11 @@ def build_00():
     panels.append(ts(
         "Fleet Avg GPU Utilization (Trend)",
         "WHY: Fleet-wide GPU utilization trend.\n\n"
-        "FORMULA: avg(gpu_utilization) across all DGX nodes.\n"
+        "FORMULA: avg(gpu_utilization) across all DGX nodes "
+        "(cluster:gpu_utilization rollups — cluster-wide, ignores $node).\n"
         "SIGNIFICANCE: Trending down = workload migration or scheduling problem.",
         {"h":6,"w":12,"x":12,"y":y},
-        [tgt('avg(gpu_utilization{' + EC + '})','Fleet Avg')],
+        [tgt(fleet("gpu_utilization", "avg"),'Fleet Avg')],
         axis="Utilization %", unit="percent"))
     y += 6
 
@@ -336,11 +354,12 @@ def build_00():
     panels.append(ts(
         "Fleet GPU ECC Error Trend",
         "WHY: Rising ECC errors across fleet = aging/degrading HBM memory.\n\n"
-        "METRIC: gpu_ecc_sbe_agg (correctable) vs gpu_ecc_dbe_agg (UNCORRECTABLE).\n"
+        "METRIC: gpu_ecc_sbe_agg (correctable) vs gpu_ecc_dbe_agg (UNCORRECTABLE), "
+        "from cluster:*:sum rollups — cluster-wide, ignores $node.\n"
         "DBE > 0 = IMMEDIATE GPU REPLACEMENT.",
         {"h":6,"w":8,"x":0,"y":y},
-        [tgt('sum(gpu_ecc_sbe_agg{' + EC + '})','SBE (Correctable)'),
-         tgt('sum(gpu_ecc_dbe_agg{' + EC + '})','DBE (Uncorrectable)')],
+        [tgt(fleet("gpu_ecc_sbe_agg", "sum"),'SBE (Correctable)'),
+         tgt(fleet("gpu_ecc_dbe_agg", "sum"),'DBE (Uncorrectable)')],
         axis="Errors",
         overrides=[
             {"matcher":{"id":"byName","options":"DBE (Uncorrectable)"},"properties":[
@@ -351,10 +370,11 @@ def build_00():
     panels.append(ts(
         "GPU Health Failures Over Time",
         "WHY: Count of nodes with GPU health issues trending.\n\n"
-        "FORMULA: count(gpu_health_overall > 0).\n"
+        "FORMULA: count(gpu_health_overall > 0) — cluster:gpu_health_overall:count_gt0 rollup, "
+        "cluster-wide, ignores $node.\n"
         "Rising trend = fleet aging, environmental issue, or batch defect.",
         {"h":6,"w":8,"x":8,"y":y},
-        [tgt('count(gpu_health_overall{' + EC + '} > 0) or vector(0)','Failures')],
+        [tgt(fleet("gpu_health_overall", "count_gt0") + ' or vector(0)','Failures')],
         axis="Failing Nodes"))
 
     panels.append(ts(
@@ -424,10 +444,9 @@ def build_00():
 
     panels.append(stat(
         "Node Availability",
-        "FORMULA: nodes_up / nodes_total × 100.\nSLA TARGET: ≥ 99.5%.",
+        "FORMULA: nodes_up / nodes_total × 100 (cluster rollups, ignores $node).\nSLA TARGET: ≥ 99.5%.",
         {"h":6,"w":4,"x":0,"y":y},
-        [tgt('(sum(nodes_up{' + EC + '}) / clamp_min(sum(nodes_total{' + EC + '}), 1)) * 100',
-             'Availability', instant=True)],
+        [tgt(AVAIL + ' * 100', 'Availability', instant=True)],
         unit="percent", decimals=1,
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[
@@ -436,10 +455,10 @@ def build_00():
 
     panels.append(stat(
         "GPU Health Score",
-        "FORMULA: count(gpu_health_overall == 0) / count(gpu_health_overall) × 100.\nSLA TARGET: ≥ 99.5%.",
+        "FORMULA: count(gpu_health_overall == 0) / count(gpu_health_overall) × 100 "
+        "(cluster rollups, ignores $node).\nSLA TARGET: ≥ 99.5%.",
         {"h":6,"w":4,"x":4,"y":y},
-        [tgt('(count(gpu_health_overall{' + EC + '} == 0) / clamp_min(count(gpu_health_overall{' + EC + '}), 1)) * 100',
-             'GPU Health', instant=True)],
+        [tgt(HEALTH + ' * 100', 'GPU Health', instant=True)],
         unit="percent", decimals=1,
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[
@@ -448,10 +467,10 @@ def build_00():
 
     panels.append(stat(
         "NVLink Health",
-        "FORMULA: count(gpu_health_nvlink == 0) / count(gpu_health_nvlink) × 100.",
+        "FORMULA: count(gpu_health_nvlink == 0) / count(gpu_health_nvlink) × 100 "
+        "(cluster rollups, ignores $node).",
         {"h":6,"w":4,"x":8,"y":y},
-        [tgt('(count(gpu_health_nvlink{' + EC + '} == 0) / clamp_min(count(gpu_health_nvlink{' + EC + '}), 1)) * 100',
-             'NVLink', instant=True)],
+        [tgt(NVLINK + ' * 100', 'NVLink', instant=True)],
         unit="percent", decimals=1,
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[
@@ -460,9 +479,9 @@ def build_00():
 
     panels.append(stat(
         "Fleet GPU Utilization",
-        "FORMULA: avg(gpu_utilization) across all DGX nodes.",
+        "FORMULA: avg(gpu_utilization) across all DGX nodes (cluster rollups, ignores $node).",
         {"h":6,"w":4,"x":12,"y":y},
-        [tgt('avg(gpu_utilization{' + EC + '})', 'Avg Util', instant=True)],
+        [tgt(fleet("gpu_utilization", "avg"), 'Avg Util', instant=True)],
         unit="percent", decimals=1,
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[
@@ -471,10 +490,10 @@ def build_00():
 
     panels.append(stat(
         "ECC Clean Rate",
-        "FORMULA: count(gpu_ecc_dbe_agg == 0) / count(gpu_ecc_dbe_agg) × 100.",
+        "FORMULA: count(gpu_ecc_dbe_agg == 0) / count(gpu_ecc_dbe_agg) × 100 "
+        "(cluster rollups, ignores $node).",
         {"h":6,"w":4,"x":16,"y":y},
-        [tgt('(count(gpu_ecc_dbe_agg{' + EC + '} == 0) / clamp_min(count(gpu_ecc_dbe_agg{' + EC + '}), 1)) * 100',
-             'ECC Clean', instant=True)],
+        [tgt(ECC + ' * 100', 'ECC Clean', instant=True)],
         unit="percent", decimals=1,
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[
@@ -484,16 +503,12 @@ def build_00():
     panels.append(stat(
         "🏥 Composite Score",
         "Weighted: Node Avail (30%) + GPU Health (25%) + NVLink (15%) + Util (15%) + ECC (15%).\n"
+        "Cluster rollups, ignores $node.\n"
         "Green ≥ 95% = fleet operational. Yellow 90-95% = degraded. Red < 90% = critical.",
         {"h":6,"w":4,"x":20,"y":y},
         [tgt(
-            '('
-            '(sum(nodes_up{' + EC + '}) / clamp_min(sum(nodes_total{' + EC + '}), 1)) * 0.30 + '
-            '(count(gpu_health_overall{' + EC + '} == 0) / clamp_min(count(gpu_health_overall{' + EC + '}), 1)) * 0.25 + '
-            '(count(gpu_health_nvlink{' + EC + '} == 0) / clamp_min(count(gpu_health_nvlink{' + EC + '}), 1)) * 0.15 + '
-            '(avg(gpu_utilization{' + EC + '}) / 100) * 0.15 + '
-            '(count(gpu_ecc_dbe_agg{' + EC + '} == 0) / clamp_min(count(gpu_ecc_dbe_agg{' + EC + '}), 1)) * 0.15'
-            ') * 100',
+            f'({AVAIL} * 0.30 + {HEALTH} * 0.25 + {NVLINK} * 0.15 + '
+            f'({fleet("gpu_utilization", "avg")}) / 100 * 0.15 + {ECC} * 0.15) * 100',
             'Fleet Score', instant=True
         )],
         unit="percent", decimals=1,
@@ -519,5 +534,5 @@ if __name__ == "__main__":
     out = sys.argv[1] if len(sys.argv) > 1 else "dashboards/00-executive-fleet-overview.json"
     d = build_00()
     with open(out, "w") as f:
-        json.dump(d, f, indent=4)
-    print(f"Generated {out}: {len(d['panels'])} panels")
+        json.dump(d, f, indent=4, default=encode)
+    print(f"Generated {out}: {len(d.panels)} panels")
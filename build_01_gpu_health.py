@@ -16,6 +16,9 @@ from panel_builders import *
 
 def build_01():
     reset_ids()
+    use_gpu_variable()
+    use_rack_variable()
+    EC = node_filter()   # entity + cluster + $rack: the rack drill link narrows every query
     panels = []
     y = 0
 
@@ -24,27 +27,28 @@ def build_01():
     # ════════════════════════════════════════════════════════
     panels.append(row("GPU Health Overview", y)); y += 1
 
-    panels.append(heatmap(
-        "GPU Health Matrix (per Node)",
-        "WHY: Instantly visualize which nodes have GPU health issues.\n\n"
-        "METRIC: gpu_health_overall — DCGM aggregate health check.\n"
-        "0 = PASS (green), > 0 = FAIL (red). Each row = one DGX node.\n"
-        "SIGNIFICANCE: Failed nodes should NOT receive new workloads.\n"
-        "ACTION: Filter by specific node using the dropdown to drill down.",
+    panels.append(fleet_heatmap(
+        "GPU Health Matrix (per Rack)",
+        "WHY: Instantly visualize which racks have GPU health issues — scales to thousands of nodes.\n\n"
+        "METRIC: rack:gpu_health_overall:max — worst DCGM health state of any node in the rack "
+        "(recording rule). Cluster-wide: ignores $node.\n"
+        "0 = PASS (green), > 0 = FAIL (red). Each row = one rack.\n"
+        "ACTION: Click a rack to reopen this dashboard with $rack set to it; "
+        "the per-node matrix is in the collapsed row below.",
         {"h":8,"w":12,"x":0,"y":y},
-        [tgt('gpu_health_overall{' + EC + '}','{{entity}}')]))
+        drill_uid=UIDS["01"]))
 
     panels.append(bargauge(
         "GPUs per Entity",
-        "WHY: Validate hardware config — B200 DGX should have 8 GPUs.\n\n"
+        f"WHY: Validate hardware config — {hardware_title()} should have {gpu_count()} GPUs.\n\n"
         "METRIC: gpu_count — GPUs detected by DCGM per entity.\n"
-        "SIGNIFICANCE: < 8 = GPU not detected = hardware failure.\n"
+        f"SIGNIFICANCE: < {gpu_count()} = GPU not detected = hardware failure.\n"
         "ACTION: Check GPU seating, PCIe link, DCGM logs.",
         {"h":8,"w":6,"x":12,"y":y},
         [tgt('gpu_count{' + EC + '}','{{entity}}',instant=True)],
         thresholds={"mode":"absolute","steps":[
-            {"color":C_FL,"value":None},{"color":C_WR,"value":7},
-            {"color":C_OK,"value":8}]}))
+            {"color":C_FL,"value":None},{"color":C_WR,"value":gpu_count() - 1},
+            {"color":C_OK,"value":gpu_count()}]}))
 
     panels.append(stat(
         "Nodes Needing GPU RMA",
@@ -91,6 +95,21 @@ def build_01():
                 {"color":C_OK,"value":None},{"color":C_FL,"value":1}]}))
     y += 8
 
+    # ════════════════════════════════════════════════════════
+    # ROW (collapsed): per-node health matrix — queried only when expanded
+    # ════════════════════════════════════════════════════════
+    node_row = row("GPU Health Matrix (per Node)", y, collapsed=True); y += 1
+    panels.append(node_row)
+    node_row.panels.append(heatmap(
+        "GPU Health Matrix (per Node)",
+        "WHY: Which nodes have GPU health issues.\n\n"
+        "METRIC: gpu_health_overall — DCGM aggregate health check.\n"
+        "0 = PASS (green), > 0 = FAIL (red). Each row = one DGX node.\n"
+        "SIGNIFICANCE: Failed nodes should NOT receive new workloads.\n"
+        "ACTION: Narrow $node (or click a rack above) before expanding on large fleets.",
+        {"h":10,"w":24,"x":0,"y":y},
+        [tgt('gpu_health_overall{' + EC + '}','{{entity}}')]))
+
     # ════════════════════════════════════════════════════════
     # ROW: ECC Error Tracking
     # ════════════════════════════════════════════════════════
@@ -173,20 +192,20 @@ def build_01():
     panels.append(row("GPU Temperature (per-GPU)", y)); y += 1
 
     panels.append(ts(
-        "GPU Core Temp (gpu0-gpu3)",
+        f"GPU Core Temp ({gpu_range_label(0)})",
         "WHY: Monitor GPU die temperature under load.\n\n"
-        "METRICS: gpu0_temperature .. gpu3_temperature.\n"
+        f"METRICS: {gpu_metric_range('temperature', 0)}.\n"
         "THRESHOLDS: < 75°C = normal (liquid-cooled), > 83°C = throttle risk.",
         {"h":6,"w":12,"x":0,"y":y},
-        [tgt(f'gpu{i}_temperature{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(4)],
+        gpu_targets("temperature", half=0),
         axis="Temperature", unit="celsius"))
 
     panels.append(ts(
-        "GPU Core Temp (gpu4-gpu7)",
-        "WHY: All 8 GPUs must stay within thermal envelope.\n\n"
-        "METRICS: gpu4_temperature .. gpu7_temperature.",
+        f"GPU Core Temp ({gpu_range_label(1)})",
+        f"WHY: All {gpu_count()} GPUs must stay within thermal envelope.\n\n"
+        f"METRICS: {gpu_metric_range('temperature', 1)}.",
         {"h":6,"w":12,"x":12,"y":y},
-        [tgt(f'gpu{i}_temperature{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(4,8)],
+        gpu_targets("temperature", half=1),
         axis="Temperature", unit="celsius"))
     y += 6
 
@@ -196,20 +215,20 @@ def build_01():
     panels.append(row("HBM Memory Temperature", y)); y += 1
 
     panels.append(ts(
-        "HBM Temp (gpu0-gpu3)",
+        f"HBM Temp ({gpu_range_label(0)})",
         "WHY: HBM (High Bandwidth Memory) is thermally sensitive.\n\n"
-        "METRICS: gpu0_mem_temp .. gpu3_mem_temp.\n"
+        f"METRICS: {gpu_metric_range('mem_temp', 0)}.\n"
         "THRESHOLDS: > 95°C = warning, > 105°C = CRITICAL (data corruption risk).",
         {"h":6,"w":12,"x":0,"y":y},
-        [tgt(f'gpu{i}_mem_temp{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(4)],
+        gpu_targets("mem_temp", half=0),
         axis="HBM Temp", unit="celsius"))
 
     panels.append(ts(
-        "HBM Temp (gpu4-gpu7)",
-        "WHY: All 8 GPUs' HBM temperature must be monitored equally.\n\n"
-        "METRICS: gpu4_mem_temp .. gpu7_mem_temp.",
+        f"HBM Temp ({gpu_range_label(1)})",
+        f"WHY: All {gpu_count()} GPUs' HBM temperature must be monitored equally.\n\n"
+        f"METRICS: {gpu_metric_range('mem_temp', 1)}.",
         {"h":6,"w":12,"x":12,"y":y},
-        [tgt(f'gpu{i}_mem_temp{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(4,8)],
+        gpu_targets("mem_temp", half=1),
         axis="HBM Temp", unit="celsius"))
     y += 6
 
@@ -221,19 +240,19 @@ def build_01():
     panels.append(ts(
         "Per-GPU Power Draw",
         "WHY: Each B200 GPU has 1000W TDP. Track actual vs budget.\n\n"
-        "METRICS: gpu0_power .. gpu7_power — individual GPU wattage.\n"
+        f"METRICS: {gpu_metric_range('power')} — individual GPU wattage.\n"
         "SIGNIFICANCE: Under-TDP during load = throttling. Near-TDP = healthy.",
         {"h":6,"w":12,"x":0,"y":y},
-        [tgt(f'gpu{i}_power{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("power"),
         axis="Power", unit="watt"))
 
     panels.append(ts(
         "GPU Throttle Events",
         "WHY: Throttling = GPU forced to reduce clock speed. Performance loss.\n\n"
-        "METRICS: gpu0_throttle .. gpu7_throttle — 0 = no throttle.\n"
+        f"METRICS: {gpu_metric_range('throttle')} — 0 = no throttle.\n"
         "ACTION: Sustained > 0 = check cooling (CDU flow), power supply.",
         {"h":6,"w":12,"x":12,"y":y},
-        [tgt(f'gpu{i}_throttle{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("throttle"),
         axis="Throttle"))
     y += 6
 
@@ -245,19 +264,19 @@ def build_01():
     panels.append(ts(
         "GPU SM Clock Speed",
         "WHY: SM clock determines GPU compute throughput.\n\n"
-        "METRICS: gpu0_clock .. gpu7_clock.\n"
+        f"METRICS: {gpu_metric_range('clock')}.\n"
         "SIGNIFICANCE: Lower-than-expected during load = power/thermal throttling.",
         {"h":6,"w":12,"x":0,"y":y},
-        [tgt(f'gpu{i}_clock{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("clock"),
         axis="Clock (MHz)"))
 
     panels.append(ts(
         "GPU Performance State",
         "WHY: P-state shows GPU power mode: P0 = max, P8 = idle.\n\n"
-        "METRICS: gpu0_perfstate .. gpu7_perfstate.\n"
+        f"METRICS: {gpu_metric_range('perfstate')}.\n"
         "SIGNIFICANCE: P0 during workload = healthy. Higher P-state = underperforming.",
         {"h":6,"w":12,"x":12,"y":y},
-        [tgt(f'gpu{i}_perfstate{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("perfstate"),
         axis="PerfState"))
     y += 6
 
@@ -346,7 +365,7 @@ def build_01():
                     "temperature (core+HBM), power/throttle, clock/perfstate, NVLink errors.",
         tags=["bmaas","gpu","health","diagnostics","ecc","nvlink","b200","bcm11","v6"],
         panels=panels,
-        templating=standard_templating(),
+        templating=standard_templating(extra_vars=[gpu_variable()]),
         links=sub_dashboard_links()
     )
 
@@ -354,5 +373,5 @@ if __name__ == "__main__":
     out = sys.argv[1] if len(sys.argv) > 1 else "dashboards/01-gpu-health-diagnostics.json"
     d = build_01()
     with open(out, "w") as f:
-        json.dump(d, f, indent=4)
-    print(f"Generated {out}: {len(d['panels'])} panels")
+        json.dump(d, f, indent=4, default=encode)
+    print(f"Generated {out}: {len(d.panels)} panels")
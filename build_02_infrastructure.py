@@ -72,12 +72,12 @@ def build_02():
         axis="Watts", unit="watt"))
 
     panels.append(ts(
-        "Per-GPU Power Draw (All 8)",
+        f"Per-GPU Power Draw (All {gpu_count()})",
         "WHY: Identify which specific GPU is consuming more/less power.\n\n"
-        "METRICS: gpu0_power .. gpu7_power.\n"
+        f"METRICS: {gpu_metric_range('power')}.\n"
         "SIGNIFICANCE: Large variance across GPUs on same node = issue.",
         {"h":6,"w":8,"x":16,"y":y},
-        [tgt(f'gpu{i}_power{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("power"),
         axis="Power", unit="watt"))
     y += 6
 
@@ -87,12 +87,12 @@ def build_02():
     panels.append(row("Cooling & Thermal", y)); y += 1
 
     panels.append(ts(
-        "GPU Die Temperature (All 8)",
+        f"GPU Die Temperature (All {gpu_count()})",
         "WHY: Primary thermal indicator — liquid-cooled B200 should stay < 83°C.\n\n"
-        "METRICS: gpu0_temperature .. gpu7_temperature.\n"
+        f"METRICS: {gpu_metric_range('temperature')}.\n"
         "ACTION: > 83°C = throttling starts. > 90°C = CDU cooling issue.",
         {"h":6,"w":8,"x":0,"y":y},
-        [tgt(f'gpu{i}_temperature{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("temperature"),
         axis="Temperature", unit="celsius"))
 
     panels.append(ts(
@@ -130,6 +130,50 @@ def build_02():
         axis="Alert Level"))
     y += 6
 
+    # ════════════════════════════════════════════════════════
+    # ROW: Fleet GPU Distributions (precomputed histograms)
+    # ════════════════════════════════════════════════════════
+    panels.append(row("Fleet GPU Distributions", y)); y += 1
+
+    panels.append(histogram_heatmap(
+        "GPU Die Temperature Distribution",
+        "WHY: Thermal state of every GPU in the cluster at constant query cost.\n\n"
+        "METRIC: cluster:gpu_temperature:bucket — recording rule bucketing gpuN_temperature "
+        "(rules/bmaas-gpu-histograms.yaml). Cluster-wide: ignores $node.\n"
+        "ACTION: Mass moving into ≥ 83°C buckets = facility cooling issue, not a single node.",
+        {"h":7,"w":8,"x":0,"y":y},
+        [tgt('sum by (le) (cluster:gpu_temperature:bucket{' + CL + '})','')],
+        unit="celsius"))
+
+    panels.append(histogram_heatmap(
+        "HBM Temperature Distribution",
+        "WHY: HBM is thermally sensitive — > 105°C risks data corruption.\n\n"
+        "METRIC: cluster:gpu_mem_temp:bucket (bucketed gpuN_mem_temp). Cluster-wide: ignores $node.",
+        {"h":7,"w":8,"x":8,"y":y},
+        [tgt('sum by (le) (cluster:gpu_mem_temp:bucket{' + CL + '})','')],
+        unit="celsius"))
+
+    panels.append(histogram_heatmap(
+        "GPU Power Distribution",
+        "WHY: Fleet power profile — idle vs full-TDP GPUs at a glance.\n\n"
+        "METRIC: cluster:gpu_power:bucket (bucketed gpuN_power). Cluster-wide: ignores $node.",
+        {"h":7,"w":8,"x":16,"y":y},
+        [tgt('sum by (le) (cluster:gpu_power:bucket{' + CL + '})','')],
+        unit="watt", scheme="Blues"))
+    y += 7
+
+    panels.append(bargauge(
+        "Racks with Hot GPUs (> 83°C)",
+        "WHY: Localize thermal problems to racks (CDU / airflow) without per-GPU series.\n\n"
+        "FORMULA: rack:gpu_temperature:bucket{le=\"+Inf\"} − {le=\"83\"} = GPUs above 83°C per rack.\n"
+        "ACTION: A whole rack hot = rack cooling. Drill into 07 for its nodes.",
+        {"h":6,"w":24,"x":0,"y":y},
+        [tgt('sort_desc(sum by (rack) (rack:gpu_temperature:bucket{' + CL + ',le="+Inf"}) '
+             '- sum by (rack) (rack:gpu_temperature:bucket{' + CL + ',le="83"}) > 0)','{{rack}}',
+             instant=True)],
+        thresholds={"mode":"absolute","steps":[{"color":C_WR,"value":None},{"color":C_FL,"value":4}]}))
+    y += 6
+
     # ════════════════════════════════════════════════════════
     # ROW: Storage / NVMe Health
     # ════════════════════════════════════════════════════════
@@ -159,11 +203,8 @@ def build_02():
         "nvme*_spare — remaining spare capacity (100 = full, 0 = exhausted).\n"
         "ACTION: Critical > 0 or Spare < 10 = REPLACE DRIVE.",
         {"h":6,"w":6,"x":12,"y":y},
-        [tgt('nvme3_critical{' + EC + '}','{{entity}} nvme3 crit'),
-         tgt('nvme3_spare{' + EC + '}','{{entity}} nvme3 spare'),
-         tgt('nvme4_critical{' + EC + '}','{{entity}} nvme4 crit'),
-         tgt('nvme4_spare{' + EC + '}','{{entity}} nvme4 spare'),
-         tgt('nvme5_critical{' + EC + '}','{{entity}} nvme5 crit')],
+        indexed_targets("nvme", "critical", [3, 4, 5], "{{entity}} nvme{i} crit") +
+        indexed_targets("nvme", "spare", [3, 4], "{{entity}} nvme{i} spare"),
         axis="Health"))
 
     panels.append(ts(
@@ -172,9 +213,8 @@ def build_02():
         "METRICS: nvme*_pci_errors — PCIe error counters.\n"
         "SIGNIFICANCE: Rising = drive or slot degrading. May need reseat.",
         {"h":6,"w":6,"x":18,"y":y},
-        [tgt('nvme2_pci_errors{' + EC + '}','{{entity}} nvme2'),
-         tgt('nvme5_pci_errors{' + EC + '}','{{entity}} nvme5'),
-         tgt('nvme5_pci_link_errors{' + EC + '}','{{entity}} nvme5 link')],
+        indexed_targets("nvme", "pci_errors", [2, 5], "{{entity}} nvme{i}") +
+        indexed_targets("nvme", "pci_link_errors", [5], "{{entity}} nvme{i} link"),
         axis="Errors"))
     y += 6
 
@@ -351,5 +391,5 @@ if __name__ == "__main__":
     out = sys.argv[1] if len(sys.argv) > 1 else "dashboards/02-infrastructure-hardware-health.json"
     d = build_02()
     with open(out, "w") as f:
-        json.dump(d, f, indent=4)
-    print(f"Generated {out}: {len(d['panels'])} panels")
+        json.dump(d, f, indent=4, default=encode)
+    print(f"Generated {out}: {len(d.panels)} panels")
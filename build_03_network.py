@@ -11,8 +11,6 @@ v4 OVERHAUL:
 import json, sys
 from panel_builders import *
 
-IB_PORTS = [4, 7, 8, 9, 10, 13, 14, 15]
-
 def build_03():
     reset_ids()
     panels = []
@@ -140,8 +138,7 @@ def build_03():
         "METRIC: infiniband_mlx5_*_link_state — 5=LinkUp, 1=Down.\n"
         "SIGNIFICANCE: All ports should be 5 (LinkUp) for full IB bandwidth.",
         {"h":6,"w":12,"x":0,"y":y},
-        [tgt(f'infiniband_mlx5_{p}_link_state{{{EC}}}', f'{{{{entity}}}} mlx5_{p}')
-         for p in IB_PORTS],
+        ib_targets("link_state"),
         axis="Link State"))
 
     panels.append(ts(
@@ -150,8 +147,7 @@ def build_03():
         "METRIC: infiniband_mlx5_*_link_downed — cumulative flap counter.\n"
         "ACTION: Rising = cable/HCA issue. Reseat or replace.",
         {"h":6,"w":12,"x":12,"y":y},
-        [tgt(f'infiniband_mlx5_{p}_link_downed{{{EC}}}', f'{{{{entity}}}} mlx5_{p}')
-         for p in IB_PORTS],
+        ib_targets("link_downed"),
         axis="Link Downed"))
     y += 6
 
@@ -161,8 +157,7 @@ def build_03():
         "METRIC: infiniband_mlx5_*_rate.\n"
         "ACTION: Lower-than-expected = cable quality issue or port config.",
         {"h":6,"w":12,"x":0,"y":y},
-        [tgt(f'infiniband_mlx5_{p}_rate{{{EC}}}', f'{{{{entity}}}} mlx5_{p}')
-         for p in IB_PORTS],
+        ib_targets("rate"),
         axis="Rate (Gbps)"))
 
     panels.append(ts(
@@ -171,8 +166,7 @@ def build_03():
         "METRIC: infiniband_mlx5_*_phys_state.\n"
         "SIGNIFICANCE: Stuck in Polling = cable/port mismatch.",
         {"h":6,"w":12,"x":12,"y":y},
-        [tgt(f'infiniband_mlx5_{p}_phys_state{{{EC}}}', f'{{{{entity}}}} mlx5_{p}')
-         for p in IB_PORTS],
+        ib_targets("phys_state"),
         axis="PhysState"))
     y += 6
 
@@ -264,5 +258,5 @@ if __name__ == "__main__":
     out = sys.argv[1] if len(sys.argv) > 1 else "dashboards/03-network-fabric-monitoring.json"
     d = build_03()
     with open(out, "w") as f:
-        json.dump(d, f, indent=4)
-    print(f"Generated {out}: {len(d['panels'])} panels")
+        json.dump(d, f, indent=4, default=encode)
+    print(f"Generated {out}: {len(d.panels)} panels")
@@ -13,6 +13,7 @@ from panel_builders import *
 
 def build_04():
     reset_ids()
+    use_gpu_variable()
     panels = []
     y = 0
 
@@ -24,10 +25,11 @@ def build_04():
     panels.append(stat(
         "Fleet Average GPU Utilization",
         "WHY: Fleet-wide GPU util is the primary revenue/efficiency KPI.\n\n"
-        "FORMULA: avg(gpu_utilization) across all nodes in cluster.\n"
+        "FORMULA: avg(gpu_utilization) across all nodes in cluster "
+        "(cluster:gpu_utilization:sum / :count rollups).\n"
         "TARGET: > 70% = healthy. < 40% = wasted GPU capacity = revenue loss.",
         {"h":6,"w":4,"x":0,"y":y},
-        [tgt('avg(gpu_utilization{' + CL + '})','Avg Util',instant=True)],
+        [tgt(rollup("gpu_utilization", "avg", filters=CL),'Avg Util',instant=True)],
         unit="percent", decimals=1,
         color_mode="background", text_mode="value",
         thresholds={"mode":"absolute","steps":[
@@ -59,21 +61,21 @@ def build_04():
     panels.append(row("Per-GPU Performance Under Load", y)); y += 1
 
     panels.append(ts(
-        "GPU Clock Speed (All 8)",
+        f"GPU Clock Speed (All {gpu_count()})",
         "WHY: Clock speed directly affects compute throughput.\n\n"
-        "METRICS: gpu0_clock .. gpu7_clock.\n"
+        f"METRICS: {gpu_metric_range('clock')}.\n"
         "SIGNIFICANCE: Lower-than-expected during load = power/thermal throttling.",
         {"h":6,"w":12,"x":0,"y":y},
-        [tgt(f'gpu{i}_clock{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("clock"),
         axis="Clock (MHz)"))
 
     panels.append(ts(
         "GPU Performance State",
         "WHY: P-state indicates GPU power mode during workload.\n\n"
-        "METRICS: gpu0_perfstate .. gpu7_perfstate.\n"
+        f"METRICS: {gpu_metric_range('perfstate')}.\n"
         "EXPECTED: P0 during active training. P8 = idle GPU (not utilized).",
         {"h":6,"w":12,"x":12,"y":y},
-        [tgt(f'gpu{i}_perfstate{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("perfstate"),
         axis="PerfState"))
     y += 6
 
@@ -92,11 +94,11 @@ def build_04():
         axis="Power", unit="watt"))
 
     panels.append(ts(
-        "Per-GPU Power (All 8)",
+        f"Per-GPU Power (All {gpu_count()})",
         "WHY: Identify specific GPUs drawing less power = possible throttling.\n\n"
-        "METRICS: gpu0_power .. gpu7_power.",
+        f"METRICS: {gpu_metric_range('power')}.",
         {"h":6,"w":8,"x":8,"y":y},
-        [tgt(f'gpu{i}_power{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("power"),
         axis="Power", unit="watt"))
 
     panels.append(ts(
@@ -118,19 +120,19 @@ def build_04():
     panels.append(ts(
         "GPU Throttle Events",
         "WHY: Throttling = forced clock reduction. Performance loss for running jobs.\n\n"
-        "METRICS: gpu0_throttle .. gpu7_throttle — 0 = no throttle.\n"
+        f"METRICS: {gpu_metric_range('throttle')} — 0 = no throttle.\n"
         "ACTION: Sustained > 0 = check CDU cooling, power supply, ambient temp.",
         {"h":6,"w":8,"x":0,"y":y},
-        [tgt(f'gpu{i}_throttle{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("throttle"),
         axis="Throttle"))
 
     panels.append(ts(
         "GPU Temperature Under Load",
         "WHY: Thermal monitoring during active workload.\n\n"
-        "METRICS: gpu0_temperature .. gpu7_temperature.\n"
+        f"METRICS: {gpu_metric_range('temperature')}.\n"
         "THRESHOLD: > 83°C = throttle risk. > 90°C = cooling failure.",
         {"h":6,"w":8,"x":8,"y":y},
-        [tgt(f'gpu{i}_temperature{{{EC}}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
+        gpu_targets("temperature"),
         axis="Temperature", unit="celsius"))
 
     panels.append(ts(
@@ -231,7 +233,7 @@ def build_04():
                     "ECC error correlation, recovery checks, memory pressure.",
         tags=["bmaas","workload","job","performance","gpu","utilization","bcm11","v6"],
         panels=panels,
-        templating=standard_templating(),
+        templating=standard_templating(extra_vars=[gpu_variable()]),
         links=sub_dashboard_links()
     )
 
@@ -239,5 +241,5 @@ if __name__ == "__main__":
     out = sys.argv[1] if len(sys.argv) > 1 else "dashboards/04-workload-job-performance.json"
     d = build_04()
     with open(out, "w") as f:
-        json.dump(d, f, indent=4)
-    print(f"Generated {out}: {len(d['panels'])} panels")
+        json.dump(d, f, indent=4, default=encode)
+    print(f"Generated {out}: {len(d.panels)} panels")
@@ -59,13 +59,13 @@ def build_05():
 
     panels.append(stat(
         "GPUs per Node",
-        "WHY: Validate hardware — must be 8 GPUs for DGX B200.\n\n"
+        f"WHY: Validate hardware — must be {gpu_count()} GPUs for {hardware_title()}.\n\n"
         "METRIC: gpu_count.\n"
-        "FAIL CRITERIA: gpu_count != 8 = GPU not seated properly.",
+        f"FAIL CRITERIA: gpu_count != {gpu_count()} = GPU not seated properly.",
         {"h":5,"w":4,"x":16,"y":y},
         [tgt('min(gpu_count{' + EC + '})','Min GPUs',instant=True)],
         color_mode="value", text_mode="value_and_name",
-        thresholds={"mode":"absolute","steps":[{"color":C_FL,"value":None},{"color":C_OK,"value":8}]}))
+        thresholds={"mode":"absolute","steps":[{"color":C_FL,"value":None},{"color":C_OK,"value":gpu_count()}]}))
 
     panels.append(gauge(
         "Pass Rate",
@@ -85,9 +85,9 @@ def build_05():
     panels.append(row("GPU Stress Test — Temperature & Power", y)); y += 1
 
     panels.append(ts(
-        "GPU Die Temp During Stress (All 8)",
+        f"GPU Die Temp During Stress (All {gpu_count()})",
         "WHY: GPU stress test should drive temps near max. Overheating = cooling issue.\n\n"
-        "METRICS: gpu0_temperature .. gpu7_temperature.\n"
+        f"METRICS: {gpu_metric_range('temperature')}.\n"
         "PASS: All GPUs < 83°C under full load. FAIL: Any > 90°C.",
         {"h":6,"w":12,"x":0,"y":y},
         [tgt(f'gpu{i}_temperature{{' + EC + '}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
@@ -96,7 +96,7 @@ def build_05():
     panels.append(ts(
         "HBM Memory Temp During Stress",
         "WHY: HBM memory stress test — validates memory thermal limits.\n\n"
-        "METRICS: gpu0_mem_temp .. gpu7_mem_temp.\n"
+        f"METRICS: {gpu_metric_range('mem_temp')}.\n"
         "PASS: < 95°C. WARN: 95-105°C. FAIL: > 105°C.",
         {"h":6,"w":12,"x":12,"y":y},
         [tgt(f'gpu{i}_mem_temp{{' + EC + '}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
@@ -106,7 +106,7 @@ def build_05():
     panels.append(ts(
         "GPU Power Under Stress",
         "WHY: All GPUs should reach near TDP (1000W) during stress test.\n\n"
-        "METRICS: gpu0_power .. gpu7_power.\n"
+        f"METRICS: {gpu_metric_range('power')}.\n"
         "PASS: All within 10% of TDP. FAIL: Significantly below = throttled GPU.",
         {"h":6,"w":12,"x":0,"y":y},
         [tgt(f'gpu{i}_power{{' + EC + '}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
@@ -115,7 +115,7 @@ def build_05():
     panels.append(ts(
         "GPU Throttle During Stress",
         "WHY: Throttling during burn-in stress = COOLING ISSUE.\n\n"
-        "METRICS: gpu0_throttle .. gpu7_throttle.\n"
+        f"METRICS: {gpu_metric_range('throttle')}.\n"
         "PASS: All = 0 during stress. FAIL: Any > 0 = check CDU flow.",
         {"h":6,"w":12,"x":12,"y":y},
         [tgt(f'gpu{i}_throttle{{' + EC + '}}', f'{{{{entity}}}} GPU{i}') for i in range(8)],
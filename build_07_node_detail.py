@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Dashboard 07 — Node Detail (single-DGX drill-down).
+One page per node instead of opening 01/02/04 filtered to one host.
+
+DESIGN:
+- $node has no "All" option — pick one node (or a few) to investigate
+- Top: one summary stat per selected node (repeat on $node, maxPerRow 4), instant queries only
+- Below: one COLLAPSED row per selected node (row repeat on $node) — GPU, memory/ECC,
+  fabric and host panels load only when the row is expanded
+- Per-GPU panels honor $gpu (one __name__ regex query per panel)
+"""
+import json, sys
+from panel_builders import *
+
+def build_07():
+    reset_ids()
+    use_gpu_variable()
+    panels = []
+    y = 0
+
+    # ════════════════════════════════════════════════════════
+    # ROW: Node Summary (instant queries only)
+    # ════════════════════════════════════════════════════════
+    panels.append(row("Node Summary", y)); y += 1
+
+    panels.append(repeated(stat(
+        "$node",
+        "WHY: At-a-glance state of the node under investigation.\n\n"
+        "METRICS (instant): gpu_health_overall, gpu_count, gpu_ecc_dbe_agg, alert_level, "
+        "gpu_utilization, gpu_power_usage.\n"
+        "ACTION: Expand the node's row below for time series.",
+        {"h":5,"w":6,"x":0,"y":y},
+        [tgt('max(gpu_health_overall{' + EC + '}) or vector(-1)','Health',instant=True),
+         tgt('max(gpu_count{' + EC + '})','GPUs',instant=True),
+         tgt('max(gpu_ecc_dbe_agg{' + EC + '}) or vector(0)','ECC DBE',instant=True),
+         tgt('max(alert_level{' + EC + '}) or vector(0)','Alert Level',instant=True),
+         tgt('avg(gpu_utilization{' + EC + '})','GPU Util %',instant=True),
+         tgt('sum(gpu_power_usage{' + EC + '})','GPU Power W',instant=True)],
+        color_mode="value", text_mode="value_and_name", orientation="horizontal",
+        thresholds={"mode":"absolute","steps":[{"color":C_BL,"value":None}]}),
+        "node", max_per_row=4))
+    y += 5
+
+    # ════════════════════════════════════════════════════════
+    # ROW (repeated per node, collapsed): everything else
+    # ════════════════════════════════════════════════════════
+    node_row = row("Node $node — Detail", y, collapsed=True, repeat="node"); y += 1
+    panels.append(node_row)
+    sub = node_row.panels
+    ry = y
+
+    sub.append(ts(
+        "GPU Core Temperature",
+        "WHY: Per-GPU die temperature on this node.\n\n"
+        "METRICS: gpuN_temperature (restricted to $gpu).\n"
+        "THRESHOLDS: > 83°C = throttle risk. > 90°C = CDU cooling issue.",
+        {"h":6,"w":8,"x":0,"y":ry},
+        gpu_targets("temperature", legend="GPU"),
+        axis="Temperature", unit="celsius"))
+
+    sub.append(ts(
+        "HBM Temperature",
+        "WHY: HBM is thermally sensitive — > 105°C risks data corruption.\n\n"
+        "METRICS: gpuN_mem_temp (restricted to $gpu).",
+        {"h":6,"w":8,"x":8,"y":ry},
+        gpu_targets("mem_temp", legend="GPU"),
+        axis="HBM Temp", unit="celsius"))
+
+    sub.append(ts(
+        "Per-GPU Power & Throttle",
+        "WHY: Under-TDP power with throttle > 0 = GPU held back by power/thermal limits.\n\n"
+        "METRICS: gpuN_power, gpuN_throttle (restricted to $gpu).",
+        {"h":6,"w":8,"x":16,"y":ry},
+        gpu_targets("power", legend="Power GPU") + gpu_targets("throttle", legend="Throttle GPU"),
+        axis="Watts / Throttle"))
+    ry += 6
+
+    sub.append(ts(
+        "DCGM Health Flags",
+        "WHY: Which DCGM sub-check is failing on this node.\n\n"
+        "METRICS: gpu_health_overall / mem / nvlink / pcie / thermal — 0 = OK.",
+        {"h":6,"w":8,"x":0,"y":ry},
+        [tgt('gpu_health_overall{' + EC + '}','Overall'),
+         tgt('gpu_health_mem{' + EC + '}','Memory'),
+         tgt('gpu_health_nvlink{' + EC + '}','NVLink'),
+         tgt('gpu_health_pcie{' + EC + '}','PCIe'),
+         tgt('gpu_health_thermal{' + EC + '}','Thermal')],
+        axis="Health (0=OK)"))
+
+    sub.append(ts(
+        "ECC & Row Remapping",
+        "WHY: RMA signals for this node in one place.\n\n"
+        "METRICS: gpu_ecc_sbe_agg, gpu_ecc_dbe_agg, gpu_uncorrectable_remapped_rows, "
+        "gpu_row_remap_failure.\n"
+        "ACTION: DBE > 0 or remap failure == 1 = IMMEDIATE GPU REPLACEMENT.",
+        {"h":6,"w":8,"x":8,"y":ry},
+        [tgt('gpu_ecc_sbe_agg{' + EC + '}','SBE'),
+         tgt('gpu_ecc_dbe_agg{' + EC + '}','DBE'),
+         tgt('gpu_uncorrectable_remapped_rows{' + EC + '}','Uncorrectable Rows'),
+         tgt('gpu_row_remap_failure{' + EC + '}','Remap Failure')],
+        axis="Errors",
+        overrides=[{"matcher":{"id":"byName","options":"DBE"},"properties":[
+            {"id":"color","value":{"fixedColor":C_FL,"mode":"fixed"}}]}]))
+
+    sub.append(ts(
+        "NVLink Errors & Bandwidth",
+        "WHY: NVLink CRC errors on this node vs delivered bandwidth.\n\n"
+        "METRICS: gpu_nvlink_crc_data_errors, gpu_nvlink_crc_flit_errors, gpu_nvlink_total_bandwidth.",
+        {"h":6,"w":8,"x":16,"y":ry},
+        [tgt('gpu_nvlink_crc_data_errors{' + EC + '}','CRC Data'),
+         tgt('gpu_nvlink_crc_flit_errors{' + EC + '}','CRC Flit'),
+         tgt('gpu_nvlink_total_bandwidth{' + EC + '}','Bandwidth')],
+        axis="Errors / BW"))
+    ry += 6
+
+    sub.append(ts(
+        "IB Link State",
+        "WHY: All InfiniBand ports on this node should be 5 (LinkUp).\n\n"
+        "METRIC: infiniband_mlx5_*_link_state.",
+        {"h":6,"w":8,"x":0,"y":ry},
+        ib_targets("link_state", "mlx5_{i}"),
+        axis="Link State"))
+
+    sub.append(ts(
+        "Host Memory & Load",
+        "WHY: Host pressure starves GPU jobs of data.\n\n"
+        "METRICS: memory_utilization, load_one, cores_total.",
+        {"h":6,"w":8,"x":8,"y":ry},
+        [tgt('memory_utilization{' + EC + '}','Memory %'),
+         tgt('load_one{' + EC + '}','Load 1m'),
+         tgt('cores_total{' + EC + '}','Cores')],
+        axis="Value"))
+
+    sub.append(ts(
+        "Alerts & Hardware Errors",
+        "WHY: BCM alert level alongside host memory / NVMe failures.\n\n"
+        "METRICS: alert_level, hardware_corrupted_memory, nvme*_critical.",
+        {"h":6,"w":8,"x":16,"y":ry},
+        [tgt('alert_level{' + EC + '}','Alert Level'),
+         tgt('hardware_corrupted_memory{' + EC + '}','Corrupted Mem Pages'),
+         tgt(indexed_selector("nvme", "critical"), indexed_name_legend("nvme", "critical"))],
+        axis="Value"))
+
+    return wrap_dashboard(
+        uid=UIDS["07"],
+        title="BMaaS — 07 Node Detail V6",
+        description="Single-DGX drill-down: instant summary per selected node, then a collapsed "
+                    "per-node row (GPU thermals/power, DCGM health, ECC, NVLink, IB, host).",
+        tags=["bmaas","node","drilldown","gpu","dgx","bcm11","v6"],
+        panels=panels,
+        templating=standard_templating(extra_vars=[gpu_variable()], node_all=False),
+        time_from="now-3h",
+        links=sub_dashboard_links()
+    )
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else "dashboards/07-node-detail.json"
+    d = build_07()
+    with open(out, "w") as f:
+        json.dump(d, f, indent=4, default=encode)
+    print(f"Generated {out}: {len(d.panels)} panels")
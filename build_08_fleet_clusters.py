@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Dashboard 08 — Fleet of Clusters (executive, cross-cluster).
+One page for every cluster instead of opening 00 once per cluster.
+
+DESIGN:
+- Reads ONLY per-cluster recording rules (recording_rules.py: cluster:<metric>:<op>) —
+  no raw per-node series are scanned at view time
+- Every panel uses the "-- Mixed --" datasource with one target per Mimir tenant
+  (FLEET_TENANTS); Grafana fans the tenant queries out in parallel
+- $cluster is multi-select over the configured tenants (default: All)
+- Drill into a cluster with the 00 Executive link (cluster selected there)
+"""
+import json, sys
+from panel_builders import *
+from recording_rules import rule_name
+
+CS = 'cluster=~"$cluster"'
+
+def r(metric, op):
+    """Selector for a per-cluster rollup series, restricted to the selected clusters."""
+    return f'{rule_name("cluster", metric, op)}{{{CS}}}'
+
+AVAIL = f'{r("nodes_up","sum")} / clamp_min({r("nodes_total","sum")}, 1)'
+GPU_OK = f'{r("gpu_health_overall","count_eq0")} / clamp_min({r("gpu_health_overall","count")}, 1)'
+NVL_OK = f'{r("gpu_health_nvlink","count_eq0")} / clamp_min({r("gpu_health_nvlink","count")}, 1)'
+
+# Scorecard KPIs: (column, expr) — folded into one query per tenant with a `kpi` label
+SCORECARD = [
+    ("Nodes UP", r("nodes_up","sum")),
+    ("Nodes DOWN", r("nodes_down","sum")),
+    ("Nodes Total", r("nodes_total","sum")),
+    ("Availability %", f'({AVAIL}) * 100'),
+    ("GPU Healthy %", f'({GPU_OK}) * 100'),
+    ("NVLink Healthy %", f'({NVL_OK}) * 100'),
+    ("ECC DBE", r("gpu_ecc_dbe_agg","count_gt0")),
+    ("Remap Failures", r("gpu_row_remap_failure","count_gt0")),
+    ("GPU Util %", rollup("gpu_utilization", "avg", "cluster", CS)),
+    ("Max Alert", r("alert_level","max")),
+]
+
+def scorecard_expr():
+    return " or ".join(f'label_replace({e}, "kpi", "{k}", "", "")' for k, e in SCORECARD)
+
+def build_08():
+    reset_ids()
+    panels = []
+    y = 0
+
+    # ════════════════════════════════════════════════════════
+    # ROW 1: Cluster Scorecard
+    # ════════════════════════════════════════════════════════
+    panels.append(row("Cluster Scorecard", y)); y += 1
+
+    panels.append(mixed(stat(
+        "Node Availability by Cluster",
+        "WHY: Contractual SLA per cluster on one page.\n\n"
+        "FORMULA: cluster:nodes_up:sum / cluster:nodes_total:sum (recording rules).\n"
+        "SLA TARGET: ≥ 99.5%.",
+        {"h":5,"w":8,"x":0,"y":y},
+        tenant_targets(AVAIL, instant=True),
+        unit="percentunit", decimals=2,
+        thresholds={"mode":"absolute","steps":[
+            {"color":C_FL,"value":None},{"color":C_WR,"value":0.99},{"color":C_OK,"value":0.995}]})))
+
+    panels.append(mixed(stat(
+        "GPU Healthy by Cluster",
+        "WHY: Share of GPUs passing DCGM overall health, per cluster.\n\n"
+        "FORMULA: cluster:gpu_health_overall:count_eq0 / cluster:gpu_health_overall:count.\n"
+        "SLA TARGET: ≥ 99.5%.",
+        {"h":5,"w":8,"x":8,"y":y},
+        tenant_targets(GPU_OK, instant=True),
+        unit="percentunit", decimals=2,
+        thresholds={"mode":"absolute","steps":[
+            {"color":C_FL,"value":None},{"color":C_WR,"value":0.95},{"color":C_OK,"value":0.995}]})))
+
+    panels.append(mixed(stat(
+        "Nodes DOWN by Cluster",
+        "WHY: Where capacity is missing right now.\n\n"
+        "METRIC: cluster:nodes_down:sum.\nACTION: Open 00 for that cluster.",
+        {"h":5,"w":8,"x":16,"y":y},
+        tenant_targets(r("nodes_down","sum"), instant=True),
+        thresholds={"mode":"absolute","steps":[{"color":C_OK,"value":None},{"color":C_FL,"value":1}]})))
+    y += 5
+
+    panels.append(mixed(tbl(
+        "Cluster Scorecard",
+        "WHY: Every cluster's executive KPIs side by side.\n\n"
+        "SOURCE: cluster:* recording rules, one instant query per tenant (KPIs folded "
+        "into one series set via a `kpi` label, pivoted to columns).\n"
+        "ACTION: Red availability / health or DBE > 0 → drill into 00 / 01 for that cluster.",
+        {"h":8,"w":24,"x":0,"y":y},
+        tenant_targets(scorecard_expr(), legend="", fmt="table"),
+        transforms=[{"id":"merge","options":{}},
+                    {"id":"groupingToMatrix","options":{"columnField":"kpi","rowField":"cluster",
+                                                        "valueField":"Value"}}],
+        sort=[{"displayName":"Availability %","desc":False}])))
+    y += 8
+
+    # ════════════════════════════════════════════════════════
+    # ROW 2: Trends per Cluster
+    # ════════════════════════════════════════════════════════
+    panels.append(row("Trends per Cluster", y)); y += 1
+
+    panels.append(mixed(ts(
+        "Node Availability Trend",
+        "WHY: Which cluster is dragging the fleet SLA down, and since when.\n\n"
+        "FORMULA: cluster:nodes_up:sum / cluster:nodes_total:sum.\nSLA TARGET: ≥ 99.5%.",
+        {"h":8,"w":8,"x":0,"y":y},
+        tenant_targets(AVAIL),
+        axis="Availability", unit="percentunit")))
+
+    panels.append(mixed(ts(
+        "Avg GPU Utilization",
+        "WHY: Utilization per cluster — idle capacity vs saturated clusters.\n\n"
+        "METRIC: cluster:gpu_utilization:sum / cluster:gpu_utilization:count.",
+        {"h":8,"w":8,"x":8,"y":y},
+        tenant_targets(rollup("gpu_utilization", "avg", "cluster", CS)),
+        axis="GPU Util %", unit="percent")))
+
+    panels.append(mixed(ts(
+        "GPU Power Draw",
+        "WHY: Power per cluster for facility / capacity planning.\n\n"
+        "METRIC: cluster:gpu_power_usage:sum.",
+        {"h":8,"w":8,"x":16,"y":y},
+        tenant_targets(r("gpu_power_usage","sum")),
+        axis="Watts", unit="watt")))
+    y += 8
+
+    panels.append(mixed(ts(
+        "Failing GPUs (DCGM Overall)",
+        "WHY: Health regressions per cluster over time.\n\n"
+        "METRIC: cluster:gpu_health_overall:count_gt0.",
+        {"h":8,"w":8,"x":0,"y":y},
+        tenant_targets(r("gpu_health_overall","count_gt0")),
+        axis="Failing")))
+
+    panels.append(mixed(ts(
+        "RMA Signals",
+        "WHY: Hardware replacement pressure per cluster.\n\n"
+        "METRICS: cluster:gpu_ecc_dbe_agg:count_gt0 (DBE), cluster:gpu_row_remap_failure:count_gt0.\n"
+        "ACTION: Any DBE > 0 = IMMEDIATE GPU REPLACEMENT in that cluster.",
+        {"h":8,"w":8,"x":8,"y":y},
+        tenant_targets(r("gpu_ecc_dbe_agg","count_gt0"), legend="{{cluster}} DBE") +
+        tenant_targets(r("gpu_row_remap_failure","count_gt0"), legend="{{cluster}} Remap Fail"),
+        axis="Count")))
+
+    panels.append(mixed(ts(
+        "NVLink Bandwidth",
+        "WHY: Fabric throughput per cluster.\n\n"
+        "METRIC: cluster:gpu_nvlink_total_bandwidth:sum.",
+        {"h":8,"w":8,"x":16,"y":y},
+        tenant_targets(r("gpu_nvlink_total_bandwidth","sum")),
+        axis="Bandwidth")))
+
+    return wrap_dashboard(
+        uid=UIDS["08"],
+        title="BMaaS — 08 Fleet of Clusters V6",
+        description="Cross-cluster executive view on per-cluster recording rules; "
+                    "Mixed datasource with one query per Mimir tenant.",
+        tags=["bmaas","fleet","executive","multi-cluster","bcm11","v6"],
+        panels=panels,
+        templating=standard_templating(cluster_multi=True),
+        links=sub_dashboard_links()
+    )
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else "dashboards/08-fleet-of-clusters.json"
+    d = build_08()
+    with open(out, "w") as f:
+        json.dump(d, f, indent=4, default=encode)
+    print(f"Generated {out}: {len(d.panels)} panels")
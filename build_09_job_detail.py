@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Dashboard 09 — Job Detail (single-job scope).
+Job-level signals from BCM JobSampler (job_gpu_utilization, job_gpu_wasted,
+job_memory_failcnt, …) that 04 only describes at node level.
+
+DESIGN:
+- $job is populated from the job:job_gpu_utilization:count anchor rule (one series per job),
+  refreshed on time range change — never from raw per-job×GPU series
+- Every job_* query carries job_id="$job" (exact match — index lookup, no regex)
+- Node-level panels use $node = the job's nodes only (from job_entity:* anchors)
+- No "All" job option; nothing here selects fleet-wide
+"""
+import json, sys
+from panel_builders import *
+
+JC = J + ',' + CL   # job + cluster filter
+
+def build_09():
+    reset_ids()
+    panels = []
+    y = 0
+
+    # ════════════════════════════════════════════════════════
+    # ROW: Job Summary (instant queries)
+    # ════════════════════════════════════════════════════════
+    panels.append(row("Job $job — Summary", y)); y += 1
+
+    panels.append(stat(
+        "GPUs / Nodes",
+        "WHY: Size of the allocation under investigation.\n\n"
+        "METRICS: job:job_gpu_utilization:count, job_entity:job_gpu_utilization:count (anchor rules).",
+        {"h":4,"w":6,"x":0,"y":y},
+        [tgt('sum(job:job_gpu_utilization:count{' + JC + '})','GPUs',instant=True),
+         tgt('count(job_entity:job_gpu_utilization:count{' + JC + '})','Nodes',instant=True)],
+        color_mode="value",
+        thresholds={"mode":"absolute","steps":[{"color":C_BL,"value":None}]}))
+
+    panels.append(stat(
+        "Job GPU Utilization",
+        "WHY: Is the job using what it was allocated?\n\n"
+        "METRIC: avg(job_gpu_utilization{job_id}).\n"
+        "TARGET: > 70% = healthy. < 40% = wasted allocation.",
+        {"h":4,"w":6,"x":6,"y":y},
+        [tgt('avg(job_gpu_utilization{' + JC + '})','Avg Util',instant=True)],
+        unit="percent", decimals=1, text_mode="value",
+        thresholds={"mode":"absolute","steps":[
+            {"color":C_FL,"value":None},{"color":C_WR,"value":40},{"color":C_OK,"value":70}]}))
+
+    panels.append(stat(
+        "Wasted GPU",
+        "WHY: Allocated-but-idle GPU time is direct revenue loss.\n\n"
+        "METRIC: sum(job_gpu_wasted{job_id}).",
+        {"h":4,"w":6,"x":12,"y":y},
+        [tgt('sum(job_gpu_wasted{' + JC + '}) or vector(0)','Wasted',instant=True)],
+        decimals=1,
+        thresholds={"mode":"absolute","steps":[{"color":C_OK,"value":None},{"color":C_WR,"value":1}]}))
+
+    panels.append(stat(
+        "Failure Signals",
+        "WHY: Any non-zero value predicts job failure.\n\n"
+        "METRICS: job_gpu_xid_error, job_memory_failcnt, job_gpu_thermal_violation (max over GPUs).",
+        {"h":4,"w":6,"x":18,"y":y},
+        [tgt('max(job_gpu_xid_error{' + JC + '}) or vector(0)','XID',instant=True),
+         tgt('max(job_memory_failcnt{' + JC + '}) or vector(0)','Mem failcnt',instant=True),
+         tgt('max(job_gpu_thermal_violation{' + JC + '}) or vector(0)','Thermal',instant=True)],
+        thresholds={"mode":"absolute","steps":[{"color":C_OK,"value":None},{"color":C_FL,"value":1}]}))
+    y += 4
+
+    # ════════════════════════════════════════════════════════
+    # ROW: Job Efficiency
+    # ════════════════════════════════════════════════════════
+    panels.append(row("Job Efficiency", y)); y += 1
+
+    panels.append(ts(
+        "GPU Utilization per Node",
+        "WHY: Stragglers — one slow node holds back a multi-node job.\n\n"
+        "METRIC: avg by (entity) (job_gpu_utilization{job_id}).",
+        {"h":7,"w":8,"x":0,"y":y},
+        [tgt('avg by (entity) (job_gpu_utilization{' + JC + '})','{{entity}}')],
+        axis="Utilization %", unit="percent"))
+
+    panels.append(ts(
+        "GPU Memory Utilization per Node",
+        "WHY: HBM headroom of the job — near 100% = GPU OOM risk.\n\n"
+        "METRIC: max by (entity) (job_gpu_mem_utilization{job_id}).",
+        {"h":7,"w":8,"x":8,"y":y},
+        [tgt('max by (entity) (job_gpu_mem_utilization{' + JC + '})','{{entity}}')],
+        axis="Memory Util %", unit="percent"))
+
+    panels.append(ts(
+        "Wasted GPU",
+        "WHY: When the job stopped using its GPUs (data stalls, hangs, teardown).\n\n"
+        "METRIC: sum by (entity) (job_gpu_wasted{job_id}).",
+        {"h":7,"w":8,"x":16,"y":y},
+        [tgt('sum by (entity) (job_gpu_wasted{' + JC + '})','{{entity}}')],
+        axis="Wasted"))
+    y += 7
+
+    # ════════════════════════════════════════════════════════
+    # ROW: Failure Prediction (job + the job's nodes)
+    # ════════════════════════════════════════════════════════
+    panels.append(row("Failure Prediction", y)); y += 1
+
+    panels.append(ts(
+        "Job Error Counters",
+        "WHY: Single-node failure predictors, scoped to this job.\n\n"
+        "METRICS: job_gpu_xid_error, job_memory_failcnt, job_gpu_thermal_violation.\n"
+        "ACTION: Rising XID or failcnt = checkpoint now.",
+        {"h":7,"w":8,"x":0,"y":y},
+        [tgt('sum by (entity) (job_gpu_xid_error{' + JC + '})','XID {{entity}}'),
+         tgt('sum by (entity) (job_memory_failcnt{' + JC + '})','Mem failcnt {{entity}}'),
+         tgt('sum by (entity) (job_gpu_thermal_violation{' + JC + '})','Thermal {{entity}}')],
+        axis="Count"))
+
+    panels.append(ts(
+        "GPU Health & ECC on Job Nodes",
+        "WHY: Hardware state of the job's nodes ($node = job nodes only).\n\n"
+        "METRICS: gpu_health_overall (0 = OK), gpu_ecc_dbe_agg.\n"
+        "ACTION: DBE > 0 = job results UNRELIABLE. Stop and replace GPU.",
+        {"h":7,"w":8,"x":8,"y":y},
+        [tgt('gpu_health_overall{' + EC + '}','Health {{entity}}'),
+         tgt('gpu_ecc_dbe_agg{' + EC + '}','DBE {{entity}}')],
+        axis="Value"))
+
+    # One increase() per port: it drops __name__, so a __name__ regex over every port
+    # would leave duplicate labelsets per node
+    ib_down = ib_targets("link_downed", "IB link downed {{entity}} mlx5_{i}")
+    for t in ib_down: t.expr = f"increase({t.expr}[5m])"
+    panels.append(ts(
+        "NVLink / IB Errors on Job Nodes",
+        "WHY: Multi-node jobs fail on fabric errors between participating nodes.\n\n"
+        "METRICS: rate(gpu_nvlink_crc_data_errors), increase(infiniband_mlx5_N_link_downed) per port (job nodes).",
+        {"h":7,"w":8,"x":16,"y":y},
+        [tgt('rate(gpu_nvlink_crc_data_errors{' + EC + '}[5m])','NVLink CRC {{entity}}')] + ib_down,
+        axis="Errors"))
+
+    return wrap_dashboard(
+        uid=UIDS["09"],
+        title="BMaaS — 09 Job Detail V6",
+        description="One job at a time: allocation, utilization, waste and failure predictors, "
+                    "plus hardware state of the job's nodes. Every query is filtered by job_id.",
+        tags=["bmaas","job","workload","drilldown","bcm11","v6"],
+        panels=panels,
+        templating=job_templating(),
+        time_from="now-24h",
+        refresh="1m",
+        links=sub_dashboard_links()
+    )
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else "dashboards/09-job-detail.json"
+    d = build_09()
+    with open(out, "w") as f:
+        json.dump(d, f, indent=4, default=encode)
+    print(f"Generated {out}: {len(d.panels)} panels")
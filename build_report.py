@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Build Report.
+
+Per-dashboard build cost and query weight, collected by generate_dashboards.generate()
+and emitted as JSON and as Prometheus text exposition (node_exporter textfile format):
+
+- build / write wall time, optional tracemalloc peak
+- panel count (including panels nested in collapsed rows), target count
+- per-GPU targets and the worst per-panel per-GPU fan-out
+- encoded JSON bytes
+"""
+import json, re, time
+
+# Targets over per-GPU metrics: gpu0_power …, a collapsed gpu(…)_power regex, or the
+# labeled gpu_power{gpu=~…} family
+PER_GPU = re.compile(r'\bgpu(?:\d+|\([^)]*\))_|\bgpu_\w+\{[^}]*\bgpu=~')
+
+def _field(obj, name):
+    """Read a field from a model object (panel_builders) or a loaded JSON dict."""
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+def iter_panels(panels):
+    """All panels, descending into the panels held by collapsed rows."""
+    for p in panels:
+        yield p
+        yield from iter_panels(_field(p, "panels") or [])
+
+def iter_targets(panels):
+    for p in iter_panels(panels):
+        for t in _field(p, "targets") or []:
+            yield p, t
+
+def target_expr(t):
+    return (t.get("expr") if isinstance(t, dict) else t.expr) or ""
+
+def count_panels(panels):
+    """(panels, targets) — descends into collapsed rows."""
+    n = t = 0
+    for p in iter_panels(panels):
+        n += 1; t += len(_field(p, "targets") or [])
+    return n, t
+
+def dashboard_stats(did, dashboard, build_s, write_s, nbytes, peak_kb=None):
+    panels = _field(dashboard, "panels")
+    n_panels, n_targets = count_panels(panels)
+    per_gpu, fanout = 0, {}
+    for p, t in iter_targets(panels):
+        if PER_GPU.search(target_expr(t)):
+            per_gpu += 1
+            fanout[id(p)] = fanout.get(id(p), 0) + 1
+    s = {"dashboard": did, "uid": _field(dashboard, "uid"),
+         "build_seconds": round(build_s, 6), "write_seconds": round(write_s, 6),
+         "panels": n_panels, "targets": n_targets,
+         "per_gpu_targets": per_gpu, "per_gpu_fanout_max": max(fanout.values(), default=0),
+         "json_bytes": nbytes}
+    if peak_kb is not None:
+        s["peak_kb"] = round(peak_kb, 1)
+    return s
+
+def build_report(stats, total_s):
+    return {"generated_at": int(time.time()), "total_seconds": round(total_s, 6),
+            "dashboards": stats}
+
+# ── Prometheus text exposition ──
+PROM_METRICS = [
+    ("build_seconds", "bmaas_dashboard_build_seconds", "Wall time spent in the dashboard builder."),
+    ("write_seconds", "bmaas_dashboard_write_seconds", "Wall time spent encoding and writing the JSON."),
+    ("peak_kb", "bmaas_dashboard_build_peak_kilobytes", "tracemalloc peak while building and writing."),
+    ("panels", "bmaas_dashboard_panels", "Panels in the dashboard, including collapsed-row children."),
+    ("targets", "bmaas_dashboard_targets", "Query targets in the dashboard."),
+    ("per_gpu_targets", "bmaas_dashboard_per_gpu_targets", "Targets selecting per-GPU indexed metrics."),
+    ("per_gpu_fanout_max", "bmaas_dashboard_per_gpu_fanout_max", "Largest number of per-GPU targets in one panel."),
+    ("json_bytes", "bmaas_dashboard_json_bytes", "Encoded dashboard JSON size."),
+]
+
+def _esc(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def to_prometheus(report):
+    lines = []
+    for key, name, help_ in PROM_METRICS:
+        rows = [s for s in report["dashboards"] if key in s]
+        if not rows: continue
+        lines.append(f"# HELP {name} {help_}")
+        lines.append(f"# TYPE {name} gauge")
+        for s in rows:
+            lines.append(f'{name}{{dashboard="{_esc(s["dashboard"])}",uid="{_esc(s["uid"])}"}} {s[key]}')
+    lines.append("# HELP bmaas_generate_seconds Wall time of the whole generate() run.")
+    lines.append("# TYPE bmaas_generate_seconds gauge")
+    lines.append(f"bmaas_generate_seconds {report['total_seconds']}")
+    lines.append("# HELP bmaas_generate_timestamp_seconds Unix time the report was generated.")
+    lines.append("# TYPE bmaas_generate_timestamp_seconds gauge")
+    lines.append(f"bmaas_generate_timestamp_seconds {report['generated_at']}")
+    return "\n".join(lines) + "\n"
+
+def to_json(report):
+    return json.dumps(report, indent=2)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Write-Path Capacity Planner.
+
+What the BCM metric set (REAL_METRICS_INVENTORY.txt) costs Mimir for a fleet:
+active series, samples/s and block storage per day, in three columns:
+
+- scraped   — every inventory metric at the base scrape interval
+- +drop     — after scrape/bmaas-metric-drop.yaml (drop_rules.py)
+- +tiers    — and scraped at the per-metric tier intervals (scrape_tiers.py --json);
+              only with --tiers
+
+Series per metric come from its scope (SCOPES) and the hardware profile:
+
+    gpuN_*               × GPUs per node          sys_class_net_*   × NICs per node
+    infiniband_mlx5_N_*  × IB ports per node      cluster totals, scrape_*  × clusters
+    nvmeN_*              × NVMe drives per node   everything else   × nodes
+                                                  (nodes_up / _down / _closed / _total too)
+
+so an indexed family counts the profile's devices, not the indices the inventory
+happened to list. Relabeling to the labeled form (indexed_metrics.py) renames
+series without changing their number.
+
+Usage: python3 capacity_planner.py --nodes N [--clusters N] [--profile NAME] [--interval 30s]
+                               [--gpus N] [--ib-ports N] [--nvme N] [--nics N]
+                               [--tiers tiers.json] [--no-drop] [--json FILE]
+"""
+import json, os, re, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import metrics_inventory
+from hardware_profiles import DEFAULT_PROFILE, get_profile
+
+# Compressed TSDB block bytes per sample (Prometheus / Mimir blocks: 1–2 bytes)
+BYTES_PER_SAMPLE = 1.5
+# Mimir ingester replication factor — every sample is written this many times
+REPLICATION = 3
+DEFAULT_INTERVAL = "30s"
+
+# (scope, name regex) — first match wins; unmatched metrics are per node, as are
+# nodes_(up|down|closed|total): BCM reports those per DGX node (series_data.NODE_STATE)
+SCOPES = [
+    ("cluster", r'(devices|dpu_nodes|fpga_as|gp_us|managed_switches|nv_link_switches|ib_nodes)'
+                r'_(up|down|closed|total)|cmha_status|scrape_.*'),
+    ("nic", r'sys_class_net_.*'),
+]
+FAMILY_SCOPES = {"gpu": "gpu", "infiniband": "ib_port", "nvme": "nvme"}
+
+def parse_interval(text):
+    """Seconds in a Prometheus duration such as 30s, 2m, 1h."""
+    m = re.fullmatch(r'(\d+)(ms|s|m|h)', text.strip())
+    if not m: raise ValueError(f"Bad interval {text!r} (expected e.g. 30s, 2m)")
+    return int(m.group(1)) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[m.group(2)]
+
+def scope(metric):
+    if metric.family: return FAMILY_SCOPES[metric.family]
+    for name, pattern in SCOPES:
+        if re.fullmatch(pattern, metric.name): return name
+    return "node"
+
+def multipliers(profile, nodes, clusters, gpus=None, ib_ports=None, nvme=None, nics=None):
+    """Series per metric in each scope, for the whole fleet."""
+    per_node = {"node": 1,
+                "gpu": profile.gpus_per_node if gpus is None else gpus,
+                "ib_port": len(profile.ib_ports) if ib_ports is None else ib_ports,
+                "nvme": profile.nvme_devices if nvme is None else nvme,
+                "nic": profile.nics if nics is None else nics}
+    return {**{s: n * nodes for s, n in per_node.items()}, "cluster": clusters}
+
+# ── Model ──
+
+def series_metrics(inventory):
+    """Inventory collapsed to one entry per series-producing metric: [(key, section, scope,
+    member names)] — an indexed family is one metric (gpu_power) over all its indices."""
+    out = {}
+    for m in inventory:
+        key = f"{m.family}:{m.metric}" if m.family else m.name
+        if key not in out: out[key] = (key, m.section, scope(m), [])
+        out[key][3].append(m.name)
+    return list(out.values())
+
+def load_tiers(path):
+    """{metric name: interval seconds} from scrape_tiers.py --json."""
+    with open(path) as f:
+        return {m["metric"]: parse_interval(m["interval"]) for m in json.load(f)["metrics"]}
+
+def estimate(metrics, mult, interval_s, dropped=(), tiers=None):
+    """{section: {"series", "samples_per_s"}} plus a "total" entry. A family metric is dropped
+    only if every listed index is (the drop regex then covers unlisted indices too), and
+    scraped at its fastest member's tier interval."""
+    out = {}
+    for key, section, sc, members in metrics:
+        if dropped and all(n in dropped for n in members): continue
+        series = mult[sc]
+        every = min(tiers.get(n, interval_s) for n in members) if tiers else interval_s
+        for k in (section, "total"):
+            e = out.setdefault(k, {"series": 0, "samples_per_s": 0.0})
+            e["series"] += series; e["samples_per_s"] += series / every
+    out.setdefault("total", {"series": 0, "samples_per_s": 0.0})
+    return out
+
+def storage_per_day(samples_per_s):
+    return samples_per_s * 86400 * BYTES_PER_SAMPLE
+
+def plan(profile=DEFAULT_PROFILE, nodes=1, clusters=1, interval=DEFAULT_INTERVAL, tiers_file=None,
+         drop=True, **overrides):
+    """{"scraped": …, "+drop": …, "+tiers": …} estimates (columns present as configured)."""
+    inventory = metrics_inventory.load()
+    metrics = series_metrics(inventory)
+    mult = multipliers(get_profile(profile), nodes, clusters, **overrides)
+    interval_s = parse_interval(interval)
+    columns = {"scraped": estimate(metrics, mult, interval_s)}
+    dropped = ()
+    if drop:
+        import drop_rules
+        _, _, unused = drop_rules.plan()
+        dropped = {m.name for m in unused}
+        columns["+drop"] = estimate(metrics, mult, interval_s, dropped)
+    if tiers_file:
+        columns["+tiers"] = estimate(metrics, mult, interval_s, dropped, load_tiers(tiers_file))
+    return columns
+
+def human(n, unit=""):
+    for div, suffix in ((1e12, "T"), (1e9, "G"), (1e6, "M"), (1e3, "k")):
+        if abs(n) >= div: return f"{n / div:.2f}{suffix}{unit}"
+    return f"{n:.0f}{unit}" if n == int(n) else f"{n:.2f}{unit}"
+
+def report(columns, title):
+    names = list(columns)
+    sections = [s for s in columns["scraped"] if s != "total"]
+    lines = [title, "", f"{'Section':<58}" + "".join(f"{n:>12}" for n in names)]
+    for s in sections:
+        lines.append(f"{s[:57]:<58}" + "".join(f"{human(columns[n].get(s, {}).get('series', 0)):>12}"
+                                               for n in names))
+    totals = [columns[n]["total"] for n in names]
+    lines += ["",
+              f"{'Active series':<58}" + "".join(f"{human(t['series']):>12}" for t in totals),
+              f"{'Samples/s':<58}" + "".join(f"{human(t['samples_per_s']):>12}" for t in totals),
+              f"{f'Samples/s written by ingesters (RF {REPLICATION})':<58}"
+              + "".join(f"{human(t['samples_per_s'] * REPLICATION):>12}" for t in totals),
+              f"{f'Block storage/day ({BYTES_PER_SAMPLE} B/sample)':<58}"
+              + "".join(f"{human(storage_per_day(t['samples_per_s']), 'B'):>12}" for t in totals)]
+    base = totals[0]["samples_per_s"]
+    if len(totals) > 1 and base:
+        lines.append(f"{'Samples/s vs scraped':<58}"
+                     + "".join(f"{t['samples_per_s'] / base:>12.0%}" for t in totals))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv or "--nodes" not in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0 if "--help" in sys.argv else 2)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    def int_opt(name):
+        v = opt(name)
+        return None if v is None else int(v)
+
+    profile = opt("--profile", DEFAULT_PROFILE)
+    nodes, clusters, interval = int(opt("--nodes")), int(opt("--clusters", 1)), opt("--interval", DEFAULT_INTERVAL)
+    columns = plan(profile, nodes, clusters, interval, opt("--tiers"), "--no-drop" not in sys.argv,
+                   gpus=int_opt("--gpus"), ib_ports=int_opt("--ib-ports"), nvme=int_opt("--nvme"),
+                   nics=int_opt("--nics"))
+    if "--json" in sys.argv:
+        with open(opt("--json"), "w") as f:
+            json.dump({"profile": profile, "nodes": nodes, "clusters": clusters, "interval": interval,
+                       "bytes_per_sample": BYTES_PER_SAMPLE, "replication": REPLICATION,
+                       "columns": {n: {**c, "total": {**c["total"],
+                                                      "bytes_per_day": storage_per_day(c["total"]["samples_per_s"])}}
+                                   for n, c in columns.items()}}, f, indent=2)
+        print(f"  ✅ {opt('--json')}")
+    print(report(columns, f"{get_profile(profile).title} × {nodes} nodes, {clusters} cluster(s), "
+                          f"{interval} scrape"))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Dashboard Selector Cardinality.
+
+How many series every target (and query variable) of the generated dashboards
+(dashboards/*.json) selects, against a series set:
+
+- --dump FILE: `promtool tsdb dump` of a TSDB snapshot, or exposition / OpenMetrics text
+- otherwise a synthetic cluster of --nodes DGX nodes (series_data.synthetic_series —
+  sys_class_net_* per NIC `device`, alert_level per `measurable`)
+
+Grafana variables take their dashboard default (All → allValue, or .*), overridable
+with --var node=skt-dgx-001. Hotspots — the targets that dominate query cost — are
+the largest by series, and any selector that:
+
+- names no metric ({cluster=~"$cluster"}: every series of the tenant)
+- fans out over a hidden dimension — a label besides cluster / entity / the indexed
+  family label / le that takes several values (sys_class_net_* × device)
+
+Usage: python3 cardinality.py [--dump FILE] [--nodes N] [--profile NAME] [--var NAME=VALUE ...]
+                          [--top N] [--all] [--json FILE]
+"""
+import json, os, re, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import metrics_inventory, series_data
+from generate_dashboards import DASHBOARD_DIR
+from hardware_profiles import DEFAULT_PROFILE
+from indexed_metrics import FAMILIES
+from promql import selectors, query_selectors
+from read_load_model import load_dashboards
+
+# Labels every BCM series carries, or that index a family — not hidden dimensions
+EXPECTED_LABELS = {"__name__", "cluster", "entity", "le", "job", "instance"} | {f.label for f in FAMILIES.values()}
+HOTSPOT_SHARE = 0.05     # a target selecting this share of all selected series is a hotspot
+
+# ── Series set ──
+
+class SeriesIndex:
+    """Label sets by metric name."""
+
+    def __init__(self, series):
+        self.by_name = {}
+        seen = set()
+        for name, labels in series:
+            key = (name, labels)
+            if key in seen: continue
+            seen.add(key)
+            self.by_name.setdefault(name, []).append(series_data.parse_labels(labels))
+        self.total = sum(len(v) for v in self.by_name.values())
+
+    @classmethod
+    def from_samples(cls, samples):
+        return cls((name, series_data.format_labels(series_data.parse_labels(labels)))
+                   for name, labels, _, _ in samples)
+
+    def select(self, sel):
+        """[(name, labels)] a selector matches."""
+        refs = sel.refs
+        names = list(self.by_name) if not refs.names and not refs.patterns else \
+            [n for n in self.by_name if refs.matches(n)]
+        matchers = [(label, op, value if op in ("=", "!=") else re.compile(value))
+                    for label, op, value in sel.matchers]
+        out = []
+        for name in names:
+            for labels in self.by_name[name]:
+                if all(_match(labels.get(label, ""), op, value) for label, op, value in matchers):
+                    out.append((name, labels))
+        return out
+
+def _match(actual, op, value):
+    if op == "=": return actual == value
+    if op == "!=": return actual != value
+    hit = value.fullmatch(actual) is not None
+    return hit if op == "=~" else not hit
+
+# ── Grafana variables ──
+
+def variable_values(dashboard, overrides=None):
+    """{name: regex} — each variable's default selection (All → allValue or .*)."""
+    out = {}
+    for v in dashboard["templating"]["list"]:
+        cur = (v.get("current") or {}).get("value")
+        if isinstance(cur, list): cur = cur[0] if len(cur) == 1 else "|".join(cur)
+        if not cur or cur == "$__all":
+            cur = v.get("allValue") or ".*"
+        out[v["name"]] = cur
+    out.update(overrides or {})
+    return out
+
+def resolve(expr, values):
+    """expr with $var / ${var} / ${var:fmt} / [[var]] replaced; unknown variables → .*"""
+    def sub(m):
+        name = m.group(1) or m.group(2) or m.group(3)
+        return values.get(name, ".*")
+    return re.sub(r'\$\{(\w+)(?::\w+)?\}|\$(\w+)|\[\[(\w+)\]\]', sub, expr)
+
+# ── Analysis ──
+
+def hidden_dimensions(matched):
+    """{label: distinct values} of unexpected labels taking more than one value."""
+    values = {}
+    for _, labels in matched:
+        for k, v in labels.items():
+            if k not in EXPECTED_LABELS: values.setdefault(k, set()).add(v)
+    return {k: len(v) for k, v in values.items() if len(v) > 1}
+
+def analyze_expr(expr, index, values, var_query=False):
+    resolved = resolve(expr, values)
+    sels = query_selectors(resolved) if var_query else selectors(resolved)
+    series, flags, dims, nodes = 0, [], {}, set()
+    for sel in sels:
+        matched = index.select(sel)
+        series += len(matched)
+        nodes.update(l.get("entity") for _, l in matched)
+        if not sel.refs.names and not sel.refs.patterns:
+            flags.append("no metric name")
+        for k, n in hidden_dimensions(matched).items():
+            dims[k] = max(dims.get(k, 0), n)
+    flags += [f"hidden {k} ×{n}" for k, n in sorted(dims.items())]
+    return {"series": series, "nodes": len(nodes - {None}), "flags": flags}
+
+def analyze(dashboards, index, overrides=None):
+    """One row per target and query variable of every dashboard (collapsed rows included)."""
+    rows = []
+    for did, d in sorted(dashboards.items()):
+        values = variable_values(d, overrides)
+        for v in d["templating"]["list"]:
+            if v.get("type") != "query": continue
+            q = v["query"]["query"] if isinstance(v["query"], dict) else v["query"]
+            rows.append({"dashboard": did, "panel": f"${v['name']} (variable)", "ref": "",
+                         "expr": q, **analyze_expr(q, index, values, var_query=True)})
+        for p in _panels(d["panels"]):
+            for t in p.get("targets") or []:
+                rows.append({"dashboard": did, "panel": p.get("title", ""), "ref": t.get("refId", ""),
+                             "expr": t["expr"], **analyze_expr(t["expr"], index, values)})
+    return rows
+
+def _panels(panels):
+    for p in panels:
+        yield p
+        yield from _panels(p.get("panels") or [])
+
+def hotspots(rows, top):
+    """Largest targets plus every flagged one selecting HOTSPOT_SHARE of all selected series."""
+    total = sum(r["series"] for r in rows) or 1
+    by_size = sorted(rows, key=lambda r: -r["series"])
+    out = by_size[:top]
+    out += [r for r in by_size[top:] if r["flags"] and r["series"] / total >= HOTSPOT_SHARE]
+    return out, total
+
+def load_index(dump=None, nodes=64, profile=DEFAULT_PROFILE):
+    if dump:
+        return SeriesIndex.from_samples(series_data.read_samples(dump)), os.path.basename(dump)
+    names = [m.name for m in metrics_inventory.load()]
+    return (SeriesIndex(series_data.synthetic_series(names, nodes, profile=profile)),
+            f"synthetic cluster of {nodes} nodes")
+
+def report(rows, index, source, top=15, every=False):
+    lines = [f"Series set: {source} — {index.total} series, {len(index.by_name)} metrics", ""]
+    per_dash = {}
+    for r in rows:
+        e = per_dash.setdefault(r["dashboard"], [0, 0, 0])
+        e[0] += 1; e[1] += r["series"]; e[2] += bool(r["flags"])
+    lines.append(f"{'Dashboard':<12}{'Targets':>9}{'Series':>10}{'Flagged':>9}")
+    for did, (n, s, f) in sorted(per_dash.items()):
+        lines.append(f"{did:<12}{n:>9}{s:>10}{f:>9}")
+    hot, total = hotspots(rows, top)
+    lines += ["", f"Hotspots (of {total} series selected by all targets)",
+              f"{'Dash':<6}{'Panel':<46}{'Ref':<5}{'Series':>8}{'Share':>7}{'Nodes':>7}  Flags"]
+    for r in hot:
+        lines.append(f"{r['dashboard']:<6}{r['panel'][:45]:<46}{r['ref']:<5}{r['series']:>8}"
+                     f"{r['series'] / total:>7.1%}{r['nodes']:>7}  {', '.join(r['flags'])}")
+    if every:
+        lines += ["", "Every target"]
+        for r in rows:
+            lines.append(f"{r['dashboard']:<6}{r['panel'][:45]:<46}{r['ref']:<5}{r['series']:>8}  "
+                         f"{', '.join(r['flags'])}")
+    missing = sorted({r["panel"] for r in rows if r["series"] == 0})
+    if missing:
+        lines += ["", f"{len(missing)} panels select no series in this data (rule outputs, metrics outside it)"]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    overrides = dict(a.split("=", 1) for i, a in enumerate(sys.argv) if i and sys.argv[i - 1] == "--var")
+    index, source = load_index(opt("--dump"), int(opt("--nodes", 64)), opt("--profile", DEFAULT_PROFILE))
+    rows = analyze(load_dashboards(opt("--dashboards", DASHBOARD_DIR)), index, overrides)
+    print(report(rows, index, source, int(opt("--top", 15)), "--all" in sys.argv))
+    if "--json" in sys.argv:
+        with open(opt("--json"), "w") as f:
+            json.dump({"source": source, "series": index.total, "targets": rows}, f, indent=2)
+        print(f"\n  ✅ {opt('--json')}")
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Unused-Metric Drop Rules.
+
+Works out which inventory metrics (metrics_inventory.py) anything actually reads:
+
+- every generated dashboard — panel targets and template variable queries, built
+  for every hardware profile (ports / GPU counts differ)
+- the recording rules (recording_rules.py)
+- extra rule files, e.g. alerting rules (--rules-file)
+
+and emits scrape-side metric_relabel_configs dropping the rest:
+scrape/bmaas-metric-drop.yaml, one `action: drop` per inventory section.
+Only inventory names are dropped — metrics missing from the inventory are always
+kept — and nothing matching metrics_allowlist.txt (names or full-match regexes) is.
+
+The drop configs match BCM's original names: place them BEFORE the indexed-family
+relabeling (bmaas-metric-relabel.yaml) on each scrape job. The rule files a drop file
+was planned with are recorded in its header; generate_dashboards.py re-plans with
+them (or its own --rules-file), so a rebuild never drops what those rules read.
+
+Usage: python3 drop_rules.py [--out DIR] [--allowlist FILE] [--rules-file FILE ...] [--list]
+"""
+import json, os, re, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import panel_builders, recording_rules
+import metrics_inventory
+from hardware_profiles import PROFILES
+from indexed_metrics import FAMILIES, SCRAPE_DIR
+from promql import Refs, refs, query_refs
+
+DROP_FILE = "bmaas-metric-drop.yaml"
+ALLOWLIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "metrics_allowlist.txt")
+
+# ── References ──
+
+def dashboard_exprs(obj):
+    """PromQL of every panel target and query variable in an encoded dashboard."""
+    if isinstance(obj, list):
+        for v in obj: yield from dashboard_exprs(v)
+    elif isinstance(obj, dict):
+        if isinstance(obj.get("expr"), str):
+            yield "expr", obj["expr"]
+        if obj.get("type") == "query" and "query" in obj:
+            q = obj["query"]
+            yield "query", q["query"] if isinstance(q, dict) else q
+        for k, v in obj.items():
+            if k not in ("expr", "query"): yield from dashboard_exprs(v)
+
+def dashboard_refs(dashboard_ids=None):
+    """Refs of every dashboard, built once per hardware profile (indexed metric names)."""
+    from generate_dashboards import BUILDERS
+    out = Refs()
+    saved = (panel_builders.PROFILE, panel_builders.METRIC_FORM)
+    try:
+        panel_builders.set_metric_form("indexed")
+        for profile in PROFILES:
+            panel_builders.set_profile(profile)
+            for did in dashboard_ids or sorted(BUILDERS):
+                module_name, func_name, _ = BUILDERS[did]
+                d = json.loads(json.dumps(getattr(__import__(module_name), func_name)(),
+                                          default=panel_builders.encode))
+                for kind, expr in dashboard_exprs(d):
+                    out.update(refs(expr) if kind == "expr" else query_refs(expr))
+    finally:
+        panel_builders.set_profile(saved[0]); panel_builders.set_metric_form(saved[1])
+    return out
+
+def recording_rule_refs():
+    out = Refs()
+    for groups_fn in recording_rules.RULE_FILES.values():
+        for g in groups_fn():
+            for r in g["rules"]: out.update(refs(r["expr"]))
+    return out
+
+def rule_file_exprs(path):
+    """expr values of a Prometheus rule file: quoted, plain or block (|, >) scalars."""
+    with open(path) as f:
+        lines = f.read().splitlines()
+    i = 0
+    while i < len(lines):
+        m = re.match(r'^(\s*)-?\s*expr:\s*(.*)$', lines[i])
+        i += 1
+        if not m: continue
+        val = m.group(2).strip()
+        if val[:1] in ("|", ">"):
+            block = []
+            while i < len(lines) and (not lines[i].strip() or
+                                      len(lines[i]) - len(lines[i].lstrip()) > len(m.group(1))):
+                block.append(lines[i].strip()); i += 1
+            yield " ".join(block)
+        elif val.startswith('"'):
+            yield json.loads(val)
+        elif val.startswith("'"):
+            yield val[1:-1].replace("''", "'")
+        else:
+            yield val
+
+def load_allowlist(path=ALLOWLIST):
+    """Full-match patterns (plain names are patterns too); missing file → empty."""
+    if not path or not os.path.exists(path): return []
+    with open(path) as f:
+        return [l.split("#", 1)[0].strip() for l in f if l.split("#", 1)[0].strip()]
+
+def is_used(metric, used, allow):
+    return (used.matches(metric.name) or (metric.family and used.matches(metric.labeled_name()))
+            or any(re.fullmatch(p, metric.name) for p in allow))
+
+# ── Drop configs ──
+
+def drop_regex(metrics, inventory):
+    """Alternation of dropped names; a family member dropped at every listed index
+    collapses into a regex of those indices only (gpu[0-7]_clock) — an index missing
+    from the inventory is kept, like any other unlisted metric."""
+    dropped = {m.name for m in metrics}
+    parts, done = [], set()
+    for m in metrics:
+        if m.family:
+            key = (m.family, m.metric)
+            if key in done: continue
+            members = [x for x in inventory if (x.family, x.metric) == key]
+            if len(members) > 1 and all(x.name in dropped for x in members):
+                done.add(key)
+                parts.append(FAMILIES[m.family].name_regex(m.metric, [x.index for x in members])); continue
+        parts.append(m.name)
+    return "|".join(parts)
+
+def drop_configs(unused, inventory):
+    return [{"section": section, "count": len(ms), "regex": drop_regex(ms, inventory)}
+            for section, ms in metrics_inventory.sections(unused).items()]
+
+RULE_FILES_HEADER = "# Rule files: "
+
+def to_yaml(configs, rule_files=()):
+    lines = ["# Generated by drop_rules.py — place BEFORE bmaas-metric-relabel.yaml on every BCM scrape job"]
+    if rule_files: lines.append(RULE_FILES_HEADER + ", ".join(rule_files))
+    lines.append("metric_relabel_configs:")
+    for c in configs:
+        lines.append(f"  # {c['section']} ({c['count']} unused)")
+        lines.append("  - source_labels: [__name__]")
+        lines.append(f"    regex: {json.dumps(c['regex'])}")
+        lines.append("    action: drop")
+    return "\n".join(lines) + "\n"
+
+def plan(allowlist=ALLOWLIST, rule_files=()):
+    """(inventory, used metrics, unused metrics)."""
+    inventory = metrics_inventory.load()
+    used = dashboard_refs().update(recording_rule_refs())
+    for path in rule_files:
+        for expr in rule_file_exprs(path): used.update(refs(expr))
+    allow = load_allowlist(allowlist)
+    keep = [m for m in inventory if is_used(m, used, allow)]
+    kept = {m.name for m in keep}
+    return inventory, keep, [m for m in inventory if m.name not in kept]
+
+def recorded_rule_files(out_dir=None):
+    """Rule files the existing drop file was planned with (paths as absolute); [] if none."""
+    out_dir = out_dir or SCRAPE_DIR
+    path = os.path.join(out_dir, DROP_FILE)
+    if not os.path.exists(path): return []
+    with open(path) as f:
+        for line in f:
+            if not line.startswith("#"): break
+            if line.startswith(RULE_FILES_HEADER):
+                return [os.path.normpath(os.path.join(out_dir, p.strip()))
+                        for p in line[len(RULE_FILES_HEADER):].split(",") if p.strip()]
+    return []
+
+def write_drop(out_dir=None, allowlist=ALLOWLIST, rule_files=()):
+    """Write the drop snippet; returns (filename, kept, dropped). Rule file paths are
+    recorded relative to out_dir (recorded_rule_files)."""
+    from generate_dashboards import write_text_atomic
+    inventory, keep, unused = plan(allowlist, rule_files)
+    out_dir = out_dir or SCRAPE_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    recorded = [os.path.relpath(os.path.abspath(p), out_dir) for p in rule_files]
+    write_text_atomic(to_yaml(drop_configs(unused, inventory), recorded), os.path.join(out_dir, DROP_FILE))
+    return DROP_FILE, len(keep), len(unused)
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    rule_files = [sys.argv[i + 1] for i, a in enumerate(sys.argv) if a == "--rules-file"]
+    if "--list" in sys.argv:
+        inventory, keep, unused = plan(opt("--allowlist", ALLOWLIST), rule_files)
+        kept = {m.name for m in keep}
+        for section, ms in metrics_inventory.sections(inventory).items():
+            print(f"\n{section}")
+            for m in ms: print(f"  {'keep' if m.name in kept else 'DROP'}  {m.name}")
+        print(f"\n{len(keep)} kept, {len(unused)} dropped of {len(inventory)} inventory metrics")
+        sys.exit(0)
+    filename, kept, dropped = write_drop(opt("--out"), opt("--allowlist", ALLOWLIST), rule_files)
+    print(f"  ✅ {filename}: {dropped} dropped, {kept} kept")
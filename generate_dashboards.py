@@ -3,13 +3,19 @@
 
 Generates all Grafana dashboard JSON files by invoking individual build modules.
 Usage: python3 generate_dashboards.py [--all | --dashboard 00 01 02 ...]
+       [--hardware dgx-gb200] [--metric-form labeled] [--matrix sites.json] [--rules DIR] [--watch [--sync URL]] [--report build.json] [--prom build.prom] [--profile build.prof] [--tracemalloc]
 
 v4: Only 5 dashboards (00-04). Dashboards 05 (burn-in) and 06 (SLA) deleted — merged into 00.
+07+: drill-down / scoped views (07 = single-node detail, 08 = fleet of clusters, 09 = job).
+Recording rules the views depend on (rules/, see recording_rules.py) are written alongside.
+--watch keeps the process warm and rebuilds only dashboards whose sources changed.
 """
-import json, os, sys
+import contextlib, cProfile, importlib, io, json, os, pstats, sys, tempfile, time, tracemalloc, types
 
 # Ensure we can import from the same directory
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import panel_builders  # attribute access only — --watch reloads it in place
+import build_report, drop_rules, indexed_metrics, recording_rules, sites
 
 DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboards")
 
@@ -19,12 +25,78 @@ BUILDERS = {
     "02": ("build_02_infrastructure", "build_02", "02-infrastructure-hardware-health.json"),
     "03": ("build_03_network", "build_03", "03-network-fabric-monitoring.json"),
     "04": ("build_04_workload", "build_04", "04-workload-job-performance.json"),
+    "07": ("build_07_node_detail", "build_07", "07-node-detail.json"),
+    "08": ("build_08_fleet_clusters", "build_08", "08-fleet-of-clusters.json"),
+    "09": ("build_09_job_detail", "build_09", "09-job-detail.json"),
 }
 
-def generate(dashboard_ids=None):
-    os.makedirs(DASHBOARD_DIR, exist_ok=True)
+@contextlib.contextmanager
+def atomic_open(outpath):
+    """Open a temp file beside outpath; on clean exit fsync it and rename it over outpath.
+
+    The Grafana file provisioner only ever sees the old or the new complete file.
+    """
+    outdir = os.path.dirname(os.path.abspath(outpath))
+    fd, tmp = tempfile.mkstemp(prefix="." + os.path.basename(outpath) + ".",
+                               suffix=".tmp", dir=outdir)
+    try:
+        with os.fdopen(fd, "w") as f:
+            yield f
+            f.flush(); os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600 — provisioner must be able to read
+        os.replace(tmp, outpath)
+    except BaseException:
+        if os.path.exists(tmp): os.unlink(tmp)
+        raise
+    # Persist the rename itself (POSIX only)
+    if hasattr(os, "O_DIRECTORY"):
+        dfd = os.open(outdir, os.O_RDONLY | os.O_DIRECTORY)
+        try: os.fsync(dfd)
+        finally: os.close(dfd)
+
+def write_json_atomic(obj, outpath, indent=4):
+    """Stream-encode obj atomically — the encoded document is never held as one string.
+    Returns the number of bytes written (output is ASCII — ensure_ascii is on).
+    """
+    written = 0
+    with atomic_open(outpath) as f:
+        for chunk in json.JSONEncoder(indent=indent, default=panel_builders.encode).iterencode(obj):
+            f.write(chunk); written += len(chunk)
+    return written
+
+def write_text_atomic(text, outpath):
+    with atomic_open(outpath) as f:
+        f.write(text)
+    return len(text)
+
+def generate(dashboard_ids=None, out_dir=None, report_json=None, report_prom=None,
+             profile=None, trace_memory=False, hardware=None, matrix=None, metric_form=None):
+    """Build and write dashboards.
+
+    hardware — hardware profile name (hardware_profiles.PROFILES) to build against;
+               the currently active profile is used when omitted.
+    metric_form — "indexed" / "labeled" metric names (indexed_metrics.py); the active
+               form is used when omitted.
+    matrix   — site matrix file (sites.py): build every site variant instead,
+               see generate_matrix().
+
+    Instrumentation (all off by default):
+      report_json / report_prom — write the build report (see build_report.py)
+      profile                   — dump cProfile stats for the whole run to this path
+      trace_memory              — record tracemalloc peak per dashboard in the report
+    """
+    if matrix:
+        return generate_matrix(matrix, dashboard_ids, out_dir, report_json, report_prom, profile, trace_memory)
+    if hardware: panel_builders.set_profile(hardware)
+    if metric_form: panel_builders.set_metric_form(metric_form)
+    out_dir = out_dir or DASHBOARD_DIR
+    os.makedirs(out_dir, exist_ok=True)
     ids = dashboard_ids or sorted(BUILDERS.keys())
     results = []
+    stats = []
+    prof = cProfile.Profile() if profile else None
+    if prof: prof.enable()
+    t_start = time.perf_counter()
 
     for did in ids:
         if did not in BUILDERS:
@@ -32,27 +104,41 @@ def generate(dashboard_ids=None):
             continue
 
         module_name, func_name, filename = BUILDERS[did]
-        outpath = os.path.join(DASHBOARD_DIR, filename)
+        outpath = os.path.join(out_dir, filename)
 
         try:
             mod = __import__(module_name)
             build_fn = getattr(mod, func_name)
+            if trace_memory: tracemalloc.start()
+            t0 = time.perf_counter()
             dashboard = build_fn()
-            with open(outpath, "w") as f:
-                json.dump(dashboard, f, indent=4)
+            t1 = time.perf_counter()
+            nbytes = write_json_atomic(dashboard, outpath)
+            t2 = time.perf_counter()
+            peak_kb = None
+            if trace_memory:
+                peak_kb = tracemalloc.get_traced_memory()[1] / 1024; tracemalloc.stop()
+            stats.append(build_report.dashboard_stats(did, dashboard, t1 - t0, t2 - t1, nbytes, peak_kb))
 
-            panel_count = len(dashboard["panels"])
-            uid = dashboard.get("uid", "?")
+            panel_count = len(dashboard.panels)
+            uid = dashboard.uid
             results.append((did, filename, panel_count, uid, "✅"))
             print(f"  ✅ {filename}: {panel_count} panels (uid={uid})")
         except Exception as e:
+            if tracemalloc.is_tracing(): tracemalloc.stop()
             results.append((did, filename, 0, "?", f"❌ {e}"))
             print(f"  ❌ {filename}: {e}")
 
+    total_s = time.perf_counter() - t_start
+    if prof:
+        prof.disable(); prof.dump_stats(profile)
+        print(f"\n📈 cProfile stats: {profile} (top 10 by cumulative time)")
+        pstats.Stats(prof, stream=sys.stdout).sort_stats("cumulative").print_stats(10)
+
     # Summary
     print(f"\n{'='*60}")
     print(f"Generated {sum(1 for r in results if '✅' in r[4])} / {len(ids)} dashboards")
-    print(f"Output directory: {DASHBOARD_DIR}")
+    print(f"Output directory: {out_dir}")
 
     # Verify unique UIDs
     uids = [r[3] for r in results if '✅' in r[4]]
@@ -61,22 +147,252 @@ def generate(dashboard_ids=None):
     else:
         print(f"✅ All {len(uids)} UIDs are unique")
 
+    if report_json or report_prom:
+        report = build_report.build_report(stats, total_s)
+        if report_json:
+            write_text_atomic(build_report.to_json(report), report_json)
+            print(f"📊 Build report (JSON): {report_json}")
+        if report_prom:
+            write_text_atomic(build_report.to_prometheus(report), report_prom)
+            print(f"📊 Build report (Prometheus): {report_prom}")
+
     return results
 
+def generate_matrix(matrix, dashboard_ids=None, out_dir=None, report_json=None, report_prom=None,
+                    profile=None, trace_memory=False):
+    """Build every site variant of a matrix file in one run.
+
+    Each builder runs once per distinct sites.build_key() (hardware profile, fleet
+    tenants) against a token site; the per-site cluster / node regex / UID suffix are
+    substituted into the encoded JSON. Per site: <out_dir>/<site>/*.json, rules/ and
+    manifest.json (folder, UIDs — used by grafana_sync-style deployers).
+    profile / trace_memory as in generate(); the memory peak is recorded for the
+    builds, not for variants served from the build cache.
+    """
+    variants = sites.load_matrix(matrix)
+    out_dir = out_dir or DASHBOARD_DIR
+    ids = []
+    for did in dashboard_ids or sorted(BUILDERS.keys()):
+        if did in BUILDERS: ids.append(did)
+        else: print(f"  ⚠️  Unknown dashboard ID: {did}")
+    cache = {}  # (did, build_key) → (encoded JSON with site tokens, dashboard)
+    results = []
+    stats = []
+    saved = (panel_builders.PROFILE, panel_builders.SITE, panel_builders.METRIC_FORM)
+    prof = cProfile.Profile() if profile else None
+    if prof: prof.enable()
+    t_start = time.perf_counter()
+
+    try:
+        for site in variants:
+            site_dir = os.path.join(out_dir, site.name)
+            os.makedirs(os.path.join(site_dir, "rules"), exist_ok=True)
+            key = sites.build_key(site)
+            manifest = {"site": site.name, "folder": site.folder, "cluster": site.cluster,
+                        "hardware": site.hardware, "metric_form": site.metric_form, "dashboards": []}
+            for did in ids:
+                module_name, func_name, filename = BUILDERS[did]
+                t0 = time.perf_counter()
+                peak_kb = None
+                if (did, key) not in cache:
+                    panel_builders.set_profile(site.hardware)
+                    panel_builders.set_metric_form(site.metric_form)
+                    panel_builders.set_site(sites.template_site(site))
+                    if trace_memory: tracemalloc.start()
+                    try:
+                        dashboard = getattr(__import__(module_name), func_name)()
+                        text = "".join(json.JSONEncoder(indent=4, default=panel_builders.encode).iterencode(dashboard))
+                        if trace_memory: peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+                    finally:
+                        if tracemalloc.is_tracing(): tracemalloc.stop()
+                    cache[(did, key)] = (text, dashboard)
+                text, dashboard = cache[(did, key)]
+                t1 = time.perf_counter()
+                nbytes = write_text_atomic(sites.substitute(text, site), os.path.join(site_dir, filename))
+                t2 = time.perf_counter()
+                uid = sites.substitute(dashboard.uid, site)
+                s = build_report.dashboard_stats(f"{site.name}/{did}", dashboard, t1 - t0, t2 - t1, nbytes, peak_kb)
+                s["uid"] = uid; stats.append(s)
+                manifest["dashboards"].append({"id": did, "uid": uid, "file": filename})
+                results.append((f"{site.name}/{did}", filename, len(dashboard.panels), uid, "✅"))
+
+            for filename, groups_fn in recording_rules.RULE_FILES.items():
+                if ("rules", filename, site.metric_form) not in cache:
+                    panel_builders.set_metric_form(site.metric_form)
+                    panel_builders.set_site(sites.template_site(site))
+                    cache[("rules", filename, site.metric_form)] = recording_rules.to_yaml(groups_fn())
+                write_text_atomic(sites.substitute(cache[("rules", filename, site.metric_form)], site),
+                                  os.path.join(site_dir, "rules", filename))
+            if site.metric_form == "labeled":  # the relabel snippet must be deployed with these
+                indexed_metrics.write_relabel(os.path.join(site_dir, "scrape"))
+            write_json_atomic(manifest, os.path.join(site_dir, "manifest.json"), indent=2)
+            print(f"  ✅ {site.name}: {len(ids)} dashboards → {site_dir} "
+                  f"(uid suffix {site.uid_suffix}, {site.hardware}, folder {site.folder!r})")
+    finally:
+        panel_builders.set_profile(saved[0]); panel_builders.set_site(saved[1])
+        panel_builders.set_metric_form(saved[2])
+
+    total_s = time.perf_counter() - t_start
+    if prof:
+        prof.disable(); prof.dump_stats(profile)
+        print(f"\n📈 cProfile stats: {profile} (top 10 by cumulative time)")
+        pstats.Stats(prof, stream=sys.stdout).sort_stats("cumulative").print_stats(10)
+    n_builds = sum(1 for k in cache if k[0] != "rules")
+    print(f"\n{'='*60}")
+    print(f"Generated {len(results)} dashboards for {len(variants)} sites from {n_builds} builds "
+          f"in {total_s:.2f}s")
+    uids = [r[3] for r in results]
+    if len(uids) != len(set(uids)):
+        print("⚠️  WARNING: Duplicate UIDs detected!")
+    else:
+        print(f"✅ All {len(uids)} UIDs are unique")
+
+    if report_json or report_prom:
+        report = build_report.build_report(stats, total_s)
+        if report_json: write_text_atomic(build_report.to_json(report), report_json)
+        if report_prom: write_text_atomic(build_report.to_prometheus(report), report_prom)
+
+    return results
+
+# ── Watch mode ──
+
+def _local_modules():
+    """Repo modules currently imported — the watch set."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    return {name: m for name, m in list(sys.modules.items())
+            if name not in ("__main__", "generate_dashboards") and getattr(m, "__file__", None)
+            and os.path.dirname(os.path.abspath(m.__file__)) == here}
+
+def _imports(mod, names):
+    """Watched modules `mod` takes globals from (`import x` or `from x import ...`)."""
+    deps = set()
+    for v in list(vars(mod).values()):
+        n = v.__name__ if isinstance(v, types.ModuleType) else getattr(v, "__module__", None)
+        if n in names and n != mod.__name__: deps.add(n)
+    return deps
+
+def reload_plan(changed, modules):
+    """Changed modules plus everything importing them (transitively), dependencies first.
+
+    `from panel_builders import *` binds names at import time, so every builder must be
+    re-executed after panel_builders is reloaded.
+    """
+    deps = {n: _imports(m, modules) for n, m in modules.items()}
+    stale = set(changed)
+    while True:
+        more = {n for n, d in deps.items() if d & stale} - stale
+        if not more: break
+        stale |= more
+    order = []
+    def visit(n):
+        if n in order: return
+        for d in sorted(deps[n] & stale): visit(d)
+        order.append(n)
+    for n in sorted(stale): visit(n)
+    return order
+
+def watch(dashboard_ids=None, out_dir=None, hardware=None, rules_dir=None, sync_url=None, interval=0.1,
+          metric_form=None):
+    """Build once, then poll source mtimes and rebuild only the affected dashboards.
+
+    Changed modules are importlib.reload()ed with their dependents; builder errors
+    (syntax errors included) are reported and the watcher keeps running.
+    sync_url — push rebuilt dashboards through grafana_sync right away instead of
+    waiting for the file provisioner's rescan.
+    """
+    ids = [d for d in dashboard_ids or sorted(BUILDERS.keys()) if d in BUILDERS]
+    out_dir = out_dir or DASHBOARD_DIR
+    generate(ids, out_dir, hardware=hardware, metric_form=metric_form)
+    recording_rules.write_rules(rules_dir)
+    by_module = {BUILDERS[d][0]: d for d in ids}
+
+    def mtime(m):
+        try: return os.stat(m.__file__).st_mtime_ns
+        except OSError: return None
+
+    seen = {n: mtime(m) for n, m in _local_modules().items()}
+    print(f"\n👀 Watching {len(seen)} modules (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            modules = _local_modules()
+            changed = [n for n, m in modules.items() if mtime(m) != seen.get(n)]
+            if not changed: continue
+            t0 = time.perf_counter()
+            for n in changed: seen[n] = mtime(modules[n])
+            plan = reload_plan(changed, modules)
+            try:
+                for n in plan: importlib.reload(modules[n])
+            except Exception as e:
+                print(f"  ❌ reload {n}: {type(e).__name__}: {e}")
+                continue
+            affected = sorted(by_module[n] for n in plan if n in by_module)
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = generate(affected, out_dir, hardware=hardware, metric_form=metric_form) if affected else []
+                if "recording_rules" in plan: recording_rules.write_rules(rules_dir)
+            dt = (time.perf_counter() - t0) * 1000
+            for r in results:
+                if "❌" in r[4]: print(f"  ❌ {r[1]}: {r[4][2:]}")
+            print(f"  ♻️  {', '.join(sorted(changed))} → {', '.join(affected) or 'no dashboards'} "
+                  f"({sum(1 for r in results if '✅' in r[4])} rebuilt in {dt:.0f} ms)")
+            if sync_url and results:
+                import grafana_sync
+                with contextlib.redirect_stdout(io.StringIO()):
+                    counts = grafana_sync.sync(out_dir, sync_url)
+                print(f"  ⬆️  synced: {counts}")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
 
 if __name__ == "__main__":
     if "--help" in sys.argv:
-        print("Usage: python3 generate_dashboards.py [--all | --dashboard 00 01 02 ...]")
+        print("Usage: python3 generate_dashboards.py [--all | --dashboard 00 01 02 ...] [options]")
         print("  --all           Generate all dashboards (default)")
-        print("  --dashboard IDs Generate specific dashboards by ID (00-04)")
+        print("  --dashboard IDs Generate specific dashboards by ID (00-04, 07-09)")
+        print("  --out DIR       Output directory (default: dashboards/)")
+        print("  --rules DIR     Recording rules directory (default: rules/)")
+        print("  --hardware NAME Hardware profile: dgx-b200 (default), dgx-gb200")
+        print("  --metric-form F indexed (default) or labeled — query relabeled gpu_*/infiniband_*/nvme_*")
+        print("                  families (writes the scrape relabel snippet, see indexed_metrics.py)")
+        print("  --scrape DIR    Scrape config snippets directory (default: scrape/)")
+        print("  --rules-file F  Alerting/extra rule file whose metrics the drop rules keep (repeatable;")
+        print("                  default: the rule files recorded in the existing drop file)")
+        print("  --matrix FILE   Build every site variant in a site matrix (see sites.py)")
+        print("  --watch         Keep running; rebuild only dashboards whose sources changed")
+        print("  --sync URL      With --watch: push rebuilt dashboards to Grafana (grafana_sync.py)")
+        print("  --report PATH   Write the build report as JSON")
+        print("  --prom PATH     Write the build report as Prometheus text exposition")
+        print("  --profile PATH  Dump cProfile stats for the run")
+        print("  --tracemalloc   Record peak memory per dashboard in the report")
         sys.exit(0)
 
+    def opt(name):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else None
+
     if "--dashboard" in sys.argv:
         idx = sys.argv.index("--dashboard")
-        ids = sys.argv[idx+1:]
+        ids = []
+        for a in sys.argv[idx+1:]:
+            if a.startswith("--"): break
+            ids.append(a)
     else:
         ids = None  # generate all available
 
     print(f"BMaaS Monitoring Dashboard Suite — Generator (v4)")
     print(f"{'='*60}")
-    generate(ids)
+    if "--watch" in sys.argv:
+        watch(ids, opt("--out"), opt("--hardware"), opt("--rules"), opt("--sync"),
+              metric_form=opt("--metric-form"))
+        sys.exit(0)
+    generate(ids, out_dir=opt("--out"), report_json=opt("--report"), report_prom=opt("--prom"),
+             profile=opt("--profile"), trace_memory="--tracemalloc" in sys.argv,
+             hardware=opt("--hardware"), matrix=opt("--matrix"), metric_form=opt("--metric-form"))
+    if not opt("--matrix"):  # matrix runs write rules per site
+        for filename, n in recording_rules.write_rules(opt("--rules")):
+            print(f"📜 Recording rules: {filename} ({n} rules)")
+        for filename, n in indexed_metrics.write_relabel(opt("--scrape")):
+            print(f"🏷️  Scrape relabeling: {filename} ({n} configs)")
+        rule_files = ([sys.argv[i + 1] for i, a in enumerate(sys.argv) if a == "--rules-file"]
+                      or drop_rules.recorded_rule_files(opt("--scrape")))
+        filename, kept, dropped = drop_rules.write_drop(opt("--scrape"), rule_files=rule_files)
+        print(f"🗑️  Unused-metric drops: {filename} ({dropped} of {kept + dropped} inventory metrics)")
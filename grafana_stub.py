@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Local Grafana HTTP API stand-in for grafana_sync.py.
+
+Implements just the endpoints the sync uses, in memory, over HTTP/1.1 keep-alive:
+
+- GET  /api/health
+- GET  /api/folders                 POST /api/folders
+- GET  /api/dashboards/uid/<uid>    POST /api/dashboards/db
+
+Counts requests, uploads and TCP connections so pooling and diffing can be checked.
+
+Usage: python3 grafana_stub.py [--port 3000]
+"""
+import json, sys, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubGrafana(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr=("127.0.0.1", 0)):
+        super().__init__(addr, _Handler)
+        self.lock = threading.Lock()
+        self.dashboards = {}   # uid → {"dashboard", "folderUid", "version"}
+        self.folders = {}      # uid → title
+        self.requests = self.uploads = self.connections = 0
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock: self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(n) or b"{}")
+
+    def do_GET(self):
+        srv = self.server
+        with srv.lock: srv.requests += 1
+        if self.path == "/api/health":
+            return self._send(200, {"database": "ok"})
+        if self.path.startswith("/api/folders"):
+            with srv.lock:
+                return self._send(200, [{"uid": u, "title": t} for u, t in srv.folders.items()])
+        if self.path.startswith("/api/dashboards/uid/"):
+            uid = self.path.rsplit("/", 1)[1]
+            with srv.lock: d = srv.dashboards.get(uid)
+            if d is None:
+                return self._send(404, {"message": "Dashboard not found"})
+            return self._send(200, {"dashboard": d["dashboard"],
+                                    "meta": {"folderUid": d["folderUid"], "version": d["version"]}})
+        self._send(404, {"message": "Not found"})
+
+    def do_POST(self):
+        srv = self.server
+        body = self._body()
+        with srv.lock:
+            srv.requests += 1
+            if self.path == "/api/folders":
+                uid = body.get("uid") or f"f{len(srv.folders) + 1}"
+                srv.folders[uid] = body["title"]
+                return self._send(200, {"uid": uid, "title": body["title"]})
+            if self.path == "/api/dashboards/db":
+                dash = body["dashboard"]; uid = dash["uid"]
+                prev = srv.dashboards.get(uid)
+                version = (prev["version"] + 1) if prev else 1
+                stored = dict(dash, id=len(srv.dashboards) + 1, version=version)
+                srv.dashboards[uid] = {"dashboard": stored, "folderUid": body.get("folderUid"),
+                                       "version": version}
+                srv.uploads += 1
+                return self._send(200, {"uid": uid, "version": version, "status": "success"})
+        self._send(404, {"message": "Not found"})
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else 3000
+    srv = StubGrafana(("127.0.0.1", port))
+    print(f"Grafana stand-in listening on {srv.url}")
+    srv.serve_forever()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Grafana API Sync.
+
+Pushes generated dashboards through the Grafana HTTP API instead of the file
+provisioner, uploading only what changed:
+
+1. Hash each local dashboard (sha256 of canonical JSON, ignoring the server-managed
+   id / version fields)
+2. GET /api/dashboards/uid/<uid> and hash the deployed copy the same way
+3. POST /api/dashboards/db only where the hashes (or the folder) differ
+
+Requests run on a bounded ThreadPoolExecutor over a pool of keep-alive
+http.client connections (one per worker — no reconnect per request).
+
+Sources: a dashboards directory (default dashboards/, folder DASHBOARD_FOLDER), or a
+matrix output directory — every <site>/manifest.json is synced into its own folder.
+Auth: GRAFANA_TOKEN (Bearer) or GRAFANA_USER / GRAFANA_PASSWORD (Basic).
+
+Usage: python3 grafana_sync.py [--url http://localhost:3000] [--dir dashboards/]
+       [--folder NAME] [--concurrency 8] [--dry-run] [--stub]
+"""
+import base64, contextlib, hashlib, http.client, json, os, queue, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, quote
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from panel_builders import DASHBOARD_FOLDER
+
+DEFAULT_URL = "http://localhost:3000"
+DEFAULT_CONCURRENCY = 8
+TIMEOUT_S = 30
+
+# Fields Grafana assigns on save — never part of the content hash
+SERVER_FIELDS = ("id", "version", "iteration")
+
+class GrafanaError(Exception):
+    pass
+
+def content_hash(dashboard):
+    d = {k: v for k, v in dashboard.items() if k not in SERVER_FIELDS}
+    canon = json.dumps(d, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canon.encode()).hexdigest()
+
+# ── HTTP client: pooled keep-alive connections ──
+
+class GrafanaClient:
+    """Thread-safe JSON client; each request borrows a keep-alive connection from the pool."""
+
+    def __init__(self, url=DEFAULT_URL, size=DEFAULT_CONCURRENCY, token=None, user=None, password=None):
+        u = urlsplit(url)
+        self.host, self.port, self.https = u.hostname, u.port, u.scheme == "https"
+        self.base = u.path.rstrip("/")
+        self.headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        elif user:
+            cred = base64.b64encode(f"{user}:{password or ''}".encode()).decode()
+            self.headers["Authorization"] = f"Basic {cred}"
+        self.pool = queue.LifoQueue()
+        for _ in range(size): self.pool.put(None)   # connections are opened lazily
+        self.opened = 0; self._lock = threading.Lock()
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        with self._lock: self.opened += 1
+        return cls(self.host, self.port, timeout=TIMEOUT_S)
+
+    @contextlib.contextmanager
+    def _conn(self):
+        conn = self.pool.get()
+        try:
+            conn = conn or self._connect()
+            yield conn
+        except BaseException:
+            if conn: conn.close()
+            conn = None   # broken — reopen on next use
+            raise
+        finally:
+            self.pool.put(conn)
+
+    def request(self, method, path, body=None):
+        """(status, decoded JSON). Retries once if the server dropped an idle keep-alive."""
+        data = json.dumps(body).encode() if body is not None else None
+        for attempt in (0, 1):
+            try:
+                with self._conn() as conn:
+                    conn.request(method, self.base + path, body=data, headers=self.headers)
+                    resp = conn.getresponse()
+                    raw = resp.read()
+                    return resp.status, (json.loads(raw) if raw else None)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if attempt: raise
+
+    def close(self):
+        while not self.pool.empty():
+            conn = self.pool.get()
+            if conn: conn.close()
+
+# ── Grafana API ──
+
+def get_dashboard(client, uid):
+    """(dashboard, folderUid) as deployed, or (None, None) if absent."""
+    status, body = client.request("GET", f"/api/dashboards/uid/{quote(uid)}")
+    if status == 404: return None, None
+    if status != 200: raise GrafanaError(f"GET {uid}: HTTP {status} {body}")
+    return body["dashboard"], body.get("meta", {}).get("folderUid")
+
+def put_dashboard(client, dashboard, folder_uid, message):
+    status, body = client.request("POST", "/api/dashboards/db", {
+        "dashboard": dict(dashboard, id=None), "folderUid": folder_uid,
+        "overwrite": True, "message": message})
+    if status != 200: raise GrafanaError(f"POST {dashboard.get('uid')}: HTTP {status} {body}")
+    return body
+
+def ensure_folder(client, title, dry_run=False):
+    """uid of the folder titled `title`, creating it if needed."""
+    status, body = client.request("GET", "/api/folders?limit=1000")
+    if status != 200: raise GrafanaError(f"GET folders: HTTP {status} {body}")
+    for f in body:
+        if f["title"] == title: return f["uid"]
+    if dry_run: return None
+    status, body = client.request("POST", "/api/folders", {"title": title})
+    if status != 200: raise GrafanaError(f"POST folder {title!r}: HTTP {status} {body}")
+    return body["uid"]
+
+# ── Sync ──
+
+def sources(path, folder=None):
+    """[(folder title, [dashboard json paths])] for a dashboards dir or a matrix output dir."""
+    manifests = sorted(os.path.join(path, d, "manifest.json") for d in os.listdir(path)
+                       if os.path.isfile(os.path.join(path, d, "manifest.json")))
+    if not manifests:
+        files = sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith(".json"))
+        return [(folder or DASHBOARD_FOLDER, files)]
+    out = []
+    for m in manifests:
+        with open(m) as f: man = json.load(f)
+        site_dir = os.path.dirname(m)
+        out.append((folder or man["folder"], [os.path.join(site_dir, d["file"]) for d in man["dashboards"]]))
+    return out
+
+def sync_one(client, path, folder_uid, dry_run):
+    with open(path) as f: local = json.load(f)
+    uid = local["uid"]
+    deployed, deployed_folder = get_dashboard(client, uid)
+    if deployed is not None and content_hash(deployed) == content_hash(local) \
+            and deployed_folder == folder_uid:
+        return uid, "unchanged"
+    status = "created" if deployed is None else "updated"
+    if not dry_run:
+        put_dashboard(client, local, folder_uid, f"grafana_sync: {content_hash(local)[:12]}")
+    return uid, status
+
+def sync(path, url=DEFAULT_URL, folder=None, concurrency=DEFAULT_CONCURRENCY, dry_run=False,
+         token=None, user=None, password=None):
+    """Sync every dashboard under `path`; returns {status: count}."""
+    client = GrafanaClient(url, concurrency, token, user, password)
+    counts = {}
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            jobs = []
+            for title, files in sources(path, folder):
+                folder_uid = ensure_folder(client, title, dry_run)
+                jobs += [(p, pool.submit(sync_one, client, p, folder_uid, dry_run)) for p in files]
+            for p, fut in jobs:
+                try:
+                    uid, status = fut.result()
+                except (GrafanaError, OSError, ValueError, http.client.HTTPException) as e:
+                    uid, status = os.path.basename(p), "error"
+                    print(f"  ❌ {p}: {e}")
+                counts[status] = counts.get(status, 0) + 1
+                if status in ("created", "updated"):
+                    print(f"  {'🔍' if dry_run else '⬆️ '} {status}: {uid}")
+    finally:
+        client.close()
+    print(f"\n{'='*60}")
+    print(f"{sum(counts.values())} dashboards in {time.perf_counter() - t0:.2f}s — "
+          + ", ".join(f"{k}: {v}" for k, v in sorted(counts.items()))
+          + f" ({client.opened} connections{', dry run' if dry_run else ''})")
+    return counts
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    path = opt("--dir", os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboards"))
+    concurrency = int(opt("--concurrency", DEFAULT_CONCURRENCY))
+    print(f"BMaaS Monitoring Dashboard Suite — Grafana Sync")
+    print(f"{'='*60}")
+
+    if "--stub" in sys.argv:
+        # Local stand-in: first pass uploads everything, second pass nothing
+        from grafana_stub import StubGrafana
+        stub = StubGrafana().start()
+        for _ in range(2):
+            sync(path, stub.url, opt("--folder"), concurrency)
+        print(f"stub: {stub.requests} requests over {stub.connections} connections, {stub.uploads} uploads")
+        stub.shutdown()
+        sys.exit(0)
+
+    counts = sync(path, opt("--url", os.environ.get("GRAFANA_URL", DEFAULT_URL)), opt("--folder"),
+                  concurrency, "--dry-run" in sys.argv, os.environ.get("GRAFANA_TOKEN"),
+                  os.environ.get("GRAFANA_USER"), os.environ.get("GRAFANA_PASSWORD"))
+    sys.exit(1 if counts.get("error") else 0)
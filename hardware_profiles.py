@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Hardware profiles — GPU topology the dashboard builders render against.
+
+A profile fixes how many indexed per-GPU metrics (gpu0_* … gpuN_*) a node exposes,
+the InfiniBand ports present, the NVMe drives and network interfaces per node (series multipliers for capacity_planner.py), and how per-GPU
+panels are rendered:
+
+- "targets" — one query per GPU index (readable legends; fine up to 8 GPUs)
+- "regex"   — one query per panel: {__name__=~"gpu(…)_<metric>"} + label_replace
+              to recover the GPU index as a `gpu` label
+- "auto"    — "targets" up to MAX_GPU_TARGETS GPUs per node, "regex" above that
+              (no current profile exceeds it — "regex" is for denser nodes, or forced)
+
+Select with panel_builders.set_profile("dgx-gb200") before building.
+"""
+
+# Above this many GPUs per node, "auto" collapses per-GPU targets into one regex query
+MAX_GPU_TARGETS = 8
+
+GPU_STRATEGIES = ("auto", "targets", "regex")
+
+class HardwareProfile:
+    __slots__ = ("name", "title", "gpus_per_node", "ib_ports", "gpu_strategy", "nvme_devices", "nics")
+
+    def __init__(self, name, title, gpus_per_node, ib_ports, gpu_strategy="auto", nvme_devices=0, nics=0):
+        if gpu_strategy not in GPU_STRATEGIES:
+            raise ValueError(f"Unknown GPU strategy {gpu_strategy!r} (expected one of {GPU_STRATEGIES})")
+        self.name = name; self.title = title
+        self.gpus_per_node = gpus_per_node
+        self.ib_ports = tuple(ib_ports); self.gpu_strategy = gpu_strategy
+        self.nvme_devices = nvme_devices; self.nics = nics
+
+    def strategy(self):
+        """Resolved per-GPU rendering strategy ("targets" or "regex")."""
+        if self.gpu_strategy != "auto":
+            return self.gpu_strategy
+        return "targets" if self.gpus_per_node <= MAX_GPU_TARGETS else "regex"
+
+    def __repr__(self):
+        return (f"HardwareProfile({self.name!r}, gpus_per_node={self.gpus_per_node}, "
+                f"strategy={self.strategy()!r})")
+
+PROFILES = {
+    # DGX B200: 8 GPUs on one NVSwitch baseboard — the NVLink domain is the node.
+    # 8 U.2 data + 2 M.2 boot drives; 8 CX-7, 2 dual-port BlueField-3, mgmt, bonds
+    "dgx-b200": HardwareProfile(
+        "dgx-b200", "DGX B200", gpus_per_node=8,
+        ib_ports=[4, 7, 8, 9, 10, 13, 14, 15], nvme_devices=10, nics=16),
+    # DGX GB200 NVL72: 18 compute trays × 4 GPUs share one 72-GPU NVLink domain.
+    # Per tray: 4 E1.S data + 1 M.2 boot drive; 4 CX-7, 1 dual-port BlueField-3, mgmt
+    "dgx-gb200": HardwareProfile(
+        "dgx-gb200", "DGX GB200 NVL72", gpus_per_node=4,
+        ib_ports=[0, 1, 2, 3], nvme_devices=5, nics=9),
+}
+
+DEFAULT_PROFILE = "dgx-b200"
+
+def get_profile(name_or_profile):
+    if isinstance(name_or_profile, HardwareProfile):
+        return name_or_profile
+    if name_or_profile not in PROFILES:
+        raise KeyError(f"Unknown hardware profile {name_or_profile!r} (known: {', '.join(sorted(PROFILES))})")
+    return PROFILES[name_or_profile]
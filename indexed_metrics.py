@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Indexed metric families — BCM per-index metric names and their labeled form.
+
+BCM exports one metric name per device index:
+
+    gpu3_temperature   infiniband_mlx5_4_link_state   nvme5_pci_errors
+
+so dashboards enumerate them (one target per index) or match them with a
+__name__ regex. The metric_relabel_configs generated here rewrite them at scrape
+time into one family per metric, with the index as a label:
+
+    gpu_temperature{gpu="3"}   infiniband_link_state{port="4"}   nvme_pci_errors{nvme="5"}
+
+Builders target either form (panel_builders.set_metric_form, Site.metric_form):
+- "indexed" — raw BCM names (default; no scrape change needed)
+- "labeled" — the relabeled families: one selector replaces N, and the index is
+              matched through the label index instead of a __name__ regex
+
+Deploy the relabel snippet on every BCM scrape job BEFORE building with "labeled"
+(series recorded before the change keep their indexed names).
+
+Usage: python3 indexed_metrics.py [--out DIR]
+"""
+import json, os, re, sys
+
+SCRAPE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scrape")
+RELABEL_FILE = "bmaas-metric-relabel.yaml"
+
+METRIC_FORMS = ("indexed", "labeled")
+DEFAULT_METRIC_FORM = "indexed"
+
+class IndexedFamily:
+    """Metrics named <prefix><index>_<metric>; labeled as <name>_<metric>{<label>="<index>"}."""
+    __slots__ = ("name", "prefix", "label")
+
+    def __init__(self, name, prefix, label):
+        self.name = name; self.prefix = prefix; self.label = label
+
+    def indexed(self, metric, i):
+        return f"{self.prefix}{i}_{metric}"
+
+    def labeled(self, metric):
+        return f"{self.name}_{metric}"
+
+    def name_regex(self, metric, indices=None):
+        """Any index, or only `indices` (gpu[0-7]_power, nvme(?:0|2)_critical)."""
+        if indices is None: return f"{self.prefix}[0-9]+_{metric}"
+        idx = sorted(set(indices))
+        if idx == list(range(idx[0], idx[-1] + 1)) and idx[-1] < 10 and len(idx) > 1:
+            return f"{self.prefix}[{idx[0]}-{idx[-1]}]_{metric}"
+        return f"{self.prefix}(?:{'|'.join(map(str, idx))})_{metric}"
+
+    def split(self, name):
+        """(index, metric) if name is one of this family's indexed names, else None."""
+        m = re.fullmatch(f"{re.escape(self.prefix)}([0-9]+)_(.+)", name)
+        return (int(m.group(1)), m.group(2)) if m else None
+
+    def relabel_configs(self):
+        # The index label is taken from __name__ first — the second rule rewrites it
+        pattern = f"{self.prefix}([0-9]+)_(.+)"
+        return [
+            {"source_labels": ["__name__"], "regex": pattern, "target_label": self.label, "replacement": "$1"},
+            {"source_labels": ["__name__"], "regex": pattern, "target_label": "__name__",
+             "replacement": f"{self.name}_$2"},
+        ]
+
+    def __repr__(self):
+        return f"IndexedFamily({self.name!r}, {self.prefix}N_* → {self.name}_*{{{self.label}=N}})"
+
+FAMILIES = {
+    "gpu":        IndexedFamily("gpu", "gpu", "gpu"),                       # gpu0_power
+    "infiniband": IndexedFamily("infiniband", "infiniband_mlx5_", "port"),  # infiniband_mlx5_4_rate
+    "nvme":       IndexedFamily("nvme", "nvme", "nvme"),                    # nvme3_critical
+}
+
+def split_indexed(name):
+    """(family, index, metric) for an indexed name such as gpu3_power, else None."""
+    for fam in FAMILIES.values():
+        parts = fam.split(name)
+        if parts: return (fam.name,) + parts
+    return None
+
+def check_form(form):
+    if form not in METRIC_FORMS:
+        raise ValueError(f"Unknown metric form {form!r} (expected one of {', '.join(METRIC_FORMS)})")
+    return form
+
+def relabel_configs():
+    return [c for fam in FAMILIES.values() for c in fam.relabel_configs()]
+
+def to_yaml(configs):
+    """metric_relabel_configs snippet (strings double-quoted — JSON strings are valid YAML)."""
+    lines = ["# Generated by indexed_metrics.py — add to every BCM scrape job",
+             "metric_relabel_configs:"]
+    for c in configs:
+        lines.append(f"  - source_labels: [{', '.join(c['source_labels'])}]")
+        lines.append(f"    regex: {json.dumps(c['regex'])}")
+        lines.append(f"    target_label: {c['target_label']}")
+        lines.append(f"    replacement: {json.dumps(c['replacement'])}")
+    return "\n".join(lines) + "\n"
+
+def write_relabel(out_dir=None):
+    """Write the relabel snippet; returns [(filename, config count)]."""
+    from generate_dashboards import write_text_atomic
+    out_dir = out_dir or SCRAPE_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    configs = relabel_configs()
+    write_text_atomic(to_yaml(configs), os.path.join(out_dir, RELABEL_FILE))
+    return [(RELABEL_FILE, len(configs))]
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+    out = sys.argv[sys.argv.index("--out") + 1] if "--out" in sys.argv else None
+    for filename, n in write_relabel(out):
+        print(f"  ✅ {filename}: {n} relabel configs")
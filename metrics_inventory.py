@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Metric inventory — the BCM metric names listed in REAL_METRICS_INVENTORY.txt.
+
+One metric per line; `#` starts a comment (whole line or trailing). A `# ═══`
+banner is followed by the section name. Indexed families are listed for one
+index, then a continuation comment names the others:
+
+    gpu0_clock … gpu0_throttle
+    # ... same for gpu1 through gpu7            → gpu1_clock … gpu7_throttle
+    infiniband_mlx5_30_lid …
+    # ... same pattern for ports 33, 34, 4      → infiniband_mlx5_33_lid …
+
+Usage: python3 metrics_inventory.py [--file PATH]   (lists metrics per section)
+"""
+import os, re, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from indexed_metrics import FAMILIES, split_indexed
+
+INVENTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "REAL_METRICS_INVENTORY.txt")
+
+_BANNER = re.compile(r'^#\s*═+\s*$')
+_SAME_FOR = re.compile(r'^#\s*\.\.\.\s*same (?:pattern )?for (.+)$', re.I)
+_THROUGH = re.compile(r'(\D*)(\d+) through \D*(\d+)')
+
+class InventoryMetric:
+    """One inventory metric; family / index / metric are set for indexed names."""
+    __slots__ = ("name", "section", "family", "index", "metric")
+
+    def __init__(self, name, section):
+        self.name = name; self.section = section
+        self.family, self.index, self.metric = split_indexed(name) or (None, None, None)
+
+    def labeled_name(self):
+        """Name after indexed-family relabeling (indexed_metrics.py); the name itself otherwise."""
+        return FAMILIES[self.family].labeled(self.metric) if self.family else self.name
+
+    def __repr__(self):
+        return f"InventoryMetric({self.name!r}, section={self.section!r})"
+
+def _indices(spec):
+    """Indices named by a continuation comment: "gpu1 through gpu7", "ports 33, 34, 4"."""
+    m = _THROUGH.search(spec)
+    if m: return list(range(int(m.group(2)), int(m.group(3)) + 1))
+    return [int(n) for n in re.findall(r'\d+', spec)]
+
+def load(path=INVENTORY):
+    """Inventory metrics in file order, continuation comments expanded, duplicates dropped."""
+    metrics, seen = [], set()
+    section, expect_name, named = None, False, False
+
+    def add(name):
+        if name not in seen:
+            seen.add(name); metrics.append(InventoryMetric(name, section))
+
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            if line.startswith("#"):
+                same = _SAME_FOR.match(line)
+                if _BANNER.match(line):   # opening banner, or the one closing a section name
+                    expect_name, named = not named, False
+                elif expect_name:
+                    section = line.lstrip("#").strip(); expect_name, named = False, True
+                elif same and metrics and metrics[-1].family:
+                    last = metrics[-1]
+                    fam = FAMILIES[last.family]
+                    block = [m.metric for m in metrics if m.family == last.family and m.index == last.index]
+                    for i in _indices(same.group(1)):
+                        for metric in block: add(fam.indexed(metric, i))
+                continue
+            add(line.split("#", 1)[0].strip())
+    return metrics
+
+def sections(metrics):
+    """{section: [metric, …]} in file order."""
+    out = {}
+    for m in metrics:
+        out.setdefault(m.section, []).append(m)
+    return out
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+    path = sys.argv[sys.argv.index("--file") + 1] if "--file" in sys.argv else INVENTORY
+    metrics = load(path)
+    for section, ms in sections(metrics).items():
+        print(f"{section}: {len(ms)}")
+    print(f"{len(metrics)} metrics")
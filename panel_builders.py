@@ -11,6 +11,11 @@ v4 OVERHAUL:
 - Reverse sort legends on all time series
 - Dashboard links include folder prefix
 """
+from types import MappingProxyType
+from hardware_profiles import DEFAULT_PROFILE, get_profile
+from sites import DEFAULT_SITE
+from rollups import rollup
+from indexed_metrics import DEFAULT_METRIC_FORM, FAMILIES, check_form
 
 _id = 0
 
@@ -18,7 +23,8 @@ def nid():
     global _id; _id += 1; return _id
 
 def reset_ids():
-    global _id; _id = 0
+    """Start a new dashboard: panel ids restart at 1 and per-dashboard options reset."""
+    global _id, GPU_VAR, RACK_VAR; _id = 0; GPU_VAR = False; RACK_VAR = False
 
 # ── Datasource: "Mimir BCM Metrics" ──
 DS_NAME = "Mimir BCM Metrics"
@@ -26,22 +32,56 @@ DS_NAME = "Mimir BCM Metrics"
 def ds():
     return {"type": "prometheus", "uid": "${datasource}"}
 
-def tgt(expr, legend, instant=False, fmt="time_series"):
-    t = {"refId": "", "datasource": ds(), "expr": expr, "legendFormat": legend}
-    if instant: t["instant"] = True
-    if fmt == "table": t["format"] = "table"; t["instant"] = True
-    return t
+# ── PANEL MODEL ──
+# Builders return compact __slots__ objects; nested Grafana dicts are only
+# produced by to_dict() when the dashboard is encoded (see encode()).
+
+def _frozen(v):
+    """Deep read-only copy for module-level shared defaults."""
+    if isinstance(v, dict): return MappingProxyType({k: _frozen(x) for k, x in v.items()})
+    if isinstance(v, list): return tuple(_frozen(x) for x in v)
+    return v
+
+def _thaw(v):
+    """Fresh mutable copy of a _frozen() default — never hand out the shared one."""
+    if isinstance(v, MappingProxyType): return {k: _thaw(x) for k, x in v.items()}
+    if isinstance(v, tuple): return [_thaw(x) for x in v]
+    return v
+
+def encode(obj):
+    """json `default=` hook: serialize model objects lazily at write time."""
+    if isinstance(obj, (Target, Panel, Dashboard)): return obj.to_dict()
+    if isinstance(obj, (MappingProxyType, tuple)): return _thaw(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class Target:
+    __slots__ = ("ref_id", "expr", "legend", "instant", "fmt", "datasource")
+
+    def __init__(self, expr, legend, instant=False, fmt="time_series", datasource=None):
+        self.ref_id = ""; self.expr = expr; self.legend = legend
+        self.instant = instant; self.fmt = fmt; self.datasource = datasource
+
+    def to_dict(self):
+        t = {"refId": self.ref_id, "datasource": self.datasource or ds(),
+             "expr": self.expr, "legendFormat": self.legend}
+        if self.instant: t["instant"] = True
+        if self.fmt == "table": t["format"] = "table"; t["instant"] = True
+        if self.fmt == "heatmap": t["format"] = "heatmap"
+        return t
+
+def tgt(expr, legend, instant=False, fmt="time_series", datasource=None):
+    return Target(expr, legend, instant, fmt, datasource)
 
 def refs(targets):
-    for i, t in enumerate(targets): t["refId"] = chr(65 + i % 26)
+    for i, t in enumerate(targets): t.ref_id = chr(65 + i % 26)
     return targets
 
-# ── Legends — always reverse sorted ──
-LEGEND_R = {"displayMode": "table", "placement": "right",
-            "calcs": ["lastNotNull"], "sortBy": "Last *", "sortDesc": True}
-LEGEND_F = {"displayMode": "table", "placement": "right",
+# ── Legends — always reverse sorted (read-only; thawed per panel on write) ──
+LEGEND_R = _frozen({"displayMode": "table", "placement": "right",
+            "calcs": ["lastNotNull"], "sortBy": "Last *", "sortDesc": True})
+LEGEND_F = _frozen({"displayMode": "table", "placement": "right",
             "calcs": ["min","max","mean","lastNotNull"],
-            "sortBy": "Last *", "sortDesc": True}
+            "sortBy": "Last *", "sortDesc": True})
 
 # ── Professional palette ──
 C_OK  = "#56A64B"; C_WR = "#E0A939"; C_FL = "#C04040"; C_UK = "#8F8F8F"
@@ -49,177 +89,604 @@ C_P0  = "#C04040"; C_P1 = "#E0663E"; C_P2 = "#E0A939"; C_P3 = "#7EB26D"
 C_BL  = "#3274D9"; C_PU = "#8F3BB8"; C_TL = "#6ED0E0"; C_OR = "#EF843C"
 C_YL  = "#F2CC0C"; C_GN = "#73BF69"; C_DK = "#1F1D2B"
 
+# ── Site defaults (see sites.py; switched with set_site()) ──
+SITE = DEFAULT_SITE
+DEFAULT_CLUSTER = SITE.cluster
+NODE_REGEX = SITE.node_regex   # GPU-only focus: entity names of DGX nodes
+RACK_REGEX = SITE.rack_regex   # entity → rack (first capture group)
+UID_SUFFIX = SITE.uid_suffix
+
 # ── Filter shorthands using REAL labels ──
 # entity = DGX hostname (skt-dgx filtered via template variable)
 E  = 'entity=~"$node"'
 CL = 'cluster=~"$cluster"'
 EC = E + ',' + CL  # entity + cluster combined filter
 
-# ── Dashboard UIDs — V6 (5 dashboards only — 05/06 deleted) ──
-UIDS = {
-    "00": "bmaas-00-fleet-overview-v6",
-    "01": "bmaas-01-gpu-health-v6",
-    "02": "bmaas-02-infra-health-v6",
-    "03": "bmaas-03-network-fabric-v6",
-    "04": "bmaas-04-workload-perf-v6",
+# ── Dashboard UIDs — V6 (05/06 deleted; 07+ are drill-down / scoped views) ──
+BASE_UIDS = {
+    "00": "bmaas-00-fleet-overview",
+    "01": "bmaas-01-gpu-health",
+    "02": "bmaas-02-infra-health",
+    "03": "bmaas-03-network-fabric",
+    "04": "bmaas-04-workload-perf",
+    "07": "bmaas-07-node-detail",
+    "08": "bmaas-08-fleet-clusters",
+    "09": "bmaas-09-job-detail",
 }
+UIDS = {k: v + UID_SUFFIX for k, v in BASE_UIDS.items()}
+
+# ── Multi-cluster fleet ──
+# Mimir holds one tenant per cluster, exposed in Grafana as one datasource per tenant
+# (cluster → datasource uid). Fleet panels use the "-- Mixed --" datasource with one
+# target per tenant; Grafana runs the per-datasource queries concurrently.
+# The default single entry keeps the fleet view usable on a one-tenant install.
+FLEET_TENANTS = SITE.fleet_tenants()
+MIXED_DS = _frozen({"type":"datasource","uid":"-- Mixed --"})
+
+def tenant_ds(uid):
+    return {"type":"prometheus","uid":uid}
+
+def mixed(panel):
+    """Switch a panel to the Mixed datasource (targets carry their own datasource)."""
+    panel.datasource = MIXED_DS
+    return panel
+
+def tenant_targets(expr, legend="{{cluster}}", instant=False, fmt="time_series"):
+    """The same query once per fleet tenant, each against that tenant's datasource."""
+    return [tgt(expr, legend, instant, fmt, tenant_ds(uid)) for uid in FLEET_TENANTS.values()]
+
+def fleet_cluster_variable():
+    """Multi-select $cluster over the configured tenants (custom — no per-tenant query)."""
+    names = list(FLEET_TENANTS)
+    return {"name":"cluster","type":"custom","label":"Cluster",
+            "query":",".join(names),
+            "current":{"text":["All"],"value":["$__all"]},
+            "options":[{"text":n,"value":n,"selected":False} for n in names],
+            "hide":0,"includeAll":True,"multi":True,"allValue":".*","skipUrlSync":False}
 
 # Folder name in Grafana where dashboards are imported
-DASHBOARD_FOLDER = "BMaaS QA SKT"
+DASHBOARD_FOLDER = SITE.folder
+
+def set_site(site):
+    """Activate a site (sites.Site) for subsequent builds. UIDS / FLEET_TENANTS are
+    updated in place — builders hold references to them via `import *`."""
+    global SITE, DEFAULT_CLUSTER, NODE_REGEX, RACK_REGEX, UID_SUFFIX, DASHBOARD_FOLDER
+    SITE = site
+    DEFAULT_CLUSTER = site.cluster; NODE_REGEX = site.node_regex; RACK_REGEX = site.rack_regex
+    UID_SUFFIX = site.uid_suffix; DASHBOARD_FOLDER = site.folder
+    UIDS.clear(); UIDS.update({k: v + UID_SUFFIX for k, v in BASE_UIDS.items()})
+    FLEET_TENANTS.clear(); FLEET_TENANTS.update(site.fleet_tenants())
+    return SITE
 
 def dashboard_link(uid, title):
     return f"/d/{uid}?orgId=1&var-datasource=${{datasource}}&var-node=${{node}}&var-cluster=${{cluster}}"
 
-# ── GPU index helper ──
-GPU_COUNT = 8
+# ── Hardware profile / GPU index helpers ──
+# Builders never loop over GPU indices themselves: gpu_targets() renders per-GPU
+# queries for the active profile (see hardware_profiles.py).
+PROFILE = get_profile(DEFAULT_PROFILE)
+GPU_COUNT = PROFILE.gpus_per_node
+
+def set_profile(profile):
+    """Activate a hardware profile (name or HardwareProfile) for subsequent builds."""
+    global PROFILE, GPU_COUNT
+    PROFILE = get_profile(profile)
+    GPU_COUNT = PROFILE.gpus_per_node
+    return PROFILE
+
+def gpu_count():
+    return PROFILE.gpus_per_node
+
+def ib_ports():
+    return PROFILE.ib_ports
+
+def hardware_title():
+    return PROFILE.title
+
+def gpu_indices(half=None):
+    """All GPU indices, or the first (half=0) / second (half=1) half of them."""
+    n = PROFILE.gpus_per_node
+    if half is None: return range(n)
+    return range(n // 2) if half == 0 else range(n // 2, n)
+
+def gpu_range_label(half=None):
+    idx = gpu_indices(half)
+    return f"gpu{idx[0]}-gpu{idx[-1]}"
+
+def gpu_metric_range(base, half=None):
+    """"gpu0_<base> .. gpuN_<base>" over the profile's GPUs — for panel descriptions."""
+    idx = gpu_indices(half)
+    return f"gpu{idx[0]}_{base} .. gpu{idx[-1]}_{base}"
+
+def _index_regex(idx):
+    return "[0-9]+" if len(idx) == PROFILE.gpus_per_node else "|".join(str(i) for i in idx)
 
 def gpu_metric(base, gpu_idx):
     return f"gpu{gpu_idx}_{base}"
 
+# ── Indexed metric families (gpuN_*, infiniband_mlx5_N_*, nvmeN_*) ──
+# "indexed" queries BCM's per-index names; "labeled" queries the families rewritten by
+# the scrape relabel snippet (indexed_metrics.py): gpu_temperature{gpu="3"} …
+METRIC_FORM = DEFAULT_METRIC_FORM
+
+def set_metric_form(form):
+    """Select "indexed" or "labeled" metric names for subsequent builds."""
+    global METRIC_FORM
+    METRIC_FORM = check_form(form)
+    return METRIC_FORM
+
+def indexed_targets(family, metric, indices, legend, filt=None):
+    """One target per index, or one labeled-family target matching all of them.
+    `legend` marks the index with {i}, e.g. "{{entity}} mlx5_{i}"."""
+    fam = FAMILIES[family]
+    filt = node_filter() if filt is None else filt
+    if METRIC_FORM == "labeled":
+        sel = f'{fam.label}=~"{"|".join(str(i) for i in indices)}",{filt}'
+        return [tgt(f'{fam.labeled(metric)}{{{sel}}}', legend.replace("{i}", "{{" + fam.label + "}}"))]
+    return [tgt(f'{fam.indexed(metric, i)}{{{filt}}}', legend.replace("{i}", str(i))) for i in indices]
+
+def indexed_selector(family, metric, filt=None):
+    """Selector over every index of one family member."""
+    fam = FAMILIES[family]
+    filt = node_filter() if filt is None else filt
+    if METRIC_FORM == "labeled":
+        return f'{fam.labeled(metric)}{{{filt}}}'
+    return f'{{__name__=~"{fam.name_regex(metric)}",{filt}}}'
+
+def indexed_series(family, metric, filt=None):
+    """indexed_selector() with the index also kept as the family label (gpu, port …) in the
+    indexed form, so the series stay distinct once an operation drops __name__
+    (`<= bool`, rate/increase, arithmetic) — Prometheus rejects duplicate labelsets."""
+    fam = FAMILIES[family]
+    sel = indexed_selector(family, metric, filt)
+    if METRIC_FORM == "labeled":
+        return sel
+    return f'label_replace({sel}, "{fam.label}", "$1", "__name__", "{fam.prefix}([0-9]+)_{metric}")'
+
+def indexed_name_legend(family, metric):
+    """Legend rendering the per-index name (nvme3_critical) in either form."""
+    fam = FAMILIES[family]
+    return "{{__name__}}" if METRIC_FORM == "indexed" else f"{fam.prefix}{{{{{fam.label}}}}}_{metric}"
+
+def ib_targets(metric, legend="{{entity}} mlx5_{i}", filt=None):
+    """InfiniBand targets for every port of the hardware profile."""
+    return indexed_targets("infiniband", metric, ib_ports(), legend, filt)
+
+# ── $gpu template variable ──
+# Builders opt in with use_gpu_variable() and standard_templating(extra_vars=[gpu_variable()]);
+# gpu_targets() then selects only the chosen GPUs through a __name__ regex.
+GPU_VAR = False
+
+def use_gpu_variable():
+    """Make per-GPU helpers in the current dashboard honor $gpu (reset by reset_ids())."""
+    global GPU_VAR; GPU_VAR = True
+
+def gpu_variable():
+    n = PROFILE.gpus_per_node
+    return {"name":"gpu","type":"custom","label":"GPU",
+            "query":",".join(str(i) for i in range(n)),
+            "current":{"text":["All"],"value":["$__all"]},
+            "hide":0,"includeAll":True,"multi":True,"allValue":"[0-9]+",
+            "options":[{"text":"All","value":"$__all","selected":True}] +
+                      [{"text":str(i),"value":str(i),"selected":False} for i in range(n)],
+            "skipUrlSync":False}
+
+# ── $rack template variable ──
+# Builders opt in with use_rack_variable(); standard_templating() then adds $rack (racks
+# of the rack:<metric>:max rules) and node_filter() keeps only its nodes. BCM has no rack
+# label, so the match is on entity: RACK_REGEX with $rack in its capture group.
+RACK_VAR = False
+
+def use_rack_variable():
+    """Make node_filter() and the $node options honor $rack (reset by reset_ids())."""
+    global RACK_VAR; RACK_VAR = True
+
+def rack_node_regex(rack="$rack"):
+    """Entity regex of one rack's nodes: RACK_REGEX with its first capture group replaced
+    by `rack` ("(.*)[0-9]" → "($rack)[0-9]")."""
+    r, i, in_class, start, depth = RACK_REGEX, 0, False, None, 0
+    while i < len(r):
+        c = r[i]
+        if c == "\\":
+            i += 2; continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            if start is None and not r.startswith("(?", i): start = i
+            if start is not None: depth += 1
+        elif c == ")" and start is not None:
+            depth -= 1
+            if depth == 0: return f"{r[:start]}({rack}){r[i + 1:]}"
+        i += 1
+    return r   # not reached: sites.Site requires a capture group
+
+def rack_variable(metric="gpu_health_overall"):
+    q = f'label_values(rack:{metric}:max{{{CL}}}, rack)'
+    return {"name":"rack","type":"query","label":"Rack",
+            "datasource":ds(),"definition":q,"query":{"query":q,"refId":"rk"},
+            "current":{"text":["All"],"value":["$__all"]},
+            "hide":0,"includeAll":True,"multi":True,"allValue":".*",
+            "options":[],"refresh":2,"regex":"","sort":1,"skipUrlSync":False}
+
+def node_filter():
+    """Default entity + cluster filter of the helpers: EC, plus the $rack match when the
+    dashboard uses the $rack variable."""
+    return f'{EC},entity=~"{rack_node_regex()}"' if RACK_VAR else EC
+
+def gpu_targets(base, legend="{{entity}} GPU", filt=None, half=None):
+    """Per-GPU targets for metric family gpu<N>_<base>, rendered per the profile strategy.
+
+    "targets": one query per GPU, legend "<legend><N>".
+    "regex":   one query for all selected GPUs; the index is recovered into a
+               `gpu` label so the legend becomes "<legend>{{gpu}}".
+    Labeled metric form: one gpu_<base>{gpu=~…} query — no __name__ regex.
+    With use_gpu_variable() the regex form is always used and restricted to $gpu
+    (ANDed with the half's indices — PromQL allows several __name__ matchers).
+    """
+    filt = node_filter() if filt is None else filt
+    idx = gpu_indices(half)
+    if METRIC_FORM == "labeled":
+        gpus = f'gpu=~"${{gpu:pipe}}",' if GPU_VAR else ""
+        if half is not None or not GPU_VAR:  # also keeps out series without a gpu label
+            gpus += f'gpu=~"{_index_regex(idx)}",'
+        return [tgt(f'gpu_{base}{{{gpus}{filt}}}', legend + "{{gpu}}")]
+    if GPU_VAR:
+        names = f'__name__=~"gpu(${{gpu:pipe}})_{base}"'
+        if half is not None:
+            names += f',__name__=~"gpu({_index_regex(idx)})_{base}"'
+        sel = f'{{{names},{filt}}}'
+    elif PROFILE.strategy() == "targets":
+        return [tgt(f'{gpu_metric(base, i)}{{{filt}}}', f'{legend}{i}') for i in idx]
+    else:
+        sel = f'{{__name__=~"gpu({_index_regex(idx)})_{base}",{filt}}}'
+    return [tgt(f'label_replace({sel}, "gpu", "$1", "__name__", "gpu([0-9]+)_{base}")',
+                legend + "{{gpu}}")]
+
 def gpu_targets_all(base, unit_label=""):
-    return [tgt(f'{gpu_metric(base, i)}{{{EC}}}', f'GPU{i}') for i in range(GPU_COUNT)]
+    return gpu_targets(base, legend="GPU")
 
 # ── PANEL BUILDERS ──
 
-def row(title, y, collapsed=False):
-    return {"type":"row","title":title,"collapsed":collapsed,
-            "gridPos":{"h":1,"w":24,"x":0,"y":y},"id":nid(),"panels":[]}
+# Shared read-only defaults — thawed into fresh dicts per panel on write
+REDUCE_LAST = _frozen({"calcs":["lastNotNull"],"fields":"","values":False})
+TH_OK  = _frozen({"mode":"absolute","steps":[{"color":C_OK,"value":None}]})
+TH_BAR = _frozen({"mode":"absolute","steps":[
+            {"color":C_OK,"value":None},{"color":C_WR,"value":50},
+            {"color":C_FL,"value":80}]})
+
+class Panel:
+    """Base panel: id, title, gridPos and targets; subclasses render the rest."""
+    __slots__ = ("id", "title", "desc", "gp", "targets", "repeat", "max_per_row", "datasource")
+    type = None
+
+    def __init__(self, title, desc, gp, targets):
+        self.id = nid(); self.title = title; self.desc = desc
+        self.gp = gp; self.targets = refs(targets) if targets is not None else None
+        self.repeat = None; self.max_per_row = None; self.datasource = None
+
+    def _head(self):
+        d = {"id":self.id,"title":self.title,"description":self.desc,"type":self.type,
+             "datasource":self.datasource or ds(),"gridPos":self.gp}
+        if self.repeat:
+            d["repeat"] = self.repeat; d["repeatDirection"] = "h"
+            if self.max_per_row: d["maxPerRow"] = self.max_per_row
+        return d
+
+class Row(Panel):
+    """Row; a collapsed row holds its children in .panels (not queried until expanded)."""
+    __slots__ = ("collapsed", "panels")
+    type = "row"
+
+    def __init__(self, title, y, collapsed=False):
+        super().__init__(title, None, {"h":1,"w":24,"x":0,"y":y}, None)
+        self.collapsed = collapsed; self.panels = []
+
+    def to_dict(self):
+        d = {"type":"row","title":self.title,"collapsed":self.collapsed,
+             "gridPos":self.gp,"id":self.id,"panels":self.panels}
+        if self.repeat:
+            d["repeat"] = self.repeat
+        return d
+
+class Stat(Panel):
+    __slots__ = ("unit", "decimals", "thresholds", "color_mode", "text_mode",
+                 "graph_mode", "mappings", "orientation")
+    type = "stat"
+
+    def to_dict(self):
+        d = self._head()
+        d["fieldConfig"] = {"defaults":{"unit":self.unit,"decimals":self.decimals,
+            "thresholds":self.thresholds or _thaw(TH_OK),
+            "mappings":self.mappings or [],"noValue":"N/A"},"overrides":[]}
+        d["options"] = {"reduceOptions":_thaw(REDUCE_LAST),
+            "orientation":self.orientation,"textMode":self.text_mode,
+            "colorMode":self.color_mode,"graphMode":self.graph_mode,"justifyMode":"center"}
+        d["targets"] = self.targets
+        return d
+
+class TimeSeries(Panel):
+    __slots__ = ("axis", "unit", "overrides", "stacking")
+    type = "timeseries"
+
+    def to_dict(self):
+        custom = {"lineWidth":2,"fillOpacity":10,"gradientMode":"none",
+                  "axisLabel":self.axis,"drawStyle":"line","pointSize":4,
+                  "showPoints":"never","spanNulls":True}
+        if self.stacking:
+            custom["stacking"] = {"mode":self.stacking}; custom["fillOpacity"]=60; custom["lineWidth"]=0
+        d = self._head()
+        d["fieldConfig"] = {"defaults":{"unit":self.unit,"custom":custom},"overrides":self.overrides or []}
+        d["options"] = {"legend":_thaw(LEGEND_F),"tooltip":{"mode":"multi","sort":"desc"}}
+        d["targets"] = self.targets
+        return d
+
+class Table(Panel):
+    __slots__ = ("transforms", "overrides", "sort")
+    type = "table"
+
+    def to_dict(self):
+        d = self._head()
+        d["fieldConfig"] = {"defaults":{"custom":{"align":"auto","displayMode":"auto","filterable":True}},
+            "overrides":self.overrides or []}
+        d["options"] = {"showHeader":True,"sortBy":self.sort or []}
+        d["transformations"] = self.transforms or []
+        d["targets"] = self.targets
+        return d
+
+class PieChart(Panel):
+    __slots__ = ("legend_placement",)
+    type = "piechart"
+
+    def to_dict(self):
+        d = self._head()
+        d["fieldConfig"] = {"defaults":{"unit":"none","decimals":0},"overrides":[]}
+        d["options"] = {"reduceOptions":_thaw(REDUCE_LAST),
+            "pieType":"donut","tooltip":{"mode":"multi"},
+            "legend":{"displayMode":"table","placement":self.legend_placement,
+                       "calcs":["lastNotNull"]}}
+        d["targets"] = self.targets
+        return d
+
+class StateTimeline(Panel):
+    __slots__ = ("links",)
+    type = "state-timeline"
+
+    def to_dict(self):
+        d = self._head()
+        d["fieldConfig"] = {"defaults":{"custom":{"lineWidth":0,"fillOpacity":80},
+            "thresholds":{"mode":"absolute","steps":[
+                {"color":C_OK,"value":None},{"color":C_WR,"value":1},
+                {"color":C_FL,"value":2},{"color":C_UK,"value":3}]},
+            "mappings":[
+                {"type":"value","options":{"0":{"text":"PASS","color":C_OK}}},
+                {"type":"value","options":{"1":{"text":"WARN","color":C_WR}}},
+                {"type":"value","options":{"2":{"text":"FAIL","color":C_FL}}},
+                {"type":"value","options":{"3":{"text":"UNK","color":C_UK}}}]},"overrides":[]}
+        if self.links: d["fieldConfig"]["defaults"]["links"] = self.links
+        d["options"] = {"showValue":"auto","mergeValues":True,"alignValue":"center",
+            "rowHeight":0.85,"tooltip":{"mode":"multi"},
+            "legend":{"displayMode":"list","placement":"bottom"}}
+        d["targets"] = self.targets
+        return d
+
+class BarGauge(Panel):
+    __slots__ = ("unit", "orientation", "thresholds")
+    type = "bargauge"
+
+    def to_dict(self):
+        d = self._head()
+        d["fieldConfig"] = {"defaults":{"unit":self.unit,"decimals":0,
+            "thresholds":self.thresholds or _thaw(TH_BAR),
+            "noValue":"N/A"},"overrides":[]}
+        d["options"] = {"reduceOptions":_thaw(REDUCE_LAST),
+            "orientation":self.orientation,"displayMode":"gradient",
+            "showUnfilled":True}
+        d["targets"] = self.targets
+        return d
+
+class Heatmap(Panel):
+    """Heatmap over precomputed cumulative `le` buckets (targets use format "heatmap")."""
+    __slots__ = ("unit", "scheme")
+    type = "heatmap"
+
+    def to_dict(self):
+        d = self._head()
+        d["fieldConfig"] = {"defaults":{"custom":{"hideFrom":{"legend":False,"tooltip":False,"viz":False},
+            "scaleDistribution":{"type":"linear"}}},"overrides":[]}
+        d["options"] = {"calculate":False,"cellGap":1,
+            "color":{"mode":"scheme","scheme":self.scheme,"steps":64,"exponent":0.5,
+                     "fill":C_OR,"reverse":False,"scale":"exponential"},
+            "filterValues":{"le":1e-9},"rowsFrame":{"layout":"le"},
+            "yAxis":{"axisPlacement":"left","unit":self.unit,"reverse":False},
+            "tooltip":{"show":True,"yHistogram":True},"legend":{"show":True},
+            "cellValues":{"unit":"short"},"showValue":"never"}
+        d["targets"] = self.targets
+        return d
+
+class Text(Panel):
+    __slots__ = ("content",)
+    type = "text"
+
+    def to_dict(self):
+        return {"id":self.id,"title":self.title,"type":"text",
+            "gridPos":self.gp,
+            "options":{"mode":"markdown","content":self.content}}
+
+def row(title, y, collapsed=False, repeat=None):
+    """Row; repeat=<var> repeats the row (and its collapsed children) per selected value."""
+    r = Row(title, y, collapsed)
+    r.repeat = repeat
+    return r
+
+def repeated(panel, var, max_per_row=None):
+    """Repeat a panel horizontally for each selected value of template variable `var`."""
+    panel.repeat = var; panel.max_per_row = max_per_row
+    return panel
 
 def stat(title, desc, gp, targets, unit="none", decimals=0,
          thresholds=None, color_mode="background", text_mode="value_and_name",
          graph_mode="none", mappings=None, orientation="auto"):
     """Stat panel with value_and_name to show clear labels."""
-    return {"id":nid(),"title":title,"description":desc,"type":"stat",
-        "datasource":ds(),"gridPos":gp,
-        "fieldConfig":{"defaults":{"unit":unit,"decimals":decimals,
-            "thresholds":thresholds or {"mode":"absolute","steps":[{"color":C_OK,"value":None}]},
-            "mappings":mappings or [],"noValue":"N/A"},"overrides":[]},
-        "options":{"reduceOptions":{"calcs":["lastNotNull"],"fields":"","values":False},
-            "orientation":orientation,"textMode":text_mode,
-            "colorMode":color_mode,"graphMode":graph_mode,"justifyMode":"center"},
-        "targets":refs(targets)}
+    p = Stat(title, desc, gp, targets)
+    p.unit = unit; p.decimals = decimals; p.thresholds = thresholds
+    p.color_mode = color_mode; p.text_mode = text_mode; p.graph_mode = graph_mode
+    p.mappings = mappings; p.orientation = orientation
+    return p
 
 def ts(title, desc, gp, targets, axis, unit="short", overrides=None, stacking=None):
-    custom = {"lineWidth":2,"fillOpacity":10,"gradientMode":"none",
-              "axisLabel":axis,"drawStyle":"line","pointSize":4,
-              "showPoints":"never","spanNulls":True}
-    if stacking:
-        custom["stacking"] = {"mode":stacking}; custom["fillOpacity"]=60; custom["lineWidth"]=0
-    return {"id":nid(),"title":title,"description":desc,"type":"timeseries",
-        "datasource":ds(),"gridPos":gp,
-        "fieldConfig":{"defaults":{"unit":unit,"custom":custom},"overrides":overrides or []},
-        "options":{"legend":LEGEND_F,"tooltip":{"mode":"multi","sort":"desc"}},
-        "targets":refs(targets)}
+    p = TimeSeries(title, desc, gp, targets)
+    p.axis = axis; p.unit = unit; p.overrides = overrides; p.stacking = stacking
+    return p
 
 def tbl(title, desc, gp, targets, transforms=None, overrides=None, sort=None):
-    return {"id":nid(),"title":title,"description":desc,"type":"table",
-        "datasource":ds(),"gridPos":gp,
-        "fieldConfig":{"defaults":{"custom":{"align":"auto","displayMode":"auto","filterable":True}},
-            "overrides":overrides or []},
-        "options":{"showHeader":True,"sortBy":sort or []},
-        "transformations":transforms or [],"targets":refs(targets)}
+    p = Table(title, desc, gp, targets)
+    p.transforms = transforms; p.overrides = overrides; p.sort = sort
+    return p
 
 def piechart(title, desc, gp, targets, legend_placement="right"):
-    return {"id":nid(),"title":title,"description":desc,"type":"piechart",
-        "datasource":ds(),"gridPos":gp,
-        "fieldConfig":{"defaults":{"unit":"none","decimals":0},"overrides":[]},
-        "options":{"reduceOptions":{"calcs":["lastNotNull"],"fields":"","values":False},
-            "pieType":"donut","tooltip":{"mode":"multi"},
-            "legend":{"displayMode":"table","placement":legend_placement,
-                       "calcs":["lastNotNull"]}},
-        "targets":refs(targets)}
+    p = PieChart(title, desc, gp, targets)
+    p.legend_placement = legend_placement
+    return p
 
 def heatmap(title, desc, gp, targets):
-    return {"id":nid(),"title":title,"description":desc,"type":"state-timeline",
-        "datasource":ds(),"gridPos":gp,
-        "fieldConfig":{"defaults":{"custom":{"lineWidth":0,"fillOpacity":80},
-            "thresholds":{"mode":"absolute","steps":[
-                {"color":C_OK,"value":None},{"color":C_WR,"value":1},
-                {"color":C_FL,"value":2},{"color":C_UK,"value":3}]},
-            "mappings":[
-                {"type":"value","options":{"0":{"text":"PASS","color":C_OK}}},
-                {"type":"value","options":{"1":{"text":"WARN","color":C_WR}}},
-                {"type":"value","options":{"2":{"text":"FAIL","color":C_FL}}},
-                {"type":"value","options":{"3":{"text":"UNK","color":C_UK}}}]},"overrides":[]},
-        "options":{"showValue":"auto","mergeValues":True,"alignValue":"center",
-            "rowHeight":0.85,"tooltip":{"mode":"multi"},
-            "legend":{"displayMode":"list","placement":"bottom"}},
-        "targets":refs(targets)}
+    p = StateTimeline(title, desc, gp, targets)
+    p.links = None
+    return p
+
+def fleet_heatmap(title, desc, gp, metric="gpu_health_overall", drill_uid=None):
+    """Fleet mode of heatmap(): one row per rack showing the worst (max) state of its
+    nodes, read from the rack:<metric>:max recording rule — rows scale with racks, not
+    nodes. Clicking a rack opens drill_uid with $rack set to it and $node on All; the
+    target dashboard needs use_rack_variable() so its queries keep only that rack."""
+    p = heatmap(title, desc, gp, [tgt(f'rack:{metric}:max{{{CL}}}', '{{rack}}')])
+    if drill_uid:
+        p.links = [{"title":"Nodes in rack ${__field.labels.rack}","targetBlank":False,
+                    "url":f"/d/{drill_uid}?orgId=1&var-datasource=${{datasource}}&var-cluster=${{cluster}}"
+                          "&var-rack=${__field.labels.rack:percentencode}&var-node=$__all&${__url_time_range}"}]
+    return p
+
+def histogram_heatmap(title, desc, gp, targets, unit="short", scheme="Oranges"):
+    """Heatmap of bucket counts over time. Targets select a `le`-labelled bucket series
+    (e.g. the *:bucket recording rules); legend/format are forced to {{le}} / heatmap."""
+    for t in targets: t.fmt = "heatmap"; t.legend = "{{le}}"
+    p = Heatmap(title, desc, gp, targets)
+    p.unit = unit; p.scheme = scheme
+    return p
 
 def bargauge(title, desc, gp, targets, unit="none", orientation="horizontal",
              thresholds=None):
-    return {"id":nid(),"title":title,"description":desc,"type":"bargauge",
-        "datasource":ds(),"gridPos":gp,
-        "fieldConfig":{"defaults":{"unit":unit,"decimals":0,
-            "thresholds":thresholds or {"mode":"absolute","steps":[
-                {"color":C_OK,"value":None},{"color":C_WR,"value":50},
-                {"color":C_FL,"value":80}]},
-            "noValue":"N/A"},"overrides":[]},
-        "options":{"reduceOptions":{"calcs":["lastNotNull"],"fields":"","values":False},
-            "orientation":orientation,"displayMode":"gradient",
-            "showUnfilled":True},
-        "targets":refs(targets)}
+    p = BarGauge(title, desc, gp, targets)
+    p.unit = unit; p.orientation = orientation; p.thresholds = thresholds
+    return p
 
 def text_panel(title, content, gp):
-    return {"id":nid(),"title":title,"type":"text",
-        "gridPos":gp,
-        "options":{"mode":"markdown","content":content}}
+    p = Text(title, None, gp, None)
+    p.content = content
+    return p
 
 # ── DASHBOARD WRAPPER ──
 
+class Dashboard:
+    __slots__ = ("uid", "title", "description", "tags", "panels", "templating",
+                 "time_from", "refresh", "links")
+
+    def to_dict(self):
+        d = {
+            "__inputs":[],"__requires":[
+                {"type":"grafana","id":"grafana","name":"Grafana","version":"9.0.0"},
+                {"type":"datasource","id":"prometheus","name":"Prometheus","version":"1.0.0"}],
+            "id":None,"uid":self.uid,
+            "title":self.title,"description":self.description,
+            "tags":self.tags,
+            "style":"dark","timezone":"browser","editable":True,
+            "graphTooltip":1,"fiscalYearStartMonth":0,"liveNow":False,
+            "refresh":self.refresh,"schemaVersion":38,"version":1,
+            "time":{"from":self.time_from,"to":"now"},"timepicker":{},
+            "annotations":{"list":[{"builtIn":1,"datasource":{"type":"grafana","uid":"-- Grafana --"},
+                "enable":True,"hide":True,"iconColor":"rgba(0, 211, 255, 1)",
+                "name":"Annotations & Alerts","type":"dashboard"}]},
+            "templating":self.templating,"panels":self.panels
+        }
+        if self.links:
+            d["links"] = self.links
+        return d
+
 def wrap_dashboard(uid, title, description, tags, panels, templating,
                    time_from="now-6h", refresh="30s", links=None):
-    d = {
-        "__inputs":[],"__requires":[
-            {"type":"grafana","id":"grafana","name":"Grafana","version":"9.0.0"},
-            {"type":"datasource","id":"prometheus","name":"Prometheus","version":"1.0.0"}],
-        "id":None,"uid":uid,
-        "title":title,"description":description,
-        "tags":tags,
-        "style":"dark","timezone":"browser","editable":True,
-        "graphTooltip":1,"fiscalYearStartMonth":0,"liveNow":False,
-        "refresh":refresh,"schemaVersion":38,"version":1,
-        "time":{"from":time_from,"to":"now"},"timepicker":{},
-        "annotations":{"list":[{"builtIn":1,"datasource":{"type":"grafana","uid":"-- Grafana --"},
-            "enable":True,"hide":True,"iconColor":"rgba(0, 211, 255, 1)",
-            "name":"Annotations & Alerts","type":"dashboard"}]},
-        "templating":templating,"panels":panels
-    }
-    if links:
-        d["links"] = links
+    d = Dashboard()
+    d.uid = uid; d.title = title; d.description = description; d.tags = tags
+    d.panels = panels; d.templating = templating
+    d.time_from = time_from; d.refresh = refresh; d.links = links
     return d
 
 # ── STANDARD TEMPLATE VARIABLES ──
 # Datasource = "Mimir BCM Metrics", cluster = "su56", node = entity regex /skt-dgx.*/
 
-def standard_templating(extra_vars=None):
+def standard_templating(extra_vars=None, node_all=True, cluster_multi=False):
+    """Datasource / cluster / node variables. node_all=False drops the "All" node option
+    (for per-node views that repeat on $node); cluster_multi=True makes $cluster
+    multi-select over FLEET_TENANTS (fleet-of-clusters views). With use_rack_variable()
+    $rack comes before $node and narrows its options."""
+    node_sel = f'{CL},entity=~"{rack_node_regex()}"' if RACK_VAR else CL
+    node_query = f"label_values({{{node_sel}}}, entity)"
     vars_list = [
         {"name":"datasource","type":"datasource","label":"Data Source",
          "query":"prometheus",
          "current":{"text":"Mimir BCM Metrics","value":"Mimir BCM Metrics"},
          "hide":0,
          "includeAll":False,"multi":False,"options":[],"refresh":1,"regex":"","skipUrlSync":False},
+        fleet_cluster_variable() if cluster_multi else
         {"name":"cluster","type":"query","label":"Cluster",
          "datasource":ds(),
          "definition":"label_values(up, cluster)",
          "query":{"query":"label_values(up, cluster)","refId":"cl"},
-         "current":{"text":"su56","value":"su56"},
+         "current":{"text":DEFAULT_CLUSTER,"value":DEFAULT_CLUSTER},
          "hide":0,"includeAll":False,"multi":False,
          "options":[],"refresh":2,"regex":"","sort":1,"skipUrlSync":False},
         {"name":"node","type":"query","label":"Node (DGX)",
          "datasource":ds(),
-         "definition":"label_values({cluster=~\"$cluster\"}, entity)",
-         "query":{"query":"label_values({cluster=~\"$cluster\"}, entity)","refId":"nd"},
+         "definition":node_query,
+         "query":{"query":node_query,"refId":"nd"},
          "current":{},
-         "hide":0,"includeAll":True,"multi":True,
-         "allValue":"skt-dgx.*",
-         "options":[],"refresh":2,"regex":"/skt-dgx.*/","sort":1,"skipUrlSync":False},
+         "hide":0,"includeAll":node_all,"multi":True,
+         "allValue":NODE_REGEX,
+         "options":[],"refresh":2,"regex":f"/{NODE_REGEX}/","sort":1,"skipUrlSync":False},
     ]
+    if RACK_VAR:
+        vars_list.insert(2, rack_variable())
     if extra_vars:
         vars_list.extend(extra_vars)
     return {"list": vars_list}
 
-# ── DASHBOARD NAV LINKS (5 dashboards only) ──
+# ── JOB-SCOPED TEMPLATING ──
+# $job lists job IDs from the job:* anchor rule (one series per job, refreshed on time
+# range change — only jobs active in the range). $node is then only the job's nodes, so
+# nav links to 01/07 carry the job's hosts. No "All" anywhere: nothing fleet-wide.
+J = 'job_id="$job"'
+
+def job_variable():
+    q = 'label_values(job:job_gpu_utilization:count{cluster=~"$cluster"}, job_id)'
+    return {"name":"job","type":"query","label":"Job ID",
+            "datasource":ds(),"definition":q,"query":{"query":q,"refId":"job"},
+            "current":{},"hide":0,"includeAll":False,"multi":False,
+            "options":[],"refresh":2,"regex":"","sort":4,"skipUrlSync":False}
+
+def job_node_variable():
+    q = 'label_values(job_entity:job_gpu_utilization:count{' + CL + ',' + J + '}, entity)'
+    return {"name":"node","type":"query","label":"Job Nodes",
+            "datasource":ds(),"definition":q,"query":{"query":q,"refId":"jn"},
+            "current":{"text":["All"],"value":["$__all"]},"hide":0,"includeAll":True,"multi":True,
+            "options":[],"refresh":2,"regex":"","sort":1,"skipUrlSync":False}
+
+def job_templating():
+    """Datasource / cluster from standard_templating(), then $job and the job's $node.
+    No allValue on $node: "All" expands to the job's node list, not NODE_REGEX."""
+    ds_var, cluster_var, _ = standard_templating()["list"]
+    return {"list": [ds_var, cluster_var, job_variable(), job_node_variable()]}
+
+# ── DASHBOARD NAV LINKS ──
 
 def sub_dashboard_links():
     return [
@@ -233,4 +700,10 @@ def sub_dashboard_links():
          "url":dashboard_link(UIDS["03"],"Network"),"targetBlank":False},
         {"title":"04 Workload & Jobs","type":"link","icon":"dashboard",
          "url":dashboard_link(UIDS["04"],"Workload"),"targetBlank":False},
+        {"title":"07 Node Detail","type":"link","icon":"dashboard",
+         "url":dashboard_link(UIDS["07"],"Node Detail"),"targetBlank":False},
+        {"title":"08 Fleet of Clusters","type":"link","icon":"dashboard",
+         "url":dashboard_link(UIDS["08"],"Fleet of Clusters"),"targetBlank":False},
+        {"title":"09 Job Detail","type":"link","icon":"dashboard",
+         "url":dashboard_link(UIDS["09"],"Job Detail"),"targetBlank":False},
     ]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Local Prometheus HTTP API stand-in for replay_bench.py, on promql_eval.py.
+
+Implements the query endpoints Grafana uses, GET or POST (form), over HTTP/1.1 keep-alive:
+
+- /api/v1/query                instant query (time)
+- /api/v1/query_range          range query (start, end, step)
+- /api/v1/label/<name>/values  label values (match[])
+
+Recording rules are evaluated over the stored window at startup, so dashboards find
+their rule series. stats=all adds samples.totalQueryableSamples, as Prometheus does.
+
+Usage: python3 prometheus_stub.py [--port 9090] [--nodes N] [--hours N] [--npz FILE | --dump FILE]
+"""
+import json, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import promql_eval
+from promql_eval import Engine, PromQLError, Storage
+
+class StubPrometheus(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, storage, addr=("127.0.0.1", 0), rules=True):
+        super().__init__(addr, _Handler)
+        self.engine = Engine(storage)
+        self.end_s = max(int(b.ts[-1]) for b in storage.blocks) / 1000 if storage.blocks else time.time()
+        start_s = min(int(b.ts[0]) for b in storage.blocks) / 1000 if storage.blocks else self.end_s
+        if rules:
+            promql_eval.evaluate_rules(self.engine, start_s, self.end_s, 60)
+        self.lock = threading.Lock()
+        self.requests = self.connections = 0
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def setup(self):
+        super().setup()
+        with self.server.lock: self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, code, kind, msg):
+        self._send(code, {"status": "error", "errorType": kind, "error": msg})
+
+    def do_GET(self, form=None):
+        srv = self.server
+        with srv.lock: srv.requests += 1
+        url = urlsplit(self.path)
+        q = {**parse_qs(url.query), **(form or {})}
+        arg = lambda k, d=None: (q.get(k) or [d])[0]
+        try:
+            if url.path == "/api/v1/query":
+                t = float(arg("time", srv.end_s))
+                result, stats = srv.engine.query(arg("query"), t)
+                data = promql_eval.to_api(result, [t], instant=True)
+            elif url.path == "/api/v1/query_range":
+                start, end, step = float(arg("start")), float(arg("end")), _seconds(arg("step"))
+                result, stats = srv.engine.query_range(arg("query"), start, end, step)
+                data = promql_eval.to_api(result, (Engine.steps(start, end, step) / 1000).tolist())
+            elif url.path.startswith("/api/v1/label/") and url.path.endswith("/values"):
+                label = url.path[len("/api/v1/label/"):-len("/values")]
+                values = set()
+                for m in q.get("match[]") or ['{__name__=~".+"}']:
+                    values.update(promql_eval.label_values(srv.engine.storage, m, label))
+                return self._send(200, {"status": "success", "data": sorted(values)})
+            else:
+                return self._error(404, "not_found", f"unknown endpoint {url.path}")
+        except (PromQLError, ValueError, TypeError) as e:
+            return self._error(400, "bad_data", str(e))
+        if arg("stats") == "all":
+            data["stats"] = {"samples": {"totalQueryableSamples": stats.samples}}
+        self._send(200, {"status": "success", "data": data})
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        self.do_GET(parse_qs(self.rfile.read(n).decode()))
+
+def _seconds(step):
+    """Step as seconds: 60, 60.5 or a duration (1m)."""
+    try:
+        return float(step)
+    except ValueError:
+        return promql_eval.duration_seconds(step)
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    if opt("--npz"):
+        storage = Storage.load(opt("--npz"))
+    elif opt("--dump"):
+        import series_data
+        storage = Storage.from_samples(series_data.read_samples(opt("--dump")))
+    else:
+        storage = Storage.synthetic(nodes=int(opt("--nodes", 16)), samples=int(float(opt("--hours", 24)) * 120) + 1)
+    srv = StubPrometheus(storage, ("127.0.0.1", int(opt("--port", 9090))))
+    print(f"Prometheus stand-in listening on {srv.url} — {storage.series} series, {storage.samples} samples")
+    srv.serve_forever()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""PromQL — metric references in the expressions this project emits.
+
+A small lexer, not a full parser: enough to tell which series an expression
+selects, for dashboards (panel targets, template variable queries) and rule files.
+
+    refs('sum by (entity) (increase({__name__=~"gpu[0-9]+_power",entity=~"$node"}[5m]))')
+    → Refs(names=set(), patterns=['gpu[0-9]+_power'])
+
+selectors(expr) keeps each selector's label matchers and range window as well
+(read_load_model.py). Grafana variables inside a __name__ regex ($gpu, ${gpu:pipe})
+match anything.
+"""
+import re
+
+_TOKEN = re.compile(r'''
+    (?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|`[^`]*`)
+  | (?P<var>\$\{[^}]*\}|\$\w+|\[\[\w+\]\])
+  | (?P<duration>(?:\d+(?:ms|[smhdwy]))+)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|0x[0-9a-fA-F]+|Inf\b|NaN\b)
+  | (?P<ident>[A-Za-z_:][A-Za-z0-9_:]*)
+  | (?P<op>=~|!~|!=|==|>=|<=|[-+*/%^<>=(){}\[\],@])
+  | (?P<space>\s+)
+''', re.X)
+
+# Words that never name a metric when they appear bare
+KEYWORDS = {"by", "without", "on", "ignoring", "group_left", "group_right", "bool",
+            "and", "or", "unless", "offset", "atan2"}
+LABEL_LISTS = {"by", "without", "on", "ignoring", "group_left", "group_right"}
+AGGREGATIONS = {"sum", "avg", "min", "max", "count", "group", "stddev", "stdvar", "topk",
+                "bottomk", "quantile", "count_values", "limitk", "limit_ratio"}
+_GRAFANA_VAR = re.compile(r'\$\{[^}]*\}|\$\w+|\[\[\w+\]\]')
+
+class Refs:
+    """Metric names an expression selects, and __name__ regexes it matches with."""
+    __slots__ = ("names", "patterns")
+
+    def __init__(self, names=None, patterns=None):
+        self.names = set(names or ()); self.patterns = list(patterns or [])
+
+    def update(self, other):
+        self.names |= other.names
+        self.patterns += [p for p in other.patterns if p not in self.patterns]
+        return self
+
+    def matches(self, name):
+        return name in self.names or any(re.fullmatch(p, name) for p in self.patterns)
+
+    def __repr__(self):
+        return f"Refs(names={sorted(self.names)}, patterns={self.patterns})"
+
+def tokens(expr):
+    pos = 0
+    while pos < len(expr):
+        m = _TOKEN.match(expr, pos)
+        if not m:
+            raise ValueError(f"Cannot tokenize PromQL at {pos}: {expr[pos:pos + 20]!r}")
+        pos = m.end()
+        if m.lastgroup != "space":
+            yield m.lastgroup, m.group()
+
+def _unquote(s):
+    if s[0] == "`": return s[1:-1]
+    return re.sub(r'\\(.)', r'\1', s[1:-1])
+
+def name_pattern(regex):
+    """__name__ regex with Grafana variables widened to match anything."""
+    return _GRAFANA_VAR.sub(".*", regex)
+
+class Selector:
+    """One vector selector: the names / patterns it selects, its label matchers
+    [(label, op, value)] other than __name__, and its range in seconds (None: instant)."""
+    __slots__ = ("refs", "matchers", "window")
+
+    def __init__(self, refs, matchers, window=None):
+        self.refs = refs; self.matchers = matchers; self.window = window
+
+    def __repr__(self):
+        rng = f"[{self.window:g}s]" if self.window is not None else ""
+        return f"Selector({self.refs!r}, {self.matchers}{rng})"
+
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800, "y": 31536000}
+
+def duration_seconds(text):
+    """Seconds in a PromQL duration: 5m, 1h30m, 250ms."""
+    return sum(int(n) * _UNITS[u] for n, u in re.findall(r'(\d+)(ms|[smhdwy])', text))
+
+def selectors(expr):
+    """Selectors of one PromQL expression, in order."""
+    toks = list(tokens(expr))
+    out = []
+    i, depth_brackets = 0, 0
+    while i < len(toks):
+        kind, val = toks[i]
+        nxt = toks[i + 1][1] if i + 1 < len(toks) else None
+        sel = None
+        if val == "[": depth_brackets += 1
+        elif val == "]": depth_brackets -= 1
+        elif depth_brackets:
+            pass                                  # range / subquery durations
+        elif kind == "ident" and val in LABEL_LISTS and nxt == "(":
+            while toks[i][1] != ")": i += 1       # skip the label list
+        elif kind == "ident" and (nxt == "(" or val in AGGREGATIONS and nxt in ("by", "without")):
+            pass                                  # function / aggregation
+        elif kind == "ident" and val not in KEYWORDS:
+            sel = Selector(Refs([val]), [])
+            if nxt == "{": i += 1
+        elif val == "{":
+            sel = Selector(Refs(), [])
+        if sel is not None:
+            if toks[i][1] == "{":
+                j = i + 1
+                while j < len(toks) and toks[j][1] != "}":
+                    label, op, value = toks[j][1], toks[j + 1][1], _unquote(toks[j + 2][1])
+                    if label != "__name__": sel.matchers.append((label, op, value))
+                    elif op == "=": sel.refs.names.add(value)
+                    elif op == "=~": sel.refs.patterns.append(name_pattern(value))
+                    j += 3
+                    if j < len(toks) and toks[j][1] == ",": j += 1
+                i = j
+            if i + 2 < len(toks) and toks[i + 1][1] == "[" and toks[i + 2][0] == "duration":
+                sel.window = duration_seconds(toks[i + 2][1])
+            out.append(sel)
+        i += 1
+    return out
+
+def refs(expr):
+    """Refs of one PromQL expression (or a Grafana label_values(...) query)."""
+    out = Refs()
+    for sel in selectors(expr): out.update(sel.refs)
+    return out
+
+_LABEL_VALUES = re.compile(r'^\s*label_values\((.*),\s*\w+\s*\)\s*$', re.S)
+
+def query_refs(query):
+    """Refs of a Grafana variable query: label_values(selector, label) or PromQL."""
+    if re.match(r'^\s*label_values\(\s*\w+\s*\)\s*$', query):
+        return Refs()                               # label_values(label): no metric
+    m = _LABEL_VALUES.match(query)
+    return refs(m.group(1) if m else query)
+
+def query_selectors(query):
+    """Selectors of a Grafana variable query, as query_refs."""
+    if re.match(r'^\s*label_values\(\s*\w+\s*\)\s*$', query):
+        return []
+    m = _LABEL_VALUES.match(query)
+    return selectors(m.group(1) if m else query)
@@ -0,0 +1,727 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Offline PromQL Evaluator (NumPy).
+
+Evaluates the PromQL the builders and recording rules emit, without a Mimir:
+
+    selectors      metric{label=~"re",…}, {__name__=~"gpu[0-9]+_power",…}, [5m] ranges
+    aggregations   sum / avg / count / max / min / group, by (…) / without (…)
+    binary ops     + - * / % ^, comparisons (filters, or with bool), and / or / unless —
+                   one-to-one matching on all labels but __name__
+    functions      label_replace, clamp_min, clamp_max, vector, sort_desc, abs,
+                   rate, increase, avg/sum/min/max/count_over_time
+
+Operations that drop __name__ fail, as in Prometheus, when two results then share a
+labelset at one step (a __name__ regex over gpu0_x .. gpuN_x needs the index
+copied into a label first).
+
+Every node evaluates over all steps at once: a series set is a label list plus a
+float64 matrix [series, steps] with NaN for "no sample". Storage groups series that
+share timestamps into blocks, so selecting N series at S steps is one searchsorted
+and one fancy index per block. Series come from memory (Storage.add, synthetic data
+from series_data.synthetic_block) or disk (a promtool dump / OpenMetrics text via
+--dump, or a Storage.save .npz via --npz).
+
+    engine = Engine(Storage.synthetic(nodes=64))
+    result, stats = engine.query_range('sum by (entity) (gpu_power_usage)', start, end, 60)
+
+--dashboards evaluates every recording rule (recorded back into storage, in file
+order) and then every target of the generated dashboards with Grafana's default
+variable selection and step, timing each.
+
+Usage: python3 promql_eval.py [EXPR] [--range 6h] [--step 60] [--instant]
+                          [--dump FILE | --npz FILE] [--nodes N] [--hours N] [--save FILE]
+                          [--dashboards] [--top N]
+"""
+import json, math, os, re, sys, time
+
+try:
+    import numpy as np
+except ImportError:   # only the evaluator needs it
+    raise ImportError("promql_eval.py needs NumPy (pip install numpy)")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import series_data
+from promql import AGGREGATIONS, duration_seconds, tokens, _unquote
+
+LOOKBACK_MS = 300_000   # instant selectors take the newest sample at most this old
+
+class PromQLError(ValueError):
+    pass
+
+# ── Parser ──
+# AST: ("num", v) ("str", s) ("sel", matchers, window_ms or None) ("agg", op, by, without, expr)
+#      ("call", name, args) ("bin", op, lhs, rhs, bool) ("neg", expr)
+
+EVAL_AGGREGATIONS = {"sum", "avg", "count", "max", "min", "group"}
+COMPARISONS = {"==", "!=", ">", "<", ">=", "<="}
+_PRECEDENCE = [{"or"}, {"and", "unless"}, COMPARISONS, {"+", "-"}, {"*", "/", "%"}]
+
+class _Parser:
+    def __init__(self, expr):
+        self.toks = list(tokens(expr)); self.i = 0; self.expr = expr
+
+    def peek(self, k=0):
+        return self.toks[self.i + k] if self.i + k < len(self.toks) else (None, None)
+
+    def next(self):
+        t = self.peek(); self.i += 1
+        return t
+
+    def expect(self, val):
+        kind, v = self.next()
+        if v != val:
+            raise PromQLError(f"Expected {val!r}, got {v!r} in {self.expr[:80]!r}")
+
+    def parse(self):
+        node = self.binary(0)
+        if self.i != len(self.toks):
+            raise PromQLError(f"Unexpected {self.peek()[1]!r} in {self.expr[:80]!r}")
+        return node
+
+    def binary(self, level):
+        if level == len(_PRECEDENCE):
+            return self.unary()
+        lhs = self.binary(level + 1)
+        while self.peek()[1] in _PRECEDENCE[level]:
+            op = self.next()[1]
+            bool_mod = self.peek()[1] == "bool" and bool(self.next())
+            if self.peek()[1] in ("on", "ignoring", "group_left", "group_right"):
+                raise PromQLError(f"Vector matching modifiers are not supported: {self.expr[:80]!r}")
+            lhs = ("bin", op, lhs, self.binary(level + 1), bool_mod)
+        return lhs
+
+    def unary(self):
+        if self.peek()[1] in ("-", "+"):
+            sign = self.next()[1]
+            operand = self.unary()
+            return ("neg", operand) if sign == "-" else operand
+        node = self.primary()
+        if self.peek()[1] == "^":
+            self.next()
+            node = ("bin", "^", node, self.unary(), False)
+        return node
+
+    def primary(self):
+        kind, val = self.next()
+        if val == "(":
+            node = self.binary(0); self.expect(")")
+            return node
+        if kind == "number":
+            return ("num", float(val) if not val.startswith("0x") else float(int(val, 16)))
+        if kind == "string":
+            return ("str", _unquote(val))
+        if val == "{":
+            self.i -= 1
+            return self.selector(None)
+        if kind == "ident":
+            if val in EVAL_AGGREGATIONS and self.peek()[1] in ("(", "by", "without"):
+                return self.aggregation(val)
+            if val in AGGREGATIONS and self.peek()[1] in ("(", "by", "without"):
+                raise PromQLError(f"Aggregation {val!r} is not supported")
+            if self.peek()[1] == "(":
+                self.next(); args = []
+                while self.peek()[1] != ")":
+                    args.append(self.binary(0))
+                    if self.peek()[1] == ",": self.next()
+                self.expect(")")
+                return ("call", val, args)
+            return self.selector(val)
+        raise PromQLError(f"Unexpected {val!r} in {self.expr[:80]!r}")
+
+    def labels(self):
+        self.expect("("); out = []
+        while self.peek()[1] != ")":
+            out.append(self.next()[1])
+            if self.peek()[1] == ",": self.next()
+        self.expect(")")
+        return out
+
+    def aggregation(self, op):
+        by = without = None
+        if self.peek()[1] in ("by", "without"):
+            mod = self.next()[1]
+            by, without = (self.labels(), None) if mod == "by" else (None, self.labels())
+        self.expect("("); expr = self.binary(0); self.expect(")")
+        if self.peek()[1] in ("by", "without"):
+            mod = self.next()[1]
+            by, without = (self.labels(), None) if mod == "by" else (None, self.labels())
+        return ("agg", op, by, without, expr)
+
+    def selector(self, name):
+        matchers = [("__name__", "=", name)] if name else []
+        if self.peek()[1] == "{":
+            self.next()
+            while self.peek()[1] != "}":
+                label = self.next()[1]; op = self.next()[1]; value = _unquote(self.next()[1])
+                matchers.append((label, op, value))
+                if self.peek()[1] == ",": self.next()
+            self.expect("}")
+        window = None
+        if self.peek()[1] == "[":
+            self.next(); kind, d = self.next()
+            if kind != "duration" or self.peek()[1] != "]":
+                raise PromQLError(f"Subqueries are not supported: {self.expr[:80]!r}")
+            self.expect("]"); window = int(duration_seconds(d) * 1000)
+        if self.peek()[1] == "offset":
+            raise PromQLError(f"offset is not supported: {self.expr[:80]!r}")
+        return ("sel", matchers, window)
+
+def parse(expr):
+    return _Parser(expr).parse()
+
+# ── Storage ──
+
+class Block:
+    """Series sharing one timestamp grid: label dicts, int64 ms timestamps, values [series, samples]."""
+    __slots__ = ("labels", "ts", "values")
+
+    def __init__(self, labels, ts, values):
+        self.labels = labels; self.ts = ts; self.values = values
+
+class Storage:
+    """Blocks plus a __name__ → [(block, row)] index."""
+
+    def __init__(self):
+        self.blocks = []; self.index = {}
+
+    def add(self, labels, ts, values):
+        """Add series (label dicts with __name__) sharing timestamps `ts`."""
+        b = len(self.blocks)
+        self.blocks.append(Block(list(labels), np.asarray(ts, dtype=np.int64),
+                                 np.asarray(values, dtype=np.float64).reshape(len(labels), -1)))
+        for row, l in enumerate(labels):
+            self.index.setdefault(l["__name__"], []).append((b, row))
+        return self
+
+    @property
+    def series(self):
+        return sum(len(b.labels) for b in self.blocks)
+
+    @property
+    def samples(self):
+        return sum(b.values.size for b in self.blocks)
+
+    @classmethod
+    def from_samples(cls, samples):
+        """From (name, labels, ts_ms, value) samples — series with identical timestamps share a block."""
+        series = {}
+        for name, labels, ts, value in samples:
+            s = series.setdefault((name, labels), ([], []))
+            s[0].append(ts); s[1].append(value)
+        groups = {}
+        for (name, labels), (ts, vals) in series.items():
+            key = tuple(ts)
+            groups.setdefault(key, ([], []))
+            groups[key][0].append({"__name__": name, **series_data.parse_labels(labels)})
+            groups[key][1].append(vals)
+        st = cls()
+        for ts, (labels, vals) in groups.items():
+            order = np.argsort(ts, kind="stable")
+            st.add(labels, np.asarray(ts)[order], np.asarray(vals)[:, order])
+        return st
+
+    @classmethod
+    def synthetic(cls, metrics=None, nodes=16, samples=720, step_s=30, seed=0, end_ms=None, profile=None):
+        """series_data.synthetic_block of the inventory, ending at end_ms (default: now)."""
+        import metrics_inventory
+        metrics = metrics or [m.name for m in metrics_inventory.load()]
+        end_ms = end_ms if end_ms is not None else int(time.time() * 1000) // (step_s * 1000) * step_s * 1000
+        start_ms = end_ms - (samples - 1) * step_s * 1000
+        kw = {"profile": profile} if profile else {}
+        return cls().add(*series_data.synthetic_block(metrics, nodes, samples, step_s, seed, start_ms, **kw))
+
+    def save(self, path):
+        arrays = {}
+        for i, b in enumerate(self.blocks):
+            arrays[f"labels_{i}"] = np.array(json.dumps(b.labels))
+            arrays[f"ts_{i}"] = b.ts; arrays[f"values_{i}"] = b.values
+        np.savez_compressed(path, blocks=len(self.blocks), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        st = cls()
+        with np.load(path) as f:
+            for i in range(int(f["blocks"])):
+                st.add(json.loads(str(f[f"labels_{i}"])), f[f"ts_{i}"], f[f"values_{i}"])
+        return st
+
+    def select(self, matchers):
+        """{block: [rows]} of series matching every matcher."""
+        name_eq = [v for l, op, v in matchers if l == "__name__" and op == "="]
+        names = name_eq[:1] if name_eq else list(self.index)
+        compiled = [(l, op, v if op in ("=", "!=") else re.compile(v)) for l, op, v in matchers]
+        out = {}
+        for name in names:
+            for b, row in self.index.get(name, ()):
+                labels = self.blocks[b].labels[row]
+                if all(_match(labels.get(l, ""), op, v) for l, op, v in compiled):
+                    out.setdefault(b, []).append(row)
+        return out
+
+def _match(actual, op, value):
+    if op == "=": return actual == value
+    if op == "!=": return actual != value
+    hit = value.fullmatch(actual) is not None
+    return hit if op == "=~" else not hit
+
+# ── Values ──
+
+class Vector:
+    """Label dicts and values [series, steps]; NaN = no sample at that step."""
+    __slots__ = ("labels", "values")
+
+    def __init__(self, labels, values):
+        self.labels = labels; self.values = values
+
+class Scalar:
+    __slots__ = ("values",)
+
+    def __init__(self, values):
+        self.values = values
+
+class Stats:
+    __slots__ = ("series", "samples")
+
+    def __init__(self):
+        self.series = 0; self.samples = 0
+
+def _drop_name(labels):
+    return [{k: v for k, v in l.items() if k != "__name__"} for l in labels]
+
+def _unique(v):
+    """v, unless two of its series share a labelset at the same step: Prometheus rejects
+    that ("vector cannot contain metrics with the same labelset"), e.g. gpu0_x and gpu1_x
+    of one node once an operation drops __name__."""
+    seen = {}
+    for i, l in enumerate(v.labels):
+        sig = tuple(sorted(l.items()))
+        p = ~np.isnan(v.values[i])
+        if sig in seen:
+            if (seen[sig] & p).any():
+                raise PromQLError(f"vector cannot contain metrics with the same labelset {dict(sig)}")
+            p |= seen[sig]
+        seen[sig] = p
+    return v
+
+def _signature(l):
+    return tuple(sorted((k, v) for k, v in l.items() if k != "__name__"))
+
+# ── Engine ──
+
+class Engine:
+    def __init__(self, storage, lookback_ms=LOOKBACK_MS):
+        self.storage = storage; self.lookback_ms = lookback_ms
+
+    @staticmethod
+    def steps(start_s, end_s, step_s):
+        """Evaluation timestamps (int64 ms) of a range query."""
+        return np.arange(int(start_s * 1000), int(end_s * 1000) + 1, int(step_s * 1000), dtype=np.int64)
+
+    def query_range(self, expr, start_s, end_s, step_s):
+        return self._run(expr, self.steps(start_s, end_s, step_s))
+
+    def query(self, expr, time_s):
+        return self._run(expr, np.array([int(time_s * 1000)], dtype=np.int64))
+
+    def _run(self, expr, steps):
+        stats = Stats()
+        ast = parse(expr) if isinstance(expr, str) else expr
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = self.eval(ast, steps, stats)
+        if isinstance(result, str):
+            raise PromQLError("A string is not a query result")
+        return result, stats
+
+    def eval(self, node, steps, stats):
+        kind = node[0]
+        if kind == "num":
+            return Scalar(np.full(len(steps), node[1]))
+        if kind == "str":
+            return node[1]
+        if kind == "sel":
+            if node[2] is not None:
+                raise PromQLError("Range selectors are only valid inside a *_over_time / rate function")
+            return self.instant(node[1], steps, stats)
+        if kind == "neg":
+            v = self.eval(node[1], steps, stats)
+            return Scalar(-v.values) if isinstance(v, Scalar) else _unique(Vector(_drop_name(v.labels), -v.values))
+        if kind == "agg":
+            return self.aggregate(node[1], node[2], node[3], self.eval(node[4], steps, stats))
+        if kind == "bin":
+            return self.binary(node[1], self.eval(node[2], steps, stats), self.eval(node[3], steps, stats), node[4])
+        if kind == "call":
+            return self.call(node[1], node[2], steps, stats)
+        raise PromQLError(f"Unknown node {kind}")
+
+    # ── Selectors ──
+
+    def instant(self, matchers, steps, stats):
+        labels, parts = [], []
+        for b, rows in self.storage.select(matchers).items():
+            block = self.storage.blocks[b]
+            idx = np.searchsorted(block.ts, steps, side="right") - 1
+            ok = idx >= 0
+            idx = idx.clip(0)
+            ok &= block.ts[idx] > steps - self.lookback_ms
+            vals = block.values[np.ix_(rows, idx)]
+            vals[:, ~ok] = np.nan
+            labels += [block.labels[r] for r in rows]; parts.append(vals)
+            lo, hi = np.searchsorted(block.ts, [steps[0] - self.lookback_ms, steps[-1]], side="right")
+            stats.series += len(rows); stats.samples += len(rows) * int(hi - lo)
+        return Vector(labels, np.vstack(parts) if parts else np.empty((0, len(steps))))
+
+    def windows(self, matchers, window_ms, steps, stats):
+        """[(block, rows, first index, end index)] of each step's (t - window, t] samples."""
+        out = []
+        for b, rows in self.storage.select(matchers).items():
+            block = self.storage.blocks[b]
+            lo = np.searchsorted(block.ts, steps - window_ms, side="right")
+            hi = np.searchsorted(block.ts, steps, side="right")
+            out.append((block, rows, lo, hi))
+            a, z = np.searchsorted(block.ts, [steps[0] - window_ms, steps[-1]], side="right")
+            stats.series += len(rows); stats.samples += len(rows) * int(z - a)
+        return out
+
+    # ── Functions ──
+
+    def call(self, name, args, steps, stats):
+        if name in ("rate", "increase") or name.endswith("_over_time"):
+            if len(args) != 1 or args[0][0] != "sel" or args[0][2] is None:
+                raise PromQLError(f"{name}() takes one range selector")
+            return self.range_function(name, args[0][1], args[0][2], steps, stats)
+        vals = [self.eval(a, steps, stats) for a in args]
+        if name == "vector":
+            return Vector([{}], vals[0].values[None, :].copy())
+        if name in ("clamp_min", "clamp_max"):
+            v, bound = vals
+            fn = np.fmax if name == "clamp_min" else np.fmin
+            out = np.where(np.isnan(v.values), np.nan, fn(v.values, bound.values[None, :]))
+            return _unique(Vector(_drop_name(v.labels), out))
+        if name == "abs":
+            return _unique(Vector(_drop_name(vals[0].labels), np.abs(vals[0].values)))
+        if name == "sort_desc":
+            v = vals[0]
+            order = np.argsort(-np.nan_to_num(v.values[:, -1], nan=-np.inf), kind="stable") if len(v.labels) else []
+            return Vector([v.labels[i] for i in order], v.values[order] if len(v.labels) else v.values)
+        if name == "label_replace":
+            v, dst, repl, src, regex = vals
+            pattern = re.compile(regex)
+            template = re.sub(r'\$\{?(\w+)\}?', r'\\g<\1>', repl)
+            labels = []
+            for l in v.labels:
+                m = pattern.fullmatch(l.get(src, ""))
+                if m:
+                    l = dict(l); new = m.expand(template)
+                    if new: l[dst] = new
+                    else: l.pop(dst, None)
+                labels.append(l)
+            return _unique(Vector(labels, v.values))
+        raise PromQLError(f"Function {name}() is not supported")
+
+    def range_function(self, name, matchers, window_ms, steps, stats):
+        labels, parts = [], []
+        for block, rows, lo, hi in self.windows(matchers, window_ms, steps, stats):
+            vals = block.values[rows]
+            count = (hi - lo)[None, :].repeat(len(rows), 0)
+            if name in ("avg_over_time", "sum_over_time", "count_over_time"):
+                cs = np.concatenate([np.zeros((len(rows), 1)), np.cumsum(vals, axis=1)], axis=1)
+                total = cs[:, hi] - cs[:, lo]
+                out = {"avg_over_time": total / np.where(count, count, np.nan),
+                       "sum_over_time": total, "count_over_time": count.astype(float)}[name]
+                out = np.where(count > 0, out, np.nan)
+            elif name in ("max_over_time", "min_over_time"):
+                fn = np.max if name == "max_over_time" else np.min
+                out = np.full((len(rows), len(steps)), np.nan)
+                for j, (a, z) in enumerate(zip(lo, hi)):
+                    if z > a: out[:, j] = fn(vals[:, a:z], axis=1)
+            elif name in ("rate", "increase"):
+                out = self.extrapolated(block.ts, vals, lo, hi, steps, window_ms, name == "rate")
+            else:
+                raise PromQLError(f"Function {name}() is not supported")
+            labels += _drop_name([block.labels[r] for r in rows]); parts.append(out)
+        return _unique(Vector(labels, np.vstack(parts) if parts else np.empty((0, len(steps)))))
+
+    @staticmethod
+    def extrapolated(ts, vals, lo, hi, steps, window_ms, is_rate):
+        """Prometheus' extrapolated counter increase / rate over (t - window, t]."""
+        drops = np.where(np.diff(vals, axis=1) < 0, vals[:, :-1], 0.0)
+        adj = vals + np.concatenate([np.zeros((len(vals), 1)), np.cumsum(drops, axis=1)], axis=1)
+        ok = (hi - lo) >= 2
+        first, last = lo.clip(0, len(ts) - 1), (hi - 1).clip(0, len(ts) - 1)
+        delta = adj[:, last] - adj[:, first]
+        t0, t1 = ts[first] / 1000, ts[last] / 1000
+        sampled = t1 - t0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_gap = sampled / np.maximum(hi - lo - 1, 1)
+            to_start = t0 - (steps - window_ms) / 1000
+            to_end = steps / 1000 - t1
+            to_zero = np.where((delta > 0) & (vals[:, first] >= 0), sampled * vals[:, first] / delta, np.inf)
+            to_start = np.minimum(to_start, to_zero)
+            threshold = avg_gap * 1.1
+            interval = sampled + np.where(to_start < threshold, to_start, avg_gap / 2) \
+                               + np.where(to_end < threshold, to_end, avg_gap / 2)
+            out = delta * interval / np.where(sampled > 0, sampled, np.nan)
+            if is_rate: out = out / (window_ms / 1000)
+        return np.where(ok[None, :], out, np.nan)
+
+    # ── Aggregation ──
+
+    def aggregate(self, op, by, without, v):
+        if isinstance(v, Scalar):
+            raise PromQLError(f"{op}() needs a vector")
+        keys, gid = {}, []
+        for l in v.labels:
+            if without is None:
+                k = tuple((n, l[n]) for n in sorted(by or ()) if l.get(n, ""))
+            else:
+                drop = set(without) | {"__name__"}
+                k = tuple(sorted((n, x) for n, x in l.items() if n not in drop))
+            gid.append(keys.setdefault(k, len(keys)))
+        if not keys:
+            return Vector([], np.empty((0, v.values.shape[1])))
+        gid = np.array(gid)
+        order = np.argsort(gid, kind="stable")
+        vals = v.values[order]
+        starts = np.flatnonzero(np.r_[True, np.diff(gid[order]) != 0])
+        present = ~np.isnan(vals)
+        count = np.add.reduceat(present, starts, axis=0)
+        total = np.add.reduceat(np.where(present, vals, 0.0), starts, axis=0)
+        if op == "sum": out = total
+        elif op == "avg": out = total / np.where(count, count, np.nan)
+        elif op == "count": out = count.astype(float)
+        elif op == "group": out = np.ones_like(total)
+        elif op == "max": out = np.fmax.reduceat(vals, starts, axis=0)
+        else: out = np.fmin.reduceat(vals, starts, axis=0)
+        out = np.where(count > 0, out, np.nan)
+        labels = [dict(k) for k in keys]
+        return Vector(labels, out)
+
+    # ── Binary operators ──
+
+    def binary(self, op, lhs, rhs, bool_mod):
+        if op in ("and", "or", "unless"):
+            if not isinstance(lhs, Vector) or not isinstance(rhs, Vector):
+                raise PromQLError(f"{op} needs vectors on both sides")
+            return self.set_op(op, lhs, rhs)
+        if isinstance(lhs, Scalar) and isinstance(rhs, Scalar):
+            out = _apply(op, lhs.values, rhs.values)
+            if op in COMPARISONS and not bool_mod:
+                raise PromQLError("Comparisons between scalars need bool")
+            return Scalar(out.astype(float))
+        if isinstance(lhs, Vector) and isinstance(rhs, Vector):
+            right = {}
+            for j, l in enumerate(rhs.labels):
+                sig = _signature(l)
+                if sig in right:
+                    raise PromQLError("Many-to-many matching: duplicate series on the right-hand side")
+                right[sig] = j
+            pairs = [(i, right[_signature(l)]) for i, l in enumerate(lhs.labels) if _signature(l) in right]
+            li = np.array([p[0] for p in pairs], dtype=int); ri = np.array([p[1] for p in pairs], dtype=int)
+            a = lhs.values[li] if len(pairs) else np.empty((0, lhs.values.shape[1]))
+            b = rhs.values[ri] if len(pairs) else np.empty((0, lhs.values.shape[1]))
+            labels = [lhs.labels[i] for i in li]
+        else:
+            vec, sc = (lhs, rhs) if isinstance(lhs, Vector) else (rhs, lhs)
+            a, b = (vec.values, sc.values[None, :]) if vec is lhs else (sc.values[None, :], vec.values)
+            labels = vec.labels
+        out = _apply(op, a, b)
+        if op in COMPARISONS:
+            if bool_mod:
+                return _unique(Vector(_drop_name(labels), np.where(np.isnan(a) | np.isnan(b), np.nan, out.astype(float))))
+            kept = a if isinstance(lhs, Vector) else b
+            return Vector(labels, np.where(out, kept, np.nan))
+        return _unique(Vector(_drop_name(labels), out))
+
+    def set_op(self, op, lhs, rhs):
+        steps = lhs.values.shape[1] if lhs.labels else rhs.values.shape[1]
+        def presence(v):
+            out = {}
+            for i, l in enumerate(v.labels):
+                sig = _signature(l)
+                p = ~np.isnan(v.values[i])
+                out[sig] = out[sig] | p if sig in out else p
+            return out
+        right = presence(rhs)
+        if op in ("and", "unless"):
+            vals = lhs.values.copy()
+            for i, l in enumerate(lhs.labels):
+                p = right.get(_signature(l), np.zeros(steps, bool))
+                vals[i, ~p if op == "and" else p] = np.nan
+            return Vector(lhs.labels, vals)
+        left = presence(lhs)
+        labels, parts = list(lhs.labels), [lhs.values]
+        for i, l in enumerate(rhs.labels):
+            p = left.get(_signature(l))
+            row = rhs.values[i].copy()
+            if p is not None: row[p] = np.nan
+            labels.append(l); parts.append(row[None, :])
+        return Vector(labels, np.vstack(parts) if parts else np.empty((0, steps)))
+
+def _apply(op, a, b):
+    if op == "+": return a + b
+    if op == "-": return a - b
+    if op == "*": return a * b
+    if op == "/": return a / b
+    if op == "%": return np.fmod(a, b)
+    if op == "^": return np.power(a, b)
+    if op == "==": return a == b
+    if op == "!=": return a != b
+    if op == ">": return a > b
+    if op == "<": return a < b
+    if op == ">=": return a >= b
+    if op == "<=": return a <= b
+    raise PromQLError(f"Operator {op} is not supported")
+
+# ── Results ──
+
+def present(result):
+    """Series of a result with at least one sample."""
+    if isinstance(result, Scalar): return 1
+    return int((~np.isnan(result.values)).any(axis=1).sum())
+
+def to_api(result, steps_s, instant=False):
+    """Prometheus HTTP API `data` for a result evaluated at steps_s (seconds)."""
+    if isinstance(result, Scalar):
+        return {"resultType": "scalar", "result": [steps_s[-1], _fmt(result.values[-1])]}
+    out, steps = [], np.asarray(steps_s, dtype=np.float64)
+    for l, row in zip(result.labels, result.values):
+        ok = ~np.isnan(row)
+        if not ok.any(): continue
+        if instant:
+            out.append({"metric": l, "value": [steps_s[-1], _fmt(row[-1])]})
+        else:
+            vals = row[ok].tolist()
+            text = map(_fmt, vals) if np.isinf(row[ok]).any() else map("{:.15g}".format, vals)
+            out.append({"metric": l, "values": list(map(list, zip(steps[ok].tolist(), text)))})
+    return {"resultType": "vector" if instant else "matrix", "result": out}
+
+def _fmt(v):
+    if math.isinf(v): return "+Inf" if v > 0 else "-Inf"
+    return f"{v:.15g}"
+
+def label_values(storage, selector_expr, label):
+    """Grafana label_values(selector, label) against storage."""
+    node = parse(selector_expr)
+    if node[0] != "sel": raise PromQLError("label_values needs a selector")
+    values = set()
+    for b, rows in storage.select(node[1]).items():
+        values.update(storage.blocks[b].labels[r].get(label, "") for r in rows)
+    values.discard("")
+    return sorted(values)
+
+# ── Rules and dashboards ──
+
+def evaluate_rules(engine, start_s, end_s, step_s):
+    """Evaluate every recording rule in file order, recording outputs back into storage.
+    Returns [(file, record, ms, series, error)]."""
+    import recording_rules
+    steps = Engine.steps(start_s, end_s, step_s)
+    out = []
+    for filename, groups_fn in recording_rules.RULE_FILES.items():
+        for g in groups_fn():
+            for r in g["rules"]:
+                t0 = time.perf_counter()
+                try:
+                    result, _ = engine._run(r["expr"], steps)
+                    if isinstance(result, Scalar):
+                        result = Vector([{}], result.values[None, :])
+                    labels = [{**l, **r.get("labels", {}), "__name__": r["record"]} for l in _drop_name(result.labels)]
+                    if labels: engine.storage.add(labels, steps, result.values)
+                    out.append((filename, r["record"], (time.perf_counter() - t0) * 1000, present(result), None))
+                except PromQLError as e:
+                    out.append((filename, r["record"], (time.perf_counter() - t0) * 1000, 0, str(e)))
+    return out
+
+def evaluate_dashboards(engine, dashboards, end_s, interval_s=30, overrides=None):
+    """Every target of every dashboard (collapsed rows included) with its default variables.
+    Returns [(dashboard, panel, ref, ms, series, error)]."""
+    from cardinality import variable_values, resolve, _panels
+    from read_load_model import is_instant, panel_step, time_range_seconds
+    out = []
+    for did, d in sorted(dashboards.items()):
+        values = variable_values(d, overrides)
+        range_s = time_range_seconds(d["time"]["from"])
+        for p in _panels(d["panels"]):
+            if not p.get("targets"): continue
+            step_s = panel_step(p, range_s, interval_s)
+            for t in p["targets"]:
+                expr = resolve(t["expr"], values)
+                t0 = time.perf_counter()
+                try:
+                    if is_instant(t):
+                        result, _ = engine.query(expr, end_s)
+                    else:
+                        result, _ = engine.query_range(expr, end_s - range_s, end_s, step_s)
+                    out.append((did, p.get("title", ""), t.get("refId", ""),
+                                (time.perf_counter() - t0) * 1000, present(result), None))
+                except PromQLError as e:
+                    out.append((did, p.get("title", ""), t.get("refId", ""),
+                                (time.perf_counter() - t0) * 1000, 0, str(e)))
+    return out
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    valued = {"--range", "--step", "--dump", "--npz", "--nodes", "--hours", "--save", "--top"}
+    positional = [a for i, a in enumerate(sys.argv[1:], 1)
+                  if not a.startswith("--") and sys.argv[i - 1] not in valued]
+    interval_s = 30
+    t0 = time.perf_counter()
+    if opt("--npz"):
+        storage, source = Storage.load(opt("--npz")), opt("--npz")
+    elif opt("--dump"):
+        storage, source = Storage.from_samples(series_data.read_samples(opt("--dump"))), opt("--dump")
+    else:
+        nodes, hours = int(opt("--nodes", 16)), float(opt("--hours", 24))
+        storage = Storage.synthetic(nodes=nodes, samples=int(hours * 3600 / interval_s) + 1, step_s=interval_s)
+        source = f"synthetic {nodes} nodes × {hours:g}h"
+    end_s = max(int(b.ts[-1]) for b in storage.blocks) / 1000 if storage.blocks else time.time()
+    print(f"Storage: {source} — {storage.series} series, {storage.samples} samples "
+          f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    if opt("--save"):
+        storage.save(opt("--save")); print(f"  ✅ {opt('--save')}")
+    engine = Engine(storage)
+
+    if positional:
+        expr = positional[0]
+        t0 = time.perf_counter()
+        if "--instant" in sys.argv:
+            result, stats = engine.query(expr, end_s); steps_s = [end_s]
+        else:
+            range_s, step_s = duration_seconds(opt("--range", "1h")), float(opt("--step", 60))
+            result, stats = engine.query_range(expr, end_s - range_s, end_s, step_s)
+            steps_s = (engine.steps(end_s - range_s, end_s, step_s) / 1000).tolist()
+        ms = (time.perf_counter() - t0) * 1000
+        data = to_api(result, steps_s, "--instant" in sys.argv)
+        print(json.dumps(data)[:4000])
+        print(f"{present(result)} series in {ms:.1f} ms — {stats.series} series / {stats.samples} samples read")
+        sys.exit(0)
+
+    if "--dashboards" in sys.argv:
+        from read_load_model import load_dashboards
+        top = int(opt("--top", 10))
+        rules = evaluate_rules(engine, end_s - 6 * 3600, end_s, 60)
+        errors = [r for r in rules if r[4]]
+        print(f"\nRecording rules: {len(rules)} in {sum(r[2] for r in rules):.0f} ms "
+              f"({sum(1 for r in rules if r[3])} with output, {len(errors)} errors)")
+        for f, rec, ms, n, err in errors: print(f"  ❌ {rec}: {err}")
+        targets = evaluate_dashboards(engine, load_dashboards(), end_s, interval_s)
+        print(f"\n{'Dashboard':<12}{'Targets':>9}{'Empty':>8}{'Errors':>8}{'Total ms':>10}{'p50 ms':>9}{'Max ms':>9}")
+        for did in sorted({t[0] for t in targets}):
+            ts = [t for t in targets if t[0] == did]
+            ms = sorted(t[3] for t in ts)
+            print(f"{did:<12}{len(ts):>9}{sum(1 for t in ts if not t[4] and not t[5]):>8}"
+                  f"{sum(1 for t in ts if t[5]):>8}{sum(ms):>10.0f}{ms[len(ms) // 2]:>9.1f}{ms[-1]:>9.1f}")
+        print(f"\nSlowest {top} targets")
+        for did, title, ref, ms, n, err in sorted(targets, key=lambda t: -t[3])[:top]:
+            print(f"  {did} {title[:50]:<50} {ref:<2} {ms:>8.1f} ms  {n} series")
+        for did, title, ref, ms, n, err in targets:
+            if err: print(f"  ❌ {did} {title} {ref}: {err}")
+        sys.exit(1 if errors or any(t[5] for t in targets) else 0)
+    print(__doc__.split("Usage:")[1].strip())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Read-Path Load Model.
+
+What always-open dashboards (NOC wall screens, on-call laptops) cost Mimir's read
+path. Reads the generated dashboards (dashboards/*.json) and a viewer profile:
+
+    {"defaults": {"screen_width_px": 1920},
+     "viewers": [{"name": "NOC wall", "dashboard": "00", "screens": 4},
+                 {"name": "on-call", "dashboard": "07", "screens": 3, "time_range": "3h",
+                  "nodes": 1, "refresh": "1m"}]}
+
+(time_range / refresh default to the dashboard's; nodes = $node selection, default All)
+and reports per dashboard and panel:
+
+- queries/s — every queried panel target (collapsed rows are not queried; repeated
+  panels once per $node value) plus query variables refreshed on time range change,
+  on every auto refresh
+- samples scanned/s — expected series per selector (SeriesModel: inventory × hardware
+  profile, recorded rollups by level) × samples each decodes: (range + lookback) /
+  scrape interval, or steps × window for range selectors
+- cache hit potential — share of those samples the query-frontend results cache can
+  serve: range queries only, everything older than MAX_CACHE_FRESHNESS_S
+
+With --budget-qps / --budget-samples it recommends refresh intervals that fit (raising
+the costliest viewer first), panels worth a recording rule (rollups.py), and query
+variables to refresh on load only.
+
+Usage: python3 read_load_model.py [--viewers FILE] [--nodes N] [--profile NAME] [--interval 30s]
+                              [--jobs N] [--budget-qps N] [--budget-samples N] [--top N] [--json FILE]
+"""
+import glob, json, math, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import capacity_planner, metrics_inventory
+from capacity_planner import parse_interval
+from generate_dashboards import DASHBOARD_DIR
+from hardware_profiles import DEFAULT_PROFILE, get_profile
+from promql import AGGREGATIONS, selectors, tokens
+
+VIEWERS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "viewers.example.json")
+
+LOOKBACK_S = 300              # instant selectors read back this far (Prometheus lookback delta)
+MAX_CACHE_FRESHNESS_S = 600   # query-frontend never caches results newer than this
+SCREEN_WIDTH_PX = 1920        # panel maxDataPoints = its width in pixels
+RACK_SIZE = 10                # nodes per rack (sites.DEFAULT_RACK_REGEX: name minus last digit)
+HISTOGRAM_BUCKETS = 12        # `le` buckets per :bucket rule (recording_rules.py)
+REFRESH_STEPS = ["30s", "1m", "2m", "5m", "10m", "15m", "30m", "1h"]
+MAX_REFRESH = "5m"            # wall screens go stale beyond this — never recommend slower
+RULE_MIN_SERIES = 100         # raw aggregations over at least this many series are rule candidates
+
+def fmt_interval(s):
+    return f"{s // 3600:g}h" if s % 3600 == 0 else f"{s // 60:g}m" if s % 60 == 0 else f"{s:g}s"
+
+def time_range_seconds(text):
+    """Seconds in now-6h / 6h."""
+    return parse_interval(text.replace("now-", ""))
+
+# ── Series model ──
+
+class SeriesModel:
+    """Expected series a selector matches in one tenant (cluster) of `nodes` nodes."""
+
+    def __init__(self, profile=DEFAULT_PROFILE, nodes=64, jobs=50):
+        self.nodes = nodes; self.jobs = jobs
+        inventory = metrics_inventory.load()
+        by_name = {m.name: m for m in inventory}
+        self.mult = capacity_planner.multipliers(get_profile(profile), nodes, 1)
+        # (member names, labeled names, fleet series) per series-producing metric
+        self.metrics = [(members, {by_name[n].labeled_name() for n in members}, self.mult[sc])
+                        for _, _, sc, members in capacity_planner.series_metrics(inventory)]
+        self.total = sum(m[2] for m in self.metrics)
+        self.levels = {"node": nodes, "rack": math.ceil(nodes / RACK_SIZE), "cluster": 1,
+                       "job": jobs, "job_entity": jobs}
+
+    def recorded(self, name):
+        level = name.split(":", 1)[0]
+        series = self.levels.get(level, 1)
+        return series * HISTOGRAM_BUCKETS if name.endswith(":bucket") else series
+
+    def unfiltered(self, sel):
+        """Series before label matchers other than __name__."""
+        refs = sel.refs
+        if not refs.names and not refs.patterns:
+            return self.total                           # {cluster=~"$cluster"}: every series
+        series, seen = 0, set()
+        for name in refs.names:
+            if ":" in name:
+                series += self.recorded(name); seen.add(name)
+        for members, labeled, fleet in self.metrics:
+            hit = [n for n in members if refs.matches(n)]
+            if hit:
+                series += fleet * len(hit) / len(members); seen.update(hit)
+            elif any(refs.matches(n) for n in labeled):
+                series += fleet; seen.update(n for n in labeled if refs.matches(n))
+        # names outside the inventory and the rules (job_*, DCGM, …): assume one per node
+        series += self.nodes * len(refs.names - seen)
+        return series
+
+    def series(self, sel, nodes_in_view):
+        s = self.unfiltered(sel)
+        if any(label == "entity" and "$node" in value for label, _, value in sel.matchers):
+            s *= min(nodes_in_view, self.nodes) / self.nodes
+        return s
+
+# ── Dashboards ──
+
+def load_dashboards(directory=DASHBOARD_DIR):
+    """{dashboard id ("00"): dashboard} of the generated files."""
+    out = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        did = os.path.basename(path)[:2]
+        with open(path) as f:
+            out[did] = json.load(f)
+    return out
+
+def queried_panels(dashboard):
+    """Panels queried on load / refresh: top-level, not rows (collapsed rows hold theirs)."""
+    return [p for p in dashboard["panels"] if p.get("type") != "row" and p.get("targets")]
+
+def is_instant(target):
+    return bool(target.get("instant")) or target.get("format") == "table"
+
+def panel_step(panel, range_s, interval_s, width_px=SCREEN_WIDTH_PX):
+    """Range query step Grafana uses: range / maxDataPoints (the panel's pixel width unless
+    set), whole seconds, never below the scrape interval."""
+    max_points = panel.get("maxDataPoints") or max(1, int(panel["gridPos"]["w"] / 24 * width_px))
+    return max(interval_s, math.ceil(range_s / max_points))
+
+def aggregates_raw(expr):
+    """Aggregation over at least one non-recorded selector — a recording rule candidate."""
+    idents = {v for k, v in tokens(expr) if k == "ident"}
+    return bool(idents & AGGREGATIONS) and any(
+        not sel.refs.names or any(":" not in n for n in sel.refs.names) or sel.refs.patterns
+        for sel in selectors(expr))
+
+def target_cost(expr, instant, range_s, step_s, interval_s, model, nodes_in_view):
+    """(series, samples scanned) of one query."""
+    series = samples = 0.0
+    for sel in selectors(expr):
+        n = model.series(sel, nodes_in_view)
+        if sel.window is not None:
+            steps = 1 if instant else range_s / step_s
+            per_series = max(steps * sel.window, (0 if instant else range_s) + sel.window) / interval_s
+        else:
+            per_series = ((0 if instant else range_s) + LOOKBACK_S) / interval_s
+        series += n; samples += n * per_series
+    return series, samples
+
+def viewer_load(viewer, dashboard, model, interval_s, width_px):
+    """Per-panel and variable load of one viewer entry (all its screens), per second."""
+    range_s = time_range_seconds(viewer.get("time_range") or dashboard["time"]["from"])
+    refresh_s = parse_interval(viewer.get("refresh") or dashboard["refresh"])
+    screens = viewer.get("screens", 1)
+    nodes_in_view = viewer.get("nodes", model.nodes)
+    panels = []
+    for p in queried_panels(dashboard):
+        copies, in_view = (nodes_in_view, 1) if p.get("repeat") == "node" else (1, nodes_in_view)
+        step_s = panel_step(p, range_s, interval_s, width_px)
+        queries = samples = cacheable = series = 0.0
+        raw_agg = False
+        for t in p["targets"]:
+            instant = is_instant(t)
+            s, n = target_cost(t["expr"], instant, range_s, step_s, interval_s, model, in_view)
+            queries += copies; series += s * copies; samples += n * copies
+            if not instant:
+                cacheable += n * copies * max(0.0, range_s - MAX_CACHE_FRESHNESS_S) / range_s
+            raw_agg = raw_agg or (aggregates_raw(t["expr"]) and s >= RULE_MIN_SERIES)
+        rate = screens / refresh_s
+        panels.append({"title": p.get("title", ""), "queries_per_s": queries * rate,
+                       "samples_per_s": samples * rate, "cacheable_per_s": cacheable * rate,
+                       "series": series, "rule_candidate": raw_agg})
+    variables = [v["name"] for v in dashboard["templating"]["list"]
+                 if v.get("type") == "query" and v.get("refresh") == 2]
+    return {"viewer": viewer.get("name", "viewer"), "dashboard": viewer["dashboard"],
+            "title": dashboard["title"], "screens": screens, "refresh": fmt_interval(refresh_s),
+            "range": fmt_interval(range_s), "panels": panels, "range_variables": variables,
+            "variable_queries_per_s": len(variables) * screens / refresh_s}
+
+def totals(load):
+    q = sum(p["queries_per_s"] for p in load["panels"]) + load["variable_queries_per_s"]
+    s = sum(p["samples_per_s"] for p in load["panels"])
+    c = sum(p["cacheable_per_s"] for p in load["panels"])
+    return {"queries_per_s": q, "samples_per_s": s, "cache_hit_potential": c / s if s else 0.0}
+
+def model_loads(viewers, dashboards, model, interval_s, width_px):
+    loads = []
+    for v in viewers:
+        if v["dashboard"] not in dashboards:
+            raise KeyError(f"Viewer {v.get('name')!r}: no generated dashboard {v['dashboard']!r} "
+                           f"(have {', '.join(sorted(dashboards))})")
+        loads.append(viewer_load(v, dashboards[v["dashboard"]], model, interval_s, width_px))
+    return loads
+
+# ── Recommendations ──
+
+def recommend_refresh(viewers, dashboards, model, interval_s, width_px, budget_qps, budget_samples):
+    """Raise the refresh of the costliest viewer entry one step at a time until the totals
+    fit the budget (or everything is at MAX_REFRESH). Returns ([(viewer, dashboard, old, new)], fits)."""
+    viewers = [dict(v) for v in viewers]
+    start = {id(v): v.get("refresh") or dashboards[v["dashboard"]]["refresh"] for v in viewers}
+    cap = parse_interval(MAX_REFRESH)
+
+    def over(loads):
+        """The exceeded budget's key ("samples_per_s" first), or None."""
+        t = [totals(l) for l in loads]
+        if budget_samples and sum(x["samples_per_s"] for x in t) > budget_samples: return "samples_per_s"
+        if budget_qps and sum(x["queries_per_s"] for x in t) > budget_qps: return "queries_per_s"
+        return None
+
+    loads = model_loads(viewers, dashboards, model, interval_s, width_px)
+    while over(loads):
+        key = over(loads)
+        order = sorted(range(len(viewers)), key=lambda i: -totals(loads[i])[key])
+        for i in order:
+            cur = parse_interval(viewers[i].get("refresh") or dashboards[viewers[i]["dashboard"]]["refresh"])
+            nxt = [r for r in REFRESH_STEPS if cur < parse_interval(r) <= cap]
+            if nxt:
+                viewers[i]["refresh"] = nxt[0]; break
+        else:
+            break
+        loads = model_loads(viewers, dashboards, model, interval_s, width_px)
+    changes = [(v.get("name", "viewer"), v["dashboard"], start[id(v)], v["refresh"])
+               for v in viewers if v.get("refresh") and v["refresh"] != start[id(v)]]
+    return changes, over(loads) is None
+
+def recommend_rules(loads, top):
+    """Costliest panels that aggregate raw series: [(dashboard, title, samples/s)]."""
+    agg = {}
+    for l in loads:
+        for p in l["panels"]:
+            if p["rule_candidate"]:
+                k = (l["dashboard"], p["title"])
+                agg[k] = agg.get(k, 0.0) + p["samples_per_s"]
+    return [(d, t, s) for (d, t), s in sorted(agg.items(), key=lambda kv: -kv[1])[:top]]
+
+def recommend_variables(loads):
+    """{(dashboard, variable): queries/s} of variables re-queried on every auto refresh."""
+    out = {}
+    for l in loads:
+        for name in l["range_variables"]:
+            k = (l["dashboard"], name)
+            out[k] = out.get(k, 0.0) + l["variable_queries_per_s"] / len(l["range_variables"])
+    return out
+
+# ── Report ──
+
+def human(n):
+    return capacity_planner.human(n)
+
+def report(loads, top=10):
+    lines = [f"{'Viewer':<18}{'Dashboard':<36}{'Screens':>8}{'Refresh':>9}{'Range':>7}"
+             f"{'Queries/s':>11}{'Samples/s':>12}{'Cacheable':>11}"]
+    for l in loads:
+        t = totals(l)
+        lines.append(f"{l['viewer'][:17]:<18}{(l['dashboard'] + ' ' + l['title'])[:35]:<36}{l['screens']:>8}"
+                     f"{l['refresh']:>9}{l['range']:>7}{t['queries_per_s']:>11.2f}"
+                     f"{human(t['samples_per_s']):>12}{t['cache_hit_potential']:>11.0%}")
+    q = sum(totals(l)["queries_per_s"] for l in loads)
+    s = sum(totals(l)["samples_per_s"] for l in loads)
+    c = sum(totals(l)["cache_hit_potential"] * totals(l)["samples_per_s"] for l in loads)
+    lines.append(f"{'Total':<88}{q:>11.2f}{human(s):>12}{(c / s if s else 0):>11.0%}")
+    panels = {}
+    for l in loads:
+        for p in l["panels"]:
+            e = panels.setdefault((l["dashboard"], p["title"]), {"q": 0.0, "s": 0.0, "c": 0.0, "series": p["series"]})
+            e["q"] += p["queries_per_s"]; e["s"] += p["samples_per_s"]; e["c"] += p["cacheable_per_s"]
+    lines += ["", f"Top {top} panels by samples scanned",
+              f"{'Dashboard / panel':<62}{'Series':>10}{'Queries/s':>11}{'Samples/s':>12}{'Cacheable':>11}"]
+    for (d, title), e in sorted(panels.items(), key=lambda kv: -kv[1]["s"])[:top]:
+        lines.append(f"{(d + ' ' + title)[:61]:<62}{human(e['series']):>10}{e['q']:>11.2f}"
+                     f"{human(e['s']):>12}{(e['c'] / e['s'] if e['s'] else 0):>11.0%}")
+    return "\n".join(lines)
+
+def load_viewers(path=VIEWERS):
+    with open(path) as f:
+        spec = json.load(f)
+    defaults = spec.get("defaults", {})
+    return [{**defaults, **v} for v in spec.get("viewers", [])], defaults.get("screen_width_px", SCREEN_WIDTH_PX)
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    viewers, width_px = load_viewers(opt("--viewers", VIEWERS))
+    model = SeriesModel(opt("--profile", DEFAULT_PROFILE), int(opt("--nodes", 64)), int(opt("--jobs", 50)))
+    interval_s = parse_interval(opt("--interval", capacity_planner.DEFAULT_INTERVAL))
+    dashboards = load_dashboards()
+    loads = model_loads(viewers, dashboards, model, interval_s, width_px)
+    top = int(opt("--top", 10))
+    print(report(loads, top))
+
+    budget_qps, budget_samples = float(opt("--budget-qps", 0)), float(opt("--budget-samples", 0))
+    recs = {}
+    if budget_qps or budget_samples:
+        changes, fits = recommend_refresh(viewers, dashboards, model, interval_s, width_px,
+                                          budget_qps, budget_samples)
+        recs["refresh"] = [{"viewer": v, "dashboard": d, "from": a, "to": b} for v, d, a, b in changes]
+        print(f"\nRefresh — budget {budget_qps or '∞'} queries/s, {human(budget_samples) if budget_samples else '∞'} samples/s")
+        for v, d, a, b in changes:
+            print(f"  {v}: dashboard {d} refresh {a} → {b}")
+        if not changes: print("  within budget")
+        if not fits: print(f"  ⚠️  still over budget with every viewer at ≤ {MAX_REFRESH} — record the panels below")
+    rules = recommend_rules(loads, top)
+    recs["recording_rules"] = [{"dashboard": d, "panel": t, "samples_per_s": s} for d, t, s in rules]
+    if rules:
+        print(f"\nRecording rule candidates (raw aggregations over ≥ {RULE_MIN_SERIES} series — rollups.py)")
+        for d, t, s in rules:
+            print(f"  {d} {t}: {human(s)} samples/s")
+    variables = recommend_variables(loads)
+    recs["variables"] = [{"dashboard": d, "variable": n, "queries_per_s": q} for (d, n), q in variables.items()]
+    if variables:
+        print("\nQuery variables re-run on every auto refresh (refresh on time range change) — "
+              "set refresh to on-load where the values are stable")
+        for (d, n), q in sorted(variables.items(), key=lambda kv: -kv[1]):
+            print(f"  {d} ${n}: {q:.2f} queries/s")
+    if "--json" in sys.argv:
+        with open(opt("--json"), "w") as f:
+            json.dump({"loads": [{**l, "totals": totals(l)} for l in loads], "recommendations": recs}, f, indent=2)
+        print(f"\n  ✅ {opt('--json')}")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Recording Rules.
+
+Rollups dashboards read instead of raw per-node / per-GPU series. Load the same
+rule files into every cluster's Mimir tenant (mimirtool rules load / Prometheus
+rule_files) — each tenant then records its own series per level and rollup.
+
+Naming follows the Prometheus convention level:metric:operation, e.g.
+  rack:gpu_power_usage:sum        sum by (cluster, rack) (gpu_power_usage)
+  cluster:gpu_power_usage:sum     sum of the rack:gpu_power_usage:sum of the cluster
+  cluster:nodes_up:sum            sum by (cluster) (rack:nodes_up:sum)
+  cluster:gpu_health_overall:count_gt0   GPUs/nodes with a failing DCGM check
+
+The GPU → node → rack → cluster hierarchy is defined in rollups.py.
+
+Usage: python3 recording_rules.py [--out DIR]
+"""
+import json, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import panel_builders
+from rollups import OPS, ROLLUPS, COMPOSE, agg, levels, recorded_ops
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+RULE_INTERVAL = "1m"
+
+# Job anchors (09): one series per job / per job×node instead of per job×GPU. The
+# $job and $node variables of the job dashboard list from these, never from raw job_* series.
+JOB = "cluster, job_id"
+JOB_ANCHORS = [
+    ("job", JOB, "job_gpu_utilization", "count"),                    # GPUs allocated to the job
+    ("job_entity", JOB + ", entity", "job_gpu_utilization", "count"),  # job → node membership
+]
+
+# Fleet distributions (02): per-GPU gpuN_<base> series bucketed per cluster and rack.
+# Cumulative Prometheus-style buckets (le label, +Inf = all GPUs); dashboards read the
+# bucket series, so query cost depends on bucket count, not GPU count.
+HISTOGRAMS = {
+    "temperature": [30, 40, 50, 60, 70, 75, 80, 83, 85, 90, 95],   # °C — throttle ≥ 83
+    "mem_temp":    [40, 50, 60, 70, 80, 85, 90, 95, 100, 105],     # °C — HBM risk > 105
+    "power":       [100, 200, 300, 400, 500, 600, 700, 800, 900, 1000],  # W — B200 TDP 1000
+}
+
+def rule_name(level, metric, op):
+    return f"{level}:{metric}:{op}"
+
+def rollup_rule(level, metric, op, by=None):
+    """{"record", "expr"} aggregating metric (DGX nodes only) by `by` (default: level).
+    Grouping by rack derives the rack label from entity first (with_rack)."""
+    if op not in OPS:
+        raise ValueError(f"Unknown rollup operation {op!r} (expected one of {', '.join(OPS)})")
+    by = by or level
+    sel = f'{metric}{{entity=~"{panel_builders.NODE_REGEX}"}}'
+    if "rack" in [b.strip() for b in by.split(",")]: sel = with_rack(sel)
+    return {"record": rule_name(level, metric, op), "expr": agg(op, by, sel)}
+
+def per_gpu_selector(base):
+    """Every GPU's gpuN_<base> (or labeled gpu_<base>) series on DGX nodes."""
+    return panel_builders.indexed_selector("gpu", base, f'entity=~"{panel_builders.NODE_REGEX}"')
+
+def with_rack(expr):
+    """Add a `rack` label derived from entity (site RACK_REGEX, first capture group)."""
+    return f'label_replace({expr}, "rack", "$1", "entity", "{panel_builders.RACK_REGEX}")'
+
+def bucket_rules(base, buckets):
+    """rack:gpu_<base>:bucket per upper bound (+Inf included), then cluster totals.
+    Bounds count with `<= bool` (1 / 0 per GPU), so a bucket no GPU falls into records 0
+    instead of no series — `+Inf − le` stays defined for a rack that is entirely above le."""
+    record = rule_name("rack", f"gpu_{base}", "bucket")
+    rules = []
+    # The gpu label keeps the GPUs of one node apart once `bool` drops __name__
+    gpus = panel_builders.indexed_series("gpu", base, f'entity=~"{panel_builders.NODE_REGEX}"')
+    for le in [str(b) for b in buckets] + ["+Inf"]:
+        sel = with_rack(gpus)
+        inner = f"count by (cluster, rack) ({sel})" if le == "+Inf" else f"sum by (cluster, rack) ({sel} <= bool {le})"
+        rules.append({"record": record, "expr": f'label_replace({inner}, "le", "{le}", "", "")'})
+    rules.append({"record": rule_name("cluster", f"gpu_{base}", "bucket"),
+                  "expr": f"sum by (cluster, le) ({record})"})
+    return rules
+
+def hierarchy_rules(metric):
+    """metric's rollups, finest level first; each level aggregates the records of the one
+    before it (the first reads raw series: gpuN_<base> or the node-native metric)."""
+    base, ops = ROLLUPS[metric]
+    rules, below = [], None
+    for level, labels in levels(metric):
+        by = ", ".join(labels)
+        for op in recorded_ops(ops):
+            if below is None:
+                sel = per_gpu_selector(base) if base else f'{metric}{{entity=~"{panel_builders.NODE_REGEX}"}}'
+            else:
+                sel = rule_name(below, metric, op)
+            if "rack" in labels: sel = with_rack(sel)
+            rules.append({"record": rule_name(level, metric, op),
+                          "expr": agg(op if below is None else COMPOSE[op], by, sel)})
+        below = level
+    return rules
+
+def rule_groups():
+    # One group per metric: rules in a group run in order, so each level reads fresh records
+    return [{"name": f"bmaas-{metric.replace('_', '-')}-rollups", "interval": RULE_INTERVAL,
+             "rules": hierarchy_rules(metric)} for metric in ROLLUPS]
+
+def histogram_rule_groups():
+    # One group per metric: the cluster sum reads the rack buckets recorded just before it
+    return [{"name": f"bmaas-gpu-{base.replace('_', '-')}-histogram", "interval": RULE_INTERVAL,
+             "rules": bucket_rules(base, buckets)} for base, buckets in HISTOGRAMS.items()]
+
+def job_rule_groups():
+    return [{"name": "bmaas-job-anchors", "interval": RULE_INTERVAL,
+             "rules": [rollup_rule(level, m, op, by) for level, by, m, op in JOB_ANCHORS]}]
+
+def to_yaml(groups):
+    """Prometheus/Mimir rule-file YAML (exprs double-quoted — JSON strings are valid YAML)."""
+    lines = ["groups:"]
+    for g in groups:
+        lines.append(f"  - name: {g['name']}")
+        lines.append(f"    interval: {g['interval']}")
+        lines.append("    rules:")
+        for r in g["rules"]:
+            lines.append(f"      - record: {r['record']}")
+            lines.append(f"        expr: {json.dumps(r['expr'])}")
+    return "\n".join(lines) + "\n"
+
+RULE_FILES = {
+    "bmaas-rollups.yaml": rule_groups,
+    "bmaas-job-anchors.yaml": job_rule_groups,
+    "bmaas-gpu-histograms.yaml": histogram_rule_groups,
+}
+
+def write_rules(out_dir=None):
+    """Write every rule file; returns [(filename, rule count)]."""
+    from generate_dashboards import write_text_atomic
+    out_dir = out_dir or RULES_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for filename, groups_fn in RULE_FILES.items():
+        groups = groups_fn()
+        write_text_atomic(to_yaml(groups), os.path.join(out_dir, filename))
+        written.append((filename, sum(len(g["rules"]) for g in groups)))
+    return written
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+    out = sys.argv[sys.argv.index("--out") + 1] if "--out" in sys.argv else None
+    for filename, n in write_rules(out):
+        print(f"  ✅ {filename}: {n} rules")
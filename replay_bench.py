@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Dashboard Query Replay Benchmark.
+
+Loads every generated dashboard (dashboards/*.json) against a Prometheus-compatible
+API the way Grafana does, and measures it:
+
+1. template variables: each query variable's label_values() as /api/v1/label/<l>/values
+   over the dashboard's time range; then every variable takes its default selection
+   (All → allValue or .*), or --var
+2. panels queried on load (read_load_model.queried_panels — collapsed rows are not),
+   each target as /api/v1/query (instant / table) or /api/v1/query_range over the
+   dashboard's time range, start / end aligned to the step Grafana derives from
+   maxDataPoints (read_load_model.panel_step); a repeated panel (repeat: node) once per
+   selected value — the variable's label values matching its selection
+3. at most --concurrency requests in flight per dashboard (the browser's per-host limit)
+
+Reported over --repeat loads: per dashboard load time (first request → last response)
+and query latency percentiles; per panel latency (its slowest target) percentiles;
+series returned and samples read (stats=all's totalQueryableSamples — returned points
+where the server does not report it). --json saves the run; --compare FILE flags
+dashboards whose p50 load time grew beyond --tolerance, or whose samples changed.
+
+--stub replays against prometheus_stub.py (promql_eval.py over --nodes synthetic nodes,
+or --npz FILE from backfill.py). Auth / tenant: PROMETHEUS_TOKEN (Bearer),
+--tenant (X-Scope-OrgID, Mimir).
+
+Usage: python3 replay_bench.py [--url http://localhost:9090] [--stub [--nodes N] [--npz FILE]]
+                           [--dashboards DIR] [--only 00,07] [--var NAME=VALUE ...] [--tenant ID]
+                           [--concurrency 6] [--repeat 3] [--interval 30] [--width 1920] [--top N]
+                           [--json FILE] [--compare FILE] [--tolerance 0.5]
+"""
+import http.client, json, os, re, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cardinality import resolve, variable_values
+from generate_dashboards import DASHBOARD_DIR
+from grafana_sync import GrafanaClient
+from read_load_model import SCREEN_WIDTH_PX, is_instant, load_dashboards, panel_step, queried_panels, time_range_seconds
+
+DEFAULT_URL = "http://localhost:9090"
+DEFAULT_CONCURRENCY = 6      # browsers open at most 6 HTTP/1.1 connections per host
+DEFAULT_REPEAT = 3
+DEFAULT_INTERVAL_S = 30      # scrape interval — the step floor ($__interval)
+STUB_END_MS = 1_700_000_000_000   # --stub data ends here, so runs read the same samples
+_LABEL_VALUES = r'^\s*label_values\((?:(.*),\s*)?(\w+)\s*\)\s*$'
+
+def percentile(values, p):
+    if not values: return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+# ── Requests ──
+
+class Query:
+    """One request a dashboard load issues; label-values responses are kept in `data`."""
+    __slots__ = ("panel", "ref", "path", "params", "data")
+
+    def __init__(self, panel, ref, path, params):
+        self.panel = panel; self.ref = ref; self.path = path; self.params = params; self.data = None
+
+def regex_escape(value):
+    """A variable value as Grafana's Prometheus data source escapes it for =~ (the
+    backslash doubled inside the PromQL string)."""
+    return re.sub(r'([.*+?^${}()|\[\]\\])', r'\\\\\1', value)
+
+def variable_queries(dashboard, now_s, values):
+    """label_values() requests of the query variables, over the dashboard's time range."""
+    range_s = time_range_seconds(dashboard["time"]["from"])
+    out = []
+    for v in dashboard["templating"]["list"]:
+        if v.get("type") != "query": continue
+        q = v["query"]["query"] if isinstance(v["query"], dict) else v["query"]
+        m = re.match(_LABEL_VALUES, resolve(q, values), re.S)
+        if not m: continue
+        params = {"match[]": m.group(1)} if m.group(1) else {}
+        params.update(start=now_s - range_s, end=now_s)
+        out.append(Query(f"${v['name']}", "", f"/api/v1/label/{quote(m.group(2))}/values", params))
+    return out
+
+def repeat_values(dashboard, values, variables):
+    """{variable: [selected values]} from the variable queries' responses: label values
+    kept by the variable's regex and matching its selection (All: every one)."""
+    defs = {v["name"]: v for v in dashboard["templating"]["list"]}
+    out = {}
+    for q in variables:
+        name = q.panel[1:]
+        if q.data is None or name not in defs: continue
+        keep = (defs[name].get("regex") or "").strip("/")
+        out[name] = [x for x in q.data if (not keep or re.search(keep, x))
+                     and re.fullmatch(values.get(name, ".*"), x)]
+    return out
+
+def panel_queries(dashboard, now_s, values, interval_s=DEFAULT_INTERVAL_S, width_px=SCREEN_WIDTH_PX, repeats=None):
+    """Panel target requests; a panel repeated over a variable in `repeats` is sent once
+    per value, that variable set to the value (others: once, over the whole selection)."""
+    range_s = time_range_seconds(dashboard["time"]["from"])
+    out = []
+    for p in queried_panels(dashboard):
+        step = panel_step(p, range_s, interval_s, width_px)
+        end = now_s // step * step
+        var = p.get("repeat")
+        copies = [{**values, var: regex_escape(x)} for x in (repeats or {}).get(var) or ()] or [values]
+        for scope in copies:
+            title = resolve(p.get("title", ""), scope) if var else p.get("title", "")
+            for t in p["targets"]:
+                expr = resolve(t["expr"], scope)
+                if is_instant(t):
+                    out.append(Query(title, t.get("refId", ""), "/api/v1/query",
+                                     {"query": expr, "time": end, "stats": "all"}))
+                else:
+                    out.append(Query(title, t.get("refId", ""), "/api/v1/query_range",
+                                     {"query": expr, "start": (now_s - range_s) // step * step, "end": end,
+                                      "step": step, "stats": "all"}))
+    return out
+
+def dashboard_queries(dashboard, now_s, interval_s=DEFAULT_INTERVAL_S, width_px=SCREEN_WIDTH_PX, overrides=None,
+                      repeats=None):
+    """([variable queries], [panel queries]) of one load at now_s, without a server:
+    repeated panels expand over `repeats` ({variable: [values]}) only."""
+    values = variable_values(dashboard, overrides)
+    return (variable_queries(dashboard, now_s, values),
+            panel_queries(dashboard, now_s, values, interval_s, width_px, repeats))
+
+def run_query(client, q):
+    """(ms, series, samples, error); label values are also kept in q.data."""
+    t0 = time.perf_counter()
+    try:
+        status, body = client.request("GET", f"{q.path}?{urlencode(q.params)}")
+    except (OSError, http.client.HTTPException) as e:
+        return (time.perf_counter() - t0) * 1000, 0, 0, str(e)
+    ms = (time.perf_counter() - t0) * 1000
+    if status != 200 or not body or body.get("status") != "success":
+        return ms, 0, 0, (body or {}).get("error") or f"HTTP {status}"
+    data = body["data"]
+    if isinstance(data, list):   # label values
+        q.data = data
+        return ms, len(data), 0, None
+    result = data.get("result") or []
+    if data.get("resultType") == "scalar": result = [result]
+    read = ((data.get("stats") or {}).get("samples") or {}).get("totalQueryableSamples")
+    returned = sum(len(r.get("values") or ()) or 1 for r in result if isinstance(r, dict))
+    return ms, len(result), read if read is not None else returned, None
+
+def load_dashboard(client, dashboard, concurrency, now_s, interval_s, width_px, overrides):
+    """One load: variable queries, then panel queries (repeated panels expanded over the
+    variables' answers), at most `concurrency` in flight.
+    Returns (load ms, [(query, (ms, series, samples, error))])."""
+    values = variable_values(dashboard, overrides)
+    variables = variable_queries(dashboard, now_s, values)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        out = list(zip(variables, pool.map(lambda q: run_query(client, q), variables)))
+        panels = panel_queries(dashboard, now_s, values, interval_s, width_px,
+                               repeat_values(dashboard, values, variables))
+        out += list(zip(panels, pool.map(lambda q: run_query(client, q), panels)))
+    return (time.perf_counter() - t0) * 1000, out
+
+# ── Benchmark ──
+
+def replay(client, dashboards, now_s, concurrency=DEFAULT_CONCURRENCY, repeat=DEFAULT_REPEAT,
+           interval_s=DEFAULT_INTERVAL_S, width_px=SCREEN_WIDTH_PX, overrides=None):
+    """{dashboard id: {"load_ms": [per load], "queries", "errors", "query_ms", "series", "samples",
+    "panels": {panel: {"ms": [per load], "series", "samples"}}}}."""
+    results = {}
+    for did, d in sorted(dashboards.items()):
+        r = results[did] = {"title": d.get("title", ""), "load_ms": [], "query_ms": [], "errors": [], "panels": {}}
+        for run in range(repeat):
+            load_ms, queries = load_dashboard(client, d, concurrency, now_s, interval_s, width_px, overrides)
+            r["load_ms"].append(load_ms)
+            per_panel = {}
+            for q, (ms, series, samples, err) in queries:
+                r["query_ms"].append(ms)
+                if err and not run: r["errors"].append(f"{q.panel} {q.ref}: {err}")
+                e = per_panel.setdefault(q.panel, [0.0, 0, 0])
+                e[0] = max(e[0], ms); e[1] += series; e[2] += samples
+            for panel, (ms, series, samples) in per_panel.items():
+                pr = r["panels"].setdefault(panel, {"ms": [], "series": series, "samples": samples})
+                pr["ms"].append(ms)
+        r["queries"] = len(queries)
+        r["series"] = sum(p["series"] for p in r["panels"].values())
+        r["samples"] = sum(p["samples"] for p in r["panels"].values())
+    return results
+
+def summary(results):
+    """{dashboard: {load / query percentiles, counts}} — what --json saves and --compare reads."""
+    return {did: {"title": r["title"], "queries": r["queries"], "errors": len(r["errors"]),
+                  "load_p50_ms": percentile(r["load_ms"], 50), "load_p95_ms": percentile(r["load_ms"], 95),
+                  "load_max_ms": max(r["load_ms"]),
+                  "query_p50_ms": percentile(r["query_ms"], 50), "query_p95_ms": percentile(r["query_ms"], 95),
+                  "series": r["series"], "samples": r["samples"],
+                  "panels": {p: {"p50_ms": percentile(v["ms"], 50), "p95_ms": percentile(v["ms"], 95),
+                                 "series": v["series"], "samples": v["samples"]} for p, v in r["panels"].items()}}
+            for did, r in results.items()}
+
+def compare(current, baseline, tolerance):
+    """[(dashboard, metric, baseline, current)] — p50 load time beyond tolerance, samples changed."""
+    bad = []
+    for did, cur in current.items():
+        base = baseline.get(did)
+        if not base: continue
+        if cur["load_p50_ms"] > base["load_p50_ms"] * (1 + tolerance) + 5:
+            bad.append((did, "load_p50_ms", base["load_p50_ms"], cur["load_p50_ms"]))
+        if cur["samples"] != base["samples"]:
+            bad.append((did, "samples", base["samples"], cur["samples"]))
+    return bad
+
+def report(summ, results, top=10):
+    lines = [f"{'Dashboard':<10}{'Queries':>8}{'Errors':>7}{'Load p50':>10}{'p95':>9}{'max':>9}"
+             f"{'Query p50':>11}{'p95':>9}{'Series':>9}{'Samples':>12}"]
+    for did, s in summ.items():
+        lines.append(f"{did:<10}{s['queries']:>8}{s['errors']:>7}{s['load_p50_ms']:>10.1f}{s['load_p95_ms']:>9.1f}"
+                     f"{s['load_max_ms']:>9.1f}{s['query_p50_ms']:>11.1f}{s['query_p95_ms']:>9.1f}"
+                     f"{s['series']:>9}{s['samples']:>12}")
+    panels = [(did, p, v) for did, s in summ.items() for p, v in s["panels"].items()]
+    lines += ["", f"Slowest {top} panels (ms, slowest target per load)",
+              f"{'Dash':<6}{'Panel':<50}{'p50':>8}{'p95':>8}{'Series':>8}{'Samples':>11}"]
+    for did, p, v in sorted(panels, key=lambda x: -x[2]["p50_ms"])[:top]:
+        lines.append(f"{did:<6}{p[:49]:<50}{v['p50_ms']:>8.1f}{v['p95_ms']:>8.1f}{v['series']:>8}{v['samples']:>11}")
+    errors = [(did, e) for did, r in results.items() for e in r["errors"]]
+    if errors:
+        lines += ["", f"{len(errors)} failed queries"] + [f"  ❌ {did} {e}" for did, e in errors[:top]]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    overrides = dict(a.split("=", 1) for i, a in enumerate(sys.argv) if i and sys.argv[i - 1] == "--var")
+    dashboards = load_dashboards(opt("--dashboards", DASHBOARD_DIR))
+    if opt("--only"):
+        dashboards = {k: v for k, v in dashboards.items() if k in opt("--only").split(",")}
+    concurrency = int(opt("--concurrency", DEFAULT_CONCURRENCY))
+    print(f"BMaaS Monitoring Dashboard Suite — Dashboard Query Replay")
+    print(f"{'='*60}")
+
+    stub = None
+    if "--stub" in sys.argv:
+        from prometheus_stub import StubPrometheus
+        from promql_eval import Storage
+        t0 = time.perf_counter()
+        storage = Storage.load(opt("--npz")) if opt("--npz") else \
+            Storage.synthetic(nodes=int(opt("--nodes", 16)), samples=int(float(opt("--hours", 24)) * 120) + 1,
+                              end_ms=STUB_END_MS)
+        stub = StubPrometheus(storage).start()
+        url, now_s = stub.url, stub.end_s
+        print(f"stub: {storage.series} series, {storage.samples} samples, rules recorded "
+              f"({time.perf_counter() - t0:.1f} s)")
+    else:
+        url, now_s = opt("--url", os.environ.get("PROMETHEUS_URL", DEFAULT_URL)), time.time()
+    client = GrafanaClient(url, concurrency, os.environ.get("PROMETHEUS_TOKEN"))
+    if opt("--tenant"): client.headers["X-Scope-OrgID"] = opt("--tenant")
+    try:
+        results = replay(client, dashboards, int(now_s), concurrency, int(opt("--repeat", DEFAULT_REPEAT)),
+                         int(opt("--interval", DEFAULT_INTERVAL_S)), int(opt("--width", SCREEN_WIDTH_PX)), overrides)
+    finally:
+        client.close()
+        if stub: stub.shutdown()
+    summ = summary(results)
+    print(f"{url} — {len(dashboards)} dashboards × {opt('--repeat', DEFAULT_REPEAT)} loads, "
+          f"{concurrency} concurrent, {client.opened} connections\n")
+    print(report(summ, results, int(opt("--top", 10))))
+    if opt("--json"):
+        from generate_dashboards import write_json_atomic
+        write_json_atomic({"url": url, "concurrency": concurrency, "dashboards": summ}, opt("--json"), indent=2)
+        print(f"\n  ✅ {opt('--json')}")
+    if opt("--compare"):
+        with open(opt("--compare")) as f: baseline = json.load(f)["dashboards"]
+        tolerance = float(opt("--tolerance", 0.5))
+        regressions = compare(summ, baseline, tolerance)
+        print(f"\n{'='*60}")
+        for did, k, b, c in regressions:
+            print(f"  ❌ {did}: {k} {b:.1f} → {c:.1f}" if isinstance(b, float) else f"  ❌ {did}: {k} {b} → {c}")
+        if regressions:
+            print(f"{len(regressions)} regression(s) vs {opt('--compare')} (tolerance {tolerance:.0%})")
+            sys.exit(1)
+        print(f"✅ No regressions vs {opt('--compare')} ({len(summ)} dashboards)")
+    sys.exit(1 if any(s["errors"] for s in summ.values()) else 0)
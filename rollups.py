@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Rollups — the GPU → node → rack → cluster recording-rule hierarchy.
+
+recording_rules.py records it; builders query it through rollup(). Each level is
+recorded from the level below, so a level's series are exactly the sum / max /
+count of its children:
+
+    gpu_power_usage ─sum→ rack:gpu_power_usage:sum ─sum→ cluster:gpu_power_usage:sum
+
+Node-native metrics (one series per node already, e.g. gpu_utilization) have no
+node:* rule — the raw series is that level, and rack:* reads it directly. A per-GPU
+entry (gpuN_<base>) adds node:* summed over the node's GPUs; only add one when a panel
+reads it — each costs a rule over every per-GPU series.
+
+rollup() picks the coarsest level that still carries every label the panel groups
+or filters by: a fleet stat filtered on $cluster reads cluster:*, "by rack" reads
+rack:*, and anything filtered on $node falls back to the node level.
+"""
+import re
+
+# operation → (aggregation, comparison applied to the selected series)
+OPS = {
+    "sum":       ("sum", ""),
+    "avg":       ("avg", ""),
+    "max":       ("max", ""),
+    "count":     ("count", ""),
+    "count_gt0": ("count", " > 0"),
+    "count_eq0": ("count", " == 0"),
+}
+
+# How a level aggregates the records of the level below
+COMPOSE = {"sum": "sum", "max": "max", "count": "sum", "count_gt0": "sum", "count_eq0": "sum"}
+
+# Finest first: (level, labels kept). rack is derived from entity (site rack_regex).
+LEVELS = [
+    ("node",    ("cluster", "entity")),
+    ("rack",    ("cluster", "rack")),
+    ("cluster", ("cluster",)),
+]
+
+# metric → (per-GPU base of gpuN_<base> or None for node-native metrics, operations).
+# avg is recorded as :sum + :count — an average of averages is not exact.
+ROLLUPS = {
+    "nodes_up":                   (None, ("sum",)),
+    "nodes_down":                 (None, ("sum",)),
+    "nodes_closed":               (None, ("sum",)),
+    "nodes_total":                (None, ("sum",)),
+    "gpu_health_overall":         (None, ("count", "count_eq0", "count_gt0", "max")),
+    "gpu_health_nvlink":          (None, ("count", "count_eq0")),
+    "gpu_ecc_dbe_agg":            (None, ("count", "count_eq0", "count_gt0", "sum")),
+    "gpu_ecc_sbe_agg":            (None, ("sum",)),
+    "gpu_row_remap_failure":      (None, ("count_gt0",)),
+    "gpu_utilization":            (None, ("avg",)),
+    "gpu_power_usage":            (None, ("sum",)),
+    "gpu_nvlink_total_bandwidth": (None, ("sum",)),
+    "alert_level":                (None, ("max",)),
+}
+
+def agg(op, by, sel):
+    fn, cmp = OPS[op]
+    return f"{fn} by ({by}) ({sel}{cmp})" if by else f"{fn}({sel}{cmp})"
+
+def recorded_ops(ops):
+    """Operations actually recorded (avg → sum + count), in order, without duplicates."""
+    out = []
+    for op in ops:
+        for o in (("sum", "count") if op == "avg" else (op,)):
+            if o not in out: out.append(o)
+    return out
+
+def levels(metric):
+    """Recorded levels of metric, finest first."""
+    base, _ = ROLLUPS[metric]
+    return [(lv, labels) for lv, labels in LEVELS if base or lv != "node"]
+
+def _matched_labels(filters):
+    return set(re.findall(r'(\w+)\s*(?:=~|!~|!=|=)"', filters))
+
+def rollup(metric, op, by="", filters=""):
+    """PromQL for op(metric) [by (by)] restricted by `filters`, read from the coarsest
+    level whose labels cover `by` and every filtered label."""
+    if metric not in ROLLUPS:
+        raise ValueError(f"No rollup for {metric!r} (expected one of {', '.join(ROLLUPS)})")
+    base, ops = ROLLUPS[metric]
+    if op not in ops:
+        raise ValueError(f"{metric} is rolled up as {', '.join(ops)}, not {op!r}")
+    need = {l.strip() for l in by.split(",") if l.strip()} | _matched_labels(filters)
+    for level, labels in reversed(LEVELS):
+        if not need <= set(labels):
+            continue
+        if level == "node" and not base:
+            return agg(op, by, f"{metric}{{{filters}}}")   # raw series are the node level
+        sel = lambda o: f"{level}:{metric}:{o}{{{filters}}}"
+        if op == "avg":
+            return f"{agg('sum', by, sel('sum'))} / {agg('sum', by, sel('count'))}"
+        return agg(COMPOSE[op], by, sel(op))
+    raise ValueError(f"No rollup level of {metric} carries {', '.join(sorted(need))}")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Scrape-Interval Tiers by Metric Volatility.
+
+Lifetime counters (gpu_ecc_*_agg, gpu_*_remapped_rows, nvidia_licensed_compute_resources)
+change a few times a day but are ingested at the same rate as gpu_utilization.
+This measures how often each inventory metric (metrics_inventory.py) actually changes
+in sample data (series_data.py) and splits the BCM scrape job into one job per tier:
+
+    fast    30s   everything else — new / unknown metrics land here
+    medium  1m    changes at most every 10 min on every series
+    slow    2m    changes at most every 20 min on every series
+
+A metric goes to the slowest tier whose interval sees a change on at most
+MAX_CHANGES_PER_SCRAPE of its scrapes, on its most volatile series — a change is
+delayed by at most one tier interval, as long as values persist (gauges and lifetime
+counters; not for values that spike between scrapes). No tier exceeds half the 5m
+lookback delta (read_load_model.LOOKBACK_S): instant queries and rule evaluations
+still find a sample after one missed scrape. A longer interval would need a matching
+--query.lookback-delta on every querier, which widens every instant selector's read.
+
+Scrape cost on the head node: every tier job scrapes the full BCM /exporter endpoint
+(the tier filter runs in Prometheus, after the scrape), so cmd renders the metric set
+once per job per interval — 1.75× the single 30s job's scrapes with all three tiers.
+Ingest drops; head-node load does not. BCM sampler intervals (--json) are where
+slow metrics get cheaper to produce.
+
+Output — scrape_configs on stdout, or --out DIR/bmaas-scrape-tiers.yaml: one job per
+tier, all scraping the same targets. Each job keeps its own `job` label (bcm-fast,
+bcm-medium, bcm-slow): jobs sharing one would write colliding up / scrape_* series
+for the same target. A metric that changes tier therefore starts a new series —
+select BCM metrics by job=~"bcm-.*", never job="bcm-fast" (the generated dashboards
+and rules do not match on job). The tier filter matches BCM's original names, so it
+goes BEFORE bmaas-metric-drop.yaml and bmaas-metric-relabel.yaml. --json writes the
+per-metric classification instead (for BCM sampler intervals).
+
+Data: --dump FILE (`promtool tsdb dump` of a TSDB snapshot, or exposition /
+OpenMetrics text with timestamps); without it, synthetic samples — only useful to
+exercise the pipeline.
+
+Usage: python3 scrape_tiers.py [--dump FILE] [--out DIR] [--json FILE] [--pin REGEX ...]
+                           [--target HOST:PORT ...] [--job NAME] [--list]
+"""
+import json, os, re, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import metrics_inventory, series_data
+from drop_rules import drop_regex
+from read_load_model import LOOKBACK_S
+
+TIERS_FILE = "bmaas-scrape-tiers.yaml"
+
+# (tier, scrape interval in seconds) — fastest first; the first tier is the catch-all.
+# At most half the lookback delta, so one missed scrape never leaves an instant query empty.
+TIERS = [("fast", 30), ("medium", 60), ("slow", 120)]
+assert TIERS[-1][1] <= LOOKBACK_S // 2
+MAX_CHANGES_PER_SCRAPE = 0.1
+
+# BCM head node exporter (cmd's Prometheus endpoint)
+DEFAULT_TARGETS = ["master:8081"]
+DEFAULT_JOB = "bcm"
+METRICS_PATH = "/exporter"
+
+def fmt_interval(s):
+    return f"{s // 60}m" if s % 60 == 0 else f"{s}s"
+
+# ── Change frequency ──
+
+def change_rates(samples):
+    """{name: changes per second on its most volatile series}; series seen once, or
+    without timestamps, are skipped."""
+    series = {}   # (name, labels) → [first ts, last ts, last value, changes]
+    for name, labels, ts, value in samples:
+        s = series.get((name, labels))
+        if s is None:
+            series[(name, labels)] = [ts, ts, value, 0]
+            continue
+        if value != s[2] and not (value != value and s[2] != s[2]):   # NaN == NaN here
+            s[3] += 1
+        s[1], s[2] = ts, value
+    rates = {}
+    for (name, _), (first, last, _, changes) in series.items():
+        if first is None or last <= first: continue
+        rates[name] = max(rates.get(name, 0.0), changes / ((last - first) / 1000))
+    return rates
+
+def tier_for(rate):
+    """Slowest tier whose interval sees a change on at most MAX_CHANGES_PER_SCRAPE scrapes."""
+    fits = [t for t in TIERS if rate * t[1] <= MAX_CHANGES_PER_SCRAPE]
+    return fits[-1] if fits else TIERS[0]
+
+def classify(rates, inventory, pins=()):
+    """[(metric, tier, interval, rate or None)] — no data or pinned → the fast tier."""
+    out = []
+    for m in inventory:
+        rate = rates.get(m.name)
+        if rate is None or any(re.fullmatch(p, m.name) for p in pins):
+            tier, interval = TIERS[0]
+        else:
+            tier, interval = tier_for(rate)
+        out.append((m, tier, interval, rate))
+    return out
+
+# ── Scrape jobs ──
+
+def scrape_jobs(classified, inventory, targets=DEFAULT_TARGETS, job=DEFAULT_JOB):
+    """One job per tier, named and labelled <job>-<tier>: the catch-all drops the slower
+    tiers' metrics, the others keep theirs."""
+    by_tier = {t: [m for m, tier, _, _ in classified if tier == t] for t, _ in TIERS}
+    slower = [m for t, _ in TIERS[1:] for m in by_tier[t]]
+    jobs = []
+    for i, (tier, interval) in enumerate(TIERS):
+        if i and not by_tier[tier]: continue
+        ms, action = (slower, "drop") if i == 0 else (by_tier[tier], "keep")
+        jobs.append({"job_name": f"{job}-{tier}", "tier": tier, "interval": fmt_interval(interval), "interval_s": interval,
+                     "targets": list(targets), "count": len(by_tier[tier]),
+                     "filter": {"action": action, "regex": drop_regex(ms, inventory)} if ms else None})
+    return jobs
+
+def to_yaml(jobs, source):
+    lines = [f"# Generated by scrape_tiers.py from {source} — replaces the single BCM scrape job",
+             "# Tier filters match BCM's original names: add bmaas-metric-drop.yaml and",
+             "# bmaas-metric-relabel.yaml configs AFTER each job's tier filter",
+             f"# Every job scrapes the full {METRICS_PATH} endpoint: {len(jobs)} jobs = "
+             f"{scrape_ratio(jobs):.2f}× the head-node scrapes of one {fmt_interval(TIERS[0][1])} job",
+             "scrape_configs:"]
+    for j in jobs:
+        lines.append(f"  # {j['tier']}: {j['count']} inventory metrics"
+                     + (" + everything outside the inventory" if j["filter"] is None or
+                        j["filter"]["action"] == "drop" else ""))
+        lines.append(f"  - job_name: {json.dumps(j['job_name'])}")
+        lines.append(f"    scrape_interval: {j['interval']}")
+        lines.append("    scheme: https")
+        lines.append(f"    metrics_path: {METRICS_PATH}")
+        lines.append("    static_configs:")
+        lines.append(f"      - targets: [{', '.join(json.dumps(t) for t in j['targets'])}]")
+        if j["filter"]:
+            lines.append("    metric_relabel_configs:")
+            lines.append("      - source_labels: [__name__]")
+            lines.append(f"        regex: {json.dumps(j['filter']['regex'])}")
+            lines.append(f"        action: {j['filter']['action']}")
+    return "\n".join(lines) + "\n"
+
+def scrape_ratio(jobs):
+    """Full /exporter scrapes per second of the tier jobs, relative to the single fast job."""
+    return sum(TIERS[0][1] / j["interval_s"] for j in jobs)
+
+def ingest_ratio(classified):
+    """Samples/s after tiering relative to scraping every inventory metric at the fast tier."""
+    base = TIERS[0][1]
+    return sum(base / interval for _, _, interval, _ in classified) / max(len(classified), 1)
+
+def plan(dump=None, pins=()):
+    """(inventory, classification, data source)."""
+    inventory = metrics_inventory.load()
+    if dump:
+        samples, source = series_data.read_samples(dump), os.path.basename(dump)
+    else:
+        samples = series_data.synthetic_samples([m.name for m in inventory], nodes=4, samples=2880,
+                                                 step_s=TIERS[0][1])   # 1 day
+        source = "synthetic samples"
+    return inventory, classify(change_rates(samples), inventory, pins), source
+
+def write_tiers(out_dir=None, dump=None, pins=(), targets=DEFAULT_TARGETS, job=DEFAULT_JOB):
+    """Write the tiered scrape jobs to out_dir, or stdout without one; returns
+    (destination, {tier: metric count}, ingest ratio, scrape ratio)."""
+    from generate_dashboards import write_text_atomic
+    inventory, classified, source = plan(dump, pins)
+    jobs = scrape_jobs(classified, inventory, targets, job)
+    text = to_yaml(jobs, source)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        dest = os.path.join(out_dir, TIERS_FILE)
+        write_text_atomic(text, dest)
+    else:
+        sys.stdout.write(text); dest = "stdout"
+    counts = {t: sum(1 for c in classified if c[1] == t) for t, _ in TIERS}
+    return dest, counts, ingest_ratio(classified), scrape_ratio(jobs)
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    def opts(name):
+        return [sys.argv[i + 1] for i, a in enumerate(sys.argv) if a == name]
+
+    pins = opts("--pin")
+    if "--list" in sys.argv or "--json" in sys.argv:
+        inventory, classified, source = plan(opt("--dump"), pins)
+        if "--json" in sys.argv:
+            with open(opt("--json"), "w") as f:
+                json.dump({"source": source, "tiers": {t: fmt_interval(s) for t, s in TIERS},
+                           "metrics": [{"metric": m.name, "section": m.section, "tier": tier,
+                                        "interval": fmt_interval(interval), "interval_s": interval,
+                                        "changes_per_hour": None if rate is None else round(rate * 3600, 3)}
+                                       for m, tier, interval, rate in classified]}, f, indent=2)
+            print(f"  ✅ {opt('--json')}: {len(classified)} metrics classified from {source}")
+        else:
+            for section, ms in metrics_inventory.sections(inventory).items():
+                print(f"\n{section}")
+                for m, tier, interval, rate in classified:
+                    if m.section != section: continue
+                    per_hour = "no data" if rate is None else f"{rate * 3600:8.2f}/h"
+                    print(f"  {tier:<6} {fmt_interval(interval):>4}  {per_hour:>10}  {m.name}")
+            print(f"\nfrom {source}: ingest {ingest_ratio(classified):.0%} of a single "
+                  f"{fmt_interval(TIERS[0][1])} job")
+        sys.exit(0)
+    dest, counts, ratio, scrapes = write_tiers(opt("--out"), opt("--dump"), pins,
+                                      opts("--target") or DEFAULT_TARGETS, opt("--job", DEFAULT_JOB))
+    tiers = ", ".join(f"{t} {n}" for t, n in counts.items())
+    print(f"  ✅ {dest}: {tiers} — ingest {ratio:.0%}, head-node scrapes {scrapes:.2f}× "
+          f"of a single {fmt_interval(TIERS[0][1])} job", file=sys.stderr if dest == "stdout" else sys.stdout)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Series data — samples for the offline analysis tools (scrape_tiers.py, …).
+
+Two sources, one shape — an iterator of (name, labels, timestamp_ms, value), each
+series in time order:
+
+- read_samples(path): text dumps
+    promtool tsdb dump <snapshot dir>     {__name__="gpu_utilization", entity="a"} 87 1718000000000
+    exposition / OpenMetrics with timestamps   gpu_utilization{entity="a"} 87 1718000000000
+  (take a TSDB snapshot via the admin API or `promtool tsdb create-blocks-from`
+  output, then `promtool tsdb dump` it)
+- synthetic_samples(metrics): a deterministic stand-in when no snapshot is at hand.
+  Series come from synthetic_series — one per DGX node and head node (cluster totals
+  on the head node only, NODE_STATE on the DGX nodes only), fanned out over
+  SYNTHETIC_DIMENSIONS; how often each changes
+  comes from VOLATILITY (name heuristics). synthetic_block returns the same series as
+  one NumPy block (promql_eval.py); profile_metrics expands the indexed families to
+  the hardware profile's devices (synthetic_exporter.py). Results on synthetic data
+  only exercise the pipeline — analyze real dumps before deploying.
+"""
+import random, re
+
+import capacity_planner
+from hardware_profiles import DEFAULT_PROFILE, get_profile
+from indexed_metrics import FAMILIES, split_indexed
+from metrics_inventory import InventoryMetric
+
+# ── Text dumps ──
+
+_SAMPLE = re.compile(r'^(?P<name>[A-Za-z_:][A-Za-z0-9_:]*)?(?P<labels>\{.*\})?\s+(?P<value>\S+)(?:\s+(?P<ts>\S+))?\s*$')
+_NAME_LABEL = re.compile(r'__name__="((?:\\.|[^"\\])*)",?\s*')
+
+def parse_line(line):
+    """(name, labels, timestamp_ms or None, value) of one sample line; None for comments."""
+    line = line.strip()
+    if not line or line.startswith("#"): return None
+    m = _SAMPLE.match(line)
+    if not m: raise ValueError(f"Not a sample line: {line[:80]!r}")
+    name, labels = m.group("name"), m.group("labels") or "{}"
+    if not name:   # promtool dump: the name is a label
+        n = _NAME_LABEL.search(labels)
+        if not n: raise ValueError(f"Sample without a metric name: {line[:80]!r}")
+        name, labels = n.group(1), labels[:n.start()] + labels[n.end():]
+        labels = re.sub(r',\s*\}$', '}', labels)
+    ts = m.group("ts")
+    if ts is not None:
+        ts = float(ts)
+        ts = int(ts * 1000) if ts < 1e11 else int(ts)   # OpenMetrics uses seconds
+    return name, labels, ts, float(m.group("value"))
+
+_LABEL = re.compile(r'\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*"((?:\\.|[^"\\])*)"\s*,?')
+
+def parse_labels(text):
+    """{label: value} of a '{a="b",c="d"}' label set."""
+    return {k: re.sub(r'\\(.)', r'\1', v) for k, v in _LABEL.findall(text.strip()[1:-1])}
+
+def format_labels(labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+def read_samples(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            s = parse_line(line)
+            if s: yield s
+
+# ── Synthetic data ──
+
+# (name regex, probability that a sample differs from the previous one) — first match wins
+VOLATILITY = [
+    (r'.*(_agg|_remapped_rows|licensed_.*|_resources|_count|_total|_lid|_pkeyQ|_rate|_mtu|_speed|'
+     r'_type|_dev_id|_ifindex|_iflink|_flags|_assign_type|_group|_link_mode|_tx_queue_len|_model_errors|'
+     r'_limit|_temperature_limit|shutdown_temperature|starttime.*|_spare|_optime|interfaces|mounts)', 0.0005),
+    (r'.*(health.*|_state|_status|_up|_down|_closed|connectivity|violation|_throttle|perfstate|'
+     r'_critical|_errors|_failure|_check|_downed|_vol|alert_level|is_up|read_only|dormant|carrier.*)', 0.005),
+    (r'(bytes_|pkts_|ip_|tcp_|udp_|nfs_|io_|merged_|sector_|paging_|forks|major_page|drop_|error_|frame_|'
+     r'scrape_|proc_|process_|threads_|chrono).*', 0.9),
+    (r'.*(utilization|_power.*|temperature|temp|_clock|_bandwidth|load_.*|memory.*|cpu_.*|swap_.*|'
+     r'occupation.*|throughput.*|space|files|system_time|_used|_issued|_jump)', 0.95),
+]
+DEFAULT_VOLATILITY = 0.3
+
+def volatility(name):
+    for pattern, p in VOLATILITY:
+        if re.fullmatch(pattern, name, re.I): return p
+    return DEFAULT_VOLATILITY
+
+# Hidden dimensions of the synthetic fleet: (name regex, label, values) — the labels a
+# dashboard selector fans out over without naming them. "nics" takes the profile's count.
+SYNTHETIC_DIMENSIONS = [
+    (r'sys_class_net_.*', "device", "nics"),
+    (r'alert_level', "measurable", ["gpu-health", "nvlink", "ib-ports", "ecc", "thermal", "psu",
+                                    "disk", "ntp"]),
+]
+SYNTHETIC_HEADS = 2
+
+# Node state: one series per DGX node holding that node's own state (healthy value here),
+# the form dashboards sum over entity=~"$node" and the rollup rules over the DGX nodes
+NODE_STATE = {"nodes_up": 1, "nodes_down": 0, "nodes_closed": 0, "nodes_total": 1}
+
+def profile_metrics(metrics, profile=DEFAULT_PROFILE):
+    """metrics with each indexed family (gpuN_*, infiniband_mlx5_N_*, nvmeN_*) expanded to the
+    profile's devices — the inventory lists only the indices it happened to see."""
+    hw = get_profile(profile)
+    indices = {"gpu": range(hw.gpus_per_node), "infiniband": hw.ib_ports, "nvme": range(hw.nvme_devices)}
+    out, seen = [], set()
+    for name in metrics:
+        parts = split_indexed(name)
+        names = [name]
+        if parts and indices[parts[0]]:
+            fam = FAMILIES[parts[0]]
+            names = [fam.indexed(parts[2], i) for i in indices[parts[0]]]
+        for n in names:
+            if n not in seen: seen.add(n); out.append(n)
+    return out
+
+def synthetic_series(metrics, nodes=8, cluster="su56", node_prefix="skt-dgx-", profile=DEFAULT_PROFILE):
+    """(name, labels) of a synthetic cluster: per-node metrics on every DGX and head node,
+    NODE_STATE on every DGX node, other cluster totals (capacity_planner.SCOPES) on the
+    active head node only."""
+    hw = get_profile(profile)
+    dgx = [f"{node_prefix}{n:03d}" for n in range(nodes)]
+    heads = [f"{cluster}-head-{n + 1:02d}" for n in range(SYNTHETIC_HEADS)]
+    for name in metrics:
+        if name in NODE_STATE: entities = dgx
+        elif capacity_planner.scope(InventoryMetric(name, None)) == "cluster": entities = heads[:1]
+        else: entities = dgx + heads
+        dims = [{}]
+        for pattern, label, values in SYNTHETIC_DIMENSIONS:
+            if re.fullmatch(pattern, name):
+                if values == "nics": values = [f"enp{i}s0" for i in range(hw.nics)]
+                dims = [{**d, label: v} for d in dims for v in values]
+        for entity in entities:
+            for d in dims:
+                yield name, format_labels({"cluster": cluster, "entity": entity, **d})
+
+def synthetic_samples(metrics, nodes=8, samples=240, step_s=30, seed=0, start_ms=1_700_000_000_000):
+    """`samples` points `step_s` apart per synthetic_series; each point differs from the
+    previous one with probability volatility(name)."""
+    rng = random.Random(seed)
+    for name, labels in synthetic_series(metrics, nodes):
+        p = volatility(name)
+        v = float(rng.randint(0, 100))
+        if name in NODE_STATE: p, v = 0.0, float(NODE_STATE[name])
+        for i in range(samples):
+            if i and rng.random() < p: v += rng.choice((-1, 1)) * rng.randint(1, 5)
+            yield name, labels, start_ms + i * step_s * 1000, v
+
+# Metrics whose synthetic values sit at 0 (healthy / no errors) and step between 0–2
+HEALTH_LIKE = r'.*(health.*|_critical|_failure|_errors|_dbe_.*|remapped_rows|alert_level|_downed|violation|_throttle)'
+
+def synthetic_block(metrics, nodes=8, samples=240, step_s=30, seed=0, start_ms=1_700_000_000_000,
+                    profile=DEFAULT_PROFILE):
+    """synthetic_series as one NumPy block sharing a timestamp grid: (label dicts with
+    __name__, int64 timestamps in ms, float64 values [series, samples])."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    series = list(synthetic_series(metrics, nodes, profile=profile))
+    labels = [{"__name__": name, **parse_labels(ls)} for name, ls in series]
+    p = np.array([volatility(name) for name, _ in series])[:, None]
+    health = np.array([bool(re.fullmatch(HEALTH_LIKE, name, re.I)) for name, _ in series])
+    change = rng.random((len(series), samples)) < p
+    change[:, 0] = False
+    steps = rng.integers(1, 6, (len(series), samples)) * rng.choice((-1, 1), (len(series), samples))
+    values = rng.integers(0, 100, (len(series), 1)) + np.cumsum(np.where(change, steps, 0), axis=1)
+    values = np.abs(values).astype(np.float64)
+    values[health] = np.cumsum(np.where(change[health], rng.choice((-1, 1), change[health].shape), 0),
+                               axis=1).clip(0, 2)
+    for i, (name, _) in enumerate(series):
+        if name in NODE_STATE: values[i] = NODE_STATE[name]
+    ts = start_ms + np.arange(samples, dtype=np.int64) * step_s * 1000
+    return labels, ts, values
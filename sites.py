@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Sites — per-deployment settings the dashboards are built for.
+
+A site fixes the Grafana folder, the default $cluster, the DGX node regex, how a
+rack is derived from the node name (rack_regex, first capture group), the UID suffix
+(so several sites can share one Grafana), the hardware profile, the metric form
+("indexed" BCM names or "labeled" after scrape relabeling — indexed_metrics.py) and,
+optionally, the Mimir tenants of the fleet-of-clusters view.
+
+Matrix file (JSON) — every site × hardware combination is built in one run
+(generate_dashboards.generate(matrix=...)):
+
+    {
+      "defaults": {"folder": "BMaaS QA SKT", "node_regex": "skt-dgx.*"},
+      "sites": [
+        {"name": "su56", "cluster": "su56", "uid_suffix": "-su56"},
+        {"name": "su57", "cluster": "su57", "uid_suffix": "-su57",
+         "hardware": ["dgx-b200", "dgx-gb200"]},
+        {"name": "fleet", "uid_suffix": "-fleet", "tenants": {"su56": "mimir-su56", "su57": "mimir-su57"}}
+      ]
+    }
+
+A site listing several hardware profiles expands to one variant per profile,
+named <site>-<profile> (UID suffix gets the same -<profile> tail).
+"""
+import json, re
+from hardware_profiles import DEFAULT_PROFILE, get_profile
+from indexed_metrics import DEFAULT_METRIC_FORM, check_form
+
+# Grafana rejects dashboard UIDs longer than this
+UID_MAX = 40
+LONGEST_BASE_UID = "bmaas-08-fleet-clusters"
+
+# Rack = node name minus its last digit (skt-dgx-012 → skt-dgx-01: 10 consecutive
+# nodes) — set rack_regex per site where hostnames encode the real rack
+DEFAULT_RACK_REGEX = "(.*)[0-9]"
+
+SITE_FIELDS = ("name", "folder", "cluster", "node_regex", "rack_regex", "uid_suffix", "hardware", "tenants",
+               "metric_form")
+_SUFFIX_OK = re.compile(r'^[A-Za-z0-9_-]*$')
+
+class Site:
+    __slots__ = SITE_FIELDS
+
+    def __init__(self, name, folder, cluster, node_regex, uid_suffix,
+                 hardware=DEFAULT_PROFILE, tenants=None, rack_regex=None,
+                 metric_form=DEFAULT_METRIC_FORM):
+        if not _SUFFIX_OK.match(uid_suffix):
+            raise ValueError(f"Site {name!r}: uid_suffix {uid_suffix!r} may only use [A-Za-z0-9_-]")
+        if len(LONGEST_BASE_UID + uid_suffix) > UID_MAX:
+            raise ValueError(f"Site {name!r}: uid_suffix {uid_suffix!r} makes UIDs longer than "
+                             f"{UID_MAX} characters")
+        re.compile(node_regex)
+        rack_regex = rack_regex or DEFAULT_RACK_REGEX
+        if re.compile(rack_regex).groups < 1:
+            raise ValueError(f"Site {name!r}: rack_regex {rack_regex!r} needs a capture group")
+        get_profile(hardware)
+        check_form(metric_form)
+        self.name = name; self.folder = folder; self.cluster = cluster
+        self.node_regex = node_regex; self.rack_regex = rack_regex; self.uid_suffix = uid_suffix
+        self.hardware = hardware; self.tenants = dict(tenants) if tenants else None
+        self.metric_form = metric_form
+
+    def fleet_tenants(self):
+        """cluster → datasource uid; one tenant (the selected datasource) unless configured."""
+        return dict(self.tenants) if self.tenants else {self.cluster: "${datasource}"}
+
+    def __repr__(self):
+        return (f"Site({self.name!r}, cluster={self.cluster!r}, uid_suffix={self.uid_suffix!r}, "
+                f"hardware={self.hardware!r}, metric_form={self.metric_form!r})")
+
+DEFAULT_SITE = Site("default", folder="BMaaS QA SKT", cluster="su56",
+                    node_regex="skt-dgx.*", uid_suffix="-v6")
+
+# ── Shared builds ──
+# Sites that differ only in folder / cluster / node or rack regex / UID suffix produce the
+# same dashboards up to those strings: build once against TEMPLATE values, then
+# substitute per site in the encoded JSON (tokens are plain ASCII, JSON-safe).
+SUBSTITUTED = ("cluster", "node_regex", "rack_regex", "uid_suffix")
+
+def template_site(site):
+    """Stand-in for `site` with substitution tokens in place of the per-site strings."""
+    t = Site.__new__(Site)  # tokens would fail the uid_suffix checks — already validated on `site`
+    for f in SITE_FIELDS: setattr(t, f, getattr(site, f))
+    for f in SUBSTITUTED: setattr(t, f, f"@@site.{f}@@")
+    return t
+
+def build_key(site):
+    """Inputs that change builder output beyond the substituted strings."""
+    return (site.hardware, tuple(sorted(site.tenants.items())) if site.tenants else None,
+            site.metric_form)
+
+def substitute(text, site):
+    for f in SUBSTITUTED:
+        text = text.replace(f"@@site.{f}@@", json.dumps(getattr(site, f))[1:-1])
+    return text
+
+# ── Matrix file ──
+
+def _variants(entry, defaults):
+    unknown = (set(entry) | set(defaults)) - set(SITE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown site field(s) {', '.join(sorted(unknown))} (expected {', '.join(SITE_FIELDS)})")
+    if "name" not in entry:
+        raise ValueError(f"Site entry without a name: {entry}")
+    s = {**{f: getattr(DEFAULT_SITE, f) for f in SITE_FIELDS if f != "name"}, **defaults, **entry}
+    hardware = s["hardware"] if isinstance(s["hardware"], list) else [s["hardware"]]
+    for hw in hardware:
+        name, suffix = s["name"], s["uid_suffix"]
+        if len(hardware) > 1:
+            name += f"-{hw}"; suffix += f"-{hw}"
+        yield Site(name, s["folder"], s["cluster"], s["node_regex"], suffix, hw, s["tenants"],
+                   s["rack_regex"], s["metric_form"])
+
+def load_matrix(path):
+    """Expand a matrix file into Site variants; names and UID suffixes must be unique."""
+    with open(path) as f:
+        m = json.load(f)
+    sites = [v for e in m.get("sites", []) for v in _variants(e, m.get("defaults", {}))]
+    if not sites:
+        raise ValueError(f"{path}: no sites defined")
+    for field in ("name", "uid_suffix"):
+        seen = set()
+        for s in sites:
+            v = getattr(s, field)
+            if v in seen:
+                raise ValueError(f"{path}: duplicate site {field} {v!r}")
+            seen.add(v)
+    return sites
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""BMaaS Monitoring Dashboard Suite — Synthetic BCM11 Exporter for Load Tests.
+
+Serves the BCM metric set (REAL_METRICS_INVENTORY.txt, indexed families expanded to
+the hardware profile's GPUs / IB ports / NVMe drives) for N simulated DGX nodes, with
+BCM's `cluster` / `entity` labels, so a local Prometheus can scrape a fleet-sized
+target and stand in for the production stack:
+
+    GET /exporter, /metrics      every node (BCM's head-node exporter layout)
+    GET /metrics/<entity>        one node
+    GET /targets                 Prometheus http_sd_configs — one target per node
+    GET /faults                  active faults (JSON)
+    POST /faults?kind=K&node=N   inject; DELETE /faults?kind=K&node=N clears (no args: all)
+
+Values advance once per --tick (a vectorized random walk: counters rise, gauges
+wander, health checks and error counters stay at 0), and each node's exposition is
+rendered once per tick and served from cache (gzip when asked), so thousands of
+per-node scrapes cost one render each. Injected faults (FAULTS):
+
+    dbe        gpu_ecc_dbe_agg / _vol rising, gpu_health_mem and _overall FAIL
+    row-remap  gpu_row_remap_failure = 1, uncorrectable remapped rows, health FAIL
+    thermal    GPU temperatures at 92°C, throttle reasons set, GPU_thermal_violation rising
+    down       the node's series disappear but for those BCM reports on its behalf
+               (REPORTED_WHEN_DOWN): bcm_device_is_up 0, its nodes_up 0 / nodes_down 1
+
+Clearing a fault takes effect at once (set values fall back into the walk); counters a
+fault raised keep their count — lifetime counters never fall.
+
+--fault KIND:TARGET takes a node name, a count (3) or a share of the fleet (5%).
+
+Usage: python3 synthetic_exporter.py [--nodes N] [--cluster NAME] [--prefix skt-dgx-] [--profile NAME]
+                                 [--port 8081] [--tick 30] [--seed N] [--fault KIND:TARGET ...]
+                                 [--bench]
+"""
+import gzip, json, os, re, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import metrics_inventory, series_data
+from hardware_profiles import DEFAULT_PROFILE
+
+DEFAULT_PORT = 8081         # BCM exporter on the head node (master:8081/exporter)
+DEFAULT_TICK_S = 30
+
+# Value model: (name regex, low, high) — starting range and bounds of the walk; first match wins
+LEVELS = [
+    (r'.*is_up|nodes_(up|total)', 1, 1),
+    (r'nodes_(down|closed)', 0, 0),
+    (r'.*(temperature|_temp)', 35, 70),
+    (r'.*(utilization|_util|occupation.*)', 0, 100),
+]
+DEFAULT_LEVEL = (0, 100)
+# Monotonic counters — they only rise
+COUNTER = (r'(bytes_|pkts_|ip_|tcp_|udp_|nfs_|io_|merged_|sector_|paging_|forks|major_page|drop_|'
+           r'error_|frame_|proc_|chrono).*')
+
+# kind → [(name regex, value)] applied to the node's series every tick; "inc" = counter rising
+FAULTS = {
+    "dbe": [(r'gpu_ecc_dbe_(agg|vol)', "inc"), (r'gpu_health_(mem|overall)', 2)],
+    "row-remap": [(r'gpu_row_remap_failure', 1), (r'gpu_uncorrectable_remapped_rows', "inc"),
+                  (r'gpu_health_(mem|overall)', 2)],
+    "thermal": [(r'gpu[0-9]+_(temperature|mem_temp)', 92), (r'gpu[0-9]+_throttle', 64),
+                (r'GPU_thermal_violation', "inc"), (r'gpu_health_thermal', 1)],
+    "down": [(r'bcm_device_is_up', 0), (r'nodes_up', 0), (r'nodes_down', 1)],
+}
+# A DOWN node's series the head node still exports (series_data.NODE_STATE + device state)
+REPORTED_WHEN_DOWN = r'bcm_device_is_up|nodes_(up|down|closed|total)'
+
+def _level(name):
+    for pattern, low, high in LEVELS:
+        if re.fullmatch(pattern, name, re.I): return low, high
+    return DEFAULT_LEVEL
+
+# ── Simulated fleet ──
+
+class Fleet:
+    """Series of a synthetic cluster grouped by entity, their values, and active faults."""
+
+    def __init__(self, nodes=64, cluster="su56", node_prefix="skt-dgx-", profile=DEFAULT_PROFILE, seed=0):
+        import numpy as np
+        self.np = np
+        names = series_data.profile_metrics([m.name for m in metrics_inventory.load()], profile)
+        by_entity = {}
+        for name, labels in series_data.synthetic_series(names, nodes, cluster, node_prefix, profile):
+            entity = re.search(r'entity="([^"]*)"', labels).group(1)
+            by_entity.setdefault(entity, []).append((name, labels))
+        self.cluster, self.nodes = cluster, [f"{node_prefix}{n:03d}" for n in range(nodes)]
+        self.entities = list(by_entity)
+        self.names, self.prefixes, self.slices = [], [], {}
+        for entity, series in by_entity.items():
+            a = len(self.names)
+            for name, labels in series:
+                self.names.append(name); self.prefixes.append(f"{name}{labels} ")
+            self.slices[entity] = (a, len(self.names))
+        self.rng = np.random.default_rng(seed)
+        uniq = sorted(set(self.names))
+        p = {n: series_data.volatility(n) for n in uniq}
+        health = {n: bool(re.fullmatch(series_data.HEALTH_LIKE, n, re.I)) for n in uniq}
+        counter = {n: bool(re.fullmatch(COUNTER, n)) for n in uniq}
+        self.p = np.array([p[n] for n in self.names])
+        self.health = np.array([health[n] for n in self.names])
+        self.counter = np.array([counter[n] for n in self.names])
+        levels = np.array([_level(n) for n in self.names], dtype=np.int64)
+        self.low, self.high = levels[:, 0], levels[:, 1]
+        self.values = self.rng.integers(self.low, self.high + 1)
+        self.values[self.health] = 0
+        self.floor = np.zeros_like(self.values)   # what cleared "inc" faults left behind
+        self.faults = set()      # (kind, entity)
+        self.counts = {}         # (kind, entity) → ticks the fault has been active ("inc" values)
+        self.generation = 0
+        self._rows = {}
+
+    def rows(self, entity, pattern):
+        """Indices of the entity's series whose name matches pattern."""
+        key = (entity, pattern)
+        if key not in self._rows:
+            a, b = self.slices[entity]
+            self._rows[key] = [i for i in range(a, b) if re.fullmatch(pattern, self.names[i])]
+        return self._rows[key]
+
+    def tick(self):
+        """Advance every series one step, then re-apply faults."""
+        np, n = self.np, len(self.names)
+        change = (self.rng.random(n) < self.p) & ~self.health
+        step = self.rng.integers(1, 6, n) * np.where(self.counter, 1, self.rng.choice((-1, 1), n))
+        walked = self.values + np.where(change, step, 0)
+        self.values = np.where(self.counter, walked, walked.clip(self.low, self.high))
+        self.values[self.health] = self.floor[self.health]
+        for f in self.faults: self.counts[f] += 1
+        self.apply_faults()
+        self.generation += 1
+
+    def apply_faults(self):
+        for kind, entity in self.faults:
+            for pattern, value in FAULTS[kind]:
+                rows = self.rows(entity, pattern)
+                self.values[rows] = self.floor[rows] + self.counts[(kind, entity)] if value == "inc" else value
+
+    def inject(self, kind, entity):
+        if kind not in FAULTS: raise ValueError(f"Unknown fault {kind!r} (known: {', '.join(FAULTS)})")
+        if entity not in self.nodes: raise ValueError(f"Unknown node {entity!r}")
+        self.faults.add((kind, entity)); self.counts.setdefault((kind, entity), 1)
+        self.apply_faults()
+
+    def clear(self, kind=None, entity=None):
+        """Clear faults of a kind and / or node (both None: all). Their set values fall back
+        into the walk's range (health checks to 0) now, not at the next tick; their counters
+        keep the count reached."""
+        np = self.np
+        cleared = {(k, e) for k, e in self.faults if (not kind or k == kind) and (not entity or e == entity)}
+        self.faults -= cleared
+        for k, e in cleared:
+            for pattern, value in FAULTS[k]:
+                rows = self.rows(e, pattern)
+                if value == "inc":
+                    self.floor[rows] = self.values[rows]
+                else:
+                    self.values[rows] = np.where(self.health[rows], self.floor[rows],
+                                                 self.values[rows].clip(self.low[rows], self.high[rows]))
+        self.counts = {f: n for f, n in self.counts.items() if f in self.faults}
+        self.apply_faults()   # faults still active on the same series (dbe + row-remap health)
+
+    def pick(self, target):
+        """Nodes a --fault target names: a node, a count (3) or a share of the fleet (5%)."""
+        if target in self.nodes: return [target]
+        n = round(len(self.nodes) * float(target[:-1]) / 100) if target.endswith("%") else int(target)
+        return [self.nodes[i] for i in sorted(self.rng.choice(len(self.nodes), min(n, len(self.nodes)),
+                                                              replace=False))]
+
+    def render(self, entity):
+        """Exposition text of one entity (untyped samples, no timestamps)."""
+        a, b = self.slices[entity]
+        if ("down", entity) in self.faults:
+            rows = self.rows(entity, REPORTED_WHEN_DOWN)
+            return "".join(f"{self.prefixes[i]}{int(self.values[i])}\n" for i in rows)
+        return "\n".join(map(str.__add__, self.prefixes[a:b], map(str, self.values[a:b].tolist()))) + "\n"
+
+# ── HTTP ──
+
+class ExporterServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fleet, addr=("127.0.0.1", DEFAULT_PORT), tick_s=DEFAULT_TICK_S):
+        super().__init__(addr, _Handler)
+        self.fleet, self.tick_s = fleet, tick_s
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.cache = {}       # (entity or None, gzip) → bytes, for the current generation
+        self.scrapes = 0
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def body(self, entity, gz):
+        """Cached exposition of one entity (None: all), advancing the fleet if a tick elapsed."""
+        with self.lock:
+            due = int((time.monotonic() - self.started) / self.tick_s)
+            if due > self.fleet.generation:
+                self.fleet.tick(); self.fleet.generation = due; self.cache.clear()
+            key = (entity, gz)
+            if key not in self.cache:
+                if (entity, False) not in self.cache:
+                    entities = [entity] if entity else self.fleet.entities
+                    self.cache[(entity, False)] = "".join(self.fleet.render(e) for e in entities).encode()
+                if gz: self.cache[key] = gzip.compress(self.cache[(entity, False)], compresslevel=1)
+            self.scrapes += 1
+            return self.cache[key]
+
+    def invalidate(self):
+        with self.lock: self.cache.clear()
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, body, content_type="application/json", encoding=None):
+        if not isinstance(body, bytes): body = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        if encoding: self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        srv, url = self.server, urlsplit(self.path)
+        if url.path in ("/metrics", "/exporter") or url.path.startswith("/metrics/"):
+            entity = url.path[len("/metrics/"):] if url.path.startswith("/metrics/") else None
+            if entity and entity not in srv.fleet.slices:
+                return self._send(404, {"error": f"unknown node {entity}"})
+            gz = "gzip" in (self.headers.get("Accept-Encoding") or "")
+            return self._send(200, srv.body(entity, gz), "text/plain; version=0.0.4", "gzip" if gz else None)
+        if url.path == "/targets":
+            host = self.headers.get("Host") or f"127.0.0.1:{srv.server_address[1]}"
+            return self._send(200, [{"targets": [host], "labels": {"__metrics_path__": f"/metrics/{e}"}}
+                                    for e in srv.fleet.entities])
+        if url.path == "/faults":
+            with srv.lock:
+                return self._send(200, [{"kind": k, "node": e} for k, e in sorted(srv.fleet.faults)])
+        self._send(404, {"error": "not found"})
+
+    def _fault(self, clear):
+        srv, q = self.server, parse_qs(urlsplit(self.path).query)
+        kind, node = (q.get("kind") or [None])[0], (q.get("node") or [None])[0]
+        try:
+            with srv.lock:
+                if clear: srv.fleet.clear(kind, node)
+                else: srv.fleet.inject(kind, node)
+        except ValueError as e:
+            return self._send(400, {"error": str(e)})
+        srv.invalidate()
+        self._send(200, {"status": "success"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/faults": return self._send(404, {"error": "not found"})
+        self._fault(clear=False)
+
+    def do_DELETE(self):
+        if urlsplit(self.path).path != "/faults": return self._send(404, {"error": "not found"})
+        self._fault(clear=True)
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print(__doc__.split("Usage:")[1].strip())
+        sys.exit(0)
+
+    def opt(name, default=None):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    def opts(name):
+        return [sys.argv[i + 1] for i, a in enumerate(sys.argv) if a == name]
+
+    t0 = time.perf_counter()
+    fleet = Fleet(int(opt("--nodes", 64)), opt("--cluster", "su56"), opt("--prefix", "skt-dgx-"),
+                  opt("--profile", DEFAULT_PROFILE), int(opt("--seed", 0)))
+    for spec in opts("--fault"):
+        kind, _, target = spec.partition(":")
+        for node in fleet.pick(target):
+            fleet.inject(kind, node)
+    print(f"Fleet: {len(fleet.nodes)} nodes + {len(fleet.entities) - len(fleet.nodes)} head nodes, "
+          f"{len(fleet.names)} series, {len(fleet.faults)} faults ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+
+    if "--bench" in sys.argv:
+        for label, fn in (("tick", fleet.tick),
+                          ("render every node", lambda: [fleet.render(e) for e in fleet.entities])):
+            t0 = time.perf_counter(); fn(); ms = (time.perf_counter() - t0) * 1000
+            print(f"  {label:<20} {ms:>8.1f} ms")
+        size = sum(len(fleet.render(e)) for e in fleet.entities)
+        print(f"  exposition           {size / 1e6:>8.1f} MB per tick")
+        sys.exit(0)
+
+    srv = ExporterServer(fleet, ("0.0.0.0", int(opt("--port", DEFAULT_PORT))), float(opt("--tick", DEFAULT_TICK_S)))
+    print(f"Synthetic BCM exporter on :{srv.server_address[1]} — /exporter (all nodes), "
+          f"/metrics/<entity>, /targets (http_sd_configs)")
+    srv.serve_forever()